@@ -2,20 +2,19 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.core.security import decode_token
 from app.models import User
+from app.services.principal_cache import get_principal_cache
+from app.services.token_versions import get_token_versions
+from app.services.user_loader import UserLoader
 from uuid import UUID
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    token = credentials.credentials
+async def authenticate(db: AsyncSession, token: str) -> User:
+    """Resolve a bearer token to an active user, raising 401/403/404 otherwise."""
     payload = decode_token(token)
 
     if payload is None:
@@ -32,8 +31,8 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    # Served from the principal cache on the warm path, no query
+    user = await get_principal_cache().get_user(db, UUID(user_id))
 
     if user is None:
         raise HTTPException(
@@ -47,9 +46,31 @@ async def get_current_user(
             detail="User account is deactivated",
         )
 
+    if not await get_token_versions().is_current(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    return await authenticate(db, credentials.credentials)
+
+
+async def get_current_user_read(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """get_current_user for read-only endpoints; shares their get_read_db session."""
+    return await authenticate(db, credentials.credentials)
+
+
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
     db: AsyncSession = Depends(get_db)
@@ -67,7 +88,13 @@ async def get_current_user_optional(
     if user_id is None:
         return None
 
-    result = await db.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    user = await get_principal_cache().get_user(db, UUID(user_id))
+    if user is None or not getattr(user, "is_active", False):
+        return None
+
+    return user if await get_token_versions().is_current(db, payload) else None
+
 
-    return user if user and getattr(user, "is_active", False) else None
+async def get_user_loader(db: AsyncSession = Depends(get_read_db)) -> UserLoader:
+    """Per-request batch loader; FastAPI caches it for the lifetime of the request."""
+    return UserLoader(db)
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, literal, literal_column, null, union_all, Date, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import selectinload
-from typing import cast
+from typing import Optional, cast
 from decimal import Decimal
 from datetime import date, timedelta
 import uuid
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
-from app.models import User, Group, Membership, Expense, ExpenseSplit
+from app.db.database import get_read_db
+from app.api.deps import get_current_user_read
+from app.core.config import settings
+from app.services.authorization import require_member
+from app.services.response_cache import get_data_version, get_response_cache
+from app.models import User, Group, Membership, SpendingDailyRollup
 from app.schemas import (
     CategorySpending, SpendingDataPoint, MemberContribution, FriendSpending,
     GroupAnalyticsResponse, FriendsAnalyticsResponse
@@ -35,56 +39,134 @@ def calculate_date_range(period: str) -> tuple[date, date]:
     return (start_date, end_day)
 
 
+# spending_over_time bucket sizes and their generate_series step
+GRANULARITIES = {"day": "1 day", "week": "1 week", "month": "1 month"}
+
+
+def resolve_date_range(period: str, start: Optional[date], end: Optional[date]) -> tuple[str, date, date]:
+    """The (period label, start, end) of a request; explicit dates override the period."""
+    if start is None and end is None:
+        return (period, *calculate_date_range(period))
+
+    end_day = end or date.today()
+    start_day = start or end_day - timedelta(days=29)
+    if start_day > end_day:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be on or before end"
+        )
+    return ("custom", start_day, end_day)
+
+
+def bucket_count(granularity: str, start_date: date, end_date: date) -> int:
+    """Number of day/week/month buckets touched by the range."""
+    if granularity == "day":
+        return (end_date - start_date).days + 1
+    if granularity == "week":
+        week_start = start_date - timedelta(days=start_date.weekday())
+        return (end_date - week_start).days // 7 + 1
+    return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+
+
+def resolve_granularity(granularity: Optional[str], start_date: date, end_date: date) -> str:
+    """The requested bucket size, or one suited to the range; 400 if it needs too many buckets."""
+    if granularity is None:
+        days = (end_date - start_date).days + 1
+        granularity = "day" if days <= 92 else "week" if days <= 731 else "month"
+
+    buckets = bucket_count(granularity, start_date, end_date)
+    if buckets > settings.ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range spans {buckets} {granularity} buckets (max {settings.ANALYTICS_MAX_BUCKETS})"
+        )
+    return granularity
+
+
+def spending_series(source, granularity: str, start_date: date, end_date: date):
+    """
+    Spending per bucket from start to end as (date, total, expense_count).
+
+    `source` is a selectable with date, paid and expense_count columns. Every
+    bucket is returned, empty ones as zero; buckets are dated by their first day.
+    """
+    bucket_start = func.date_trunc(granularity, literal(start_date, Date).cast(DateTime))
+    buckets = select(
+        func.generate_series(
+            bucket_start,
+            literal(end_date, Date).cast(DateTime),
+            literal_column(f"interval '{GRANULARITIES[granularity]}'")
+        ).label('bucket')
+    ).subquery('buckets')
+
+    return (
+        select(
+            buckets.c.bucket.cast(Date).label('date'),
+            func.coalesce(func.sum(source.c.paid), 0).label('total'),
+            func.coalesce(func.sum(source.c.expense_count), 0).label('expense_count')
+        )
+        .select_from(buckets)
+        .outerjoin(source, func.date_trunc(granularity, source.c.date.cast(DateTime)) == buckets.c.bucket)
+        .group_by(buckets.c.bucket)
+    )
+
+
 @router.get("/group/{group_id}", response_model=GroupAnalyticsResponse)
 async def get_group_analytics(
     group_id: uuid.UUID,
     period: str = Query("30d", pattern="^(7d|30d|3m|1y)$"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: Optional[str] = Query(None, pattern="^(day|week|month)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get analytics for a specific group."""
-    # Check membership
-    membership_result = await db.execute(
-        select(Membership)
-        .options(selectinload(Membership.group))
-        .where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
+    await require_member(db, group_id, current_user.id)
+
+    # Calculate date range and bucket size
+    period, start_date, end_date = resolve_date_range(period, start, end)
+    granularity = resolve_granularity(granularity, start_date, end_date)
+
+    # Same for every member until the group's data changes
+    version = await get_data_version(db, group_id)
+    return await get_response_cache().get_or_compute(
+        ("group-analytics", group_id, version, period, start_date, end_date, granularity),
+        GroupAnalyticsResponse,
+        lambda: build_group_analytics(db, group_id, period, start_date, end_date, granularity)
     )
-    membership = membership_result.scalar_one_or_none()
 
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
 
-    # Calculate date range
-    start_date, end_date = calculate_date_range(period)
-
-    # Get expenses in date range
+async def build_group_analytics(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    period: str,
+    start_date: date,
+    end_date: date,
+    granularity: str
+) -> GroupAnalyticsResponse:
+    """Compute the analytics of a group over a resolved range."""
+    group_name = (await db.execute(select(Group.name).where(Group.id == group_id))).scalar_one()
+
+    # Aggregates come from the daily rollup, not the raw expenses
+    rollup = SpendingDailyRollup
     base_filter = and_(
-        Expense.group_id == group_id,
-        Expense.is_deleted == False,
-        Expense.date >= start_date,
-        Expense.date <= end_date
+        rollup.group_id == group_id,
+        rollup.date >= start_date,
+        rollup.date <= end_date
     )
 
     # 1. Category breakdown
-    category_expr = func.coalesce(func.nullif(func.trim(Expense.category), ''), 'Other')
     category_result = await db.execute(
         select(
-            category_expr.label('category'),
-            func.sum(Expense.amount).label('total'),
-            func.count(Expense.id).label('expense_count')
+            rollup.category,
+            func.sum(rollup.paid).label('total'),
+            func.sum(rollup.expense_count).label('expense_count')
         )
         .where(base_filter)
-        .group_by(category_expr)
-        .order_by(func.sum(Expense.amount).desc())
+        .group_by(rollup.category)
+        .having(func.sum(rollup.expense_count) > 0)
+        .order_by(func.sum(rollup.paid).desc())
     )
     category_data = category_result.all()
 
@@ -108,16 +190,13 @@ async def get_group_analytics(
     top_category = category_breakdown[0].category if category_breakdown else None
 
     # 2. Spending over time
-    time_result = await db.execute(
-        select(
-            Expense.date,
-            func.sum(Expense.amount).label('total'),
-            func.count(Expense.id).label('expense_count')
-        )
+    group_spending = (
+        select(rollup.date, rollup.paid, rollup.expense_count)
         .where(base_filter)
-        .group_by(Expense.date)
-        .order_by(Expense.date)
+        .subquery('group_spending')
     )
+    series = spending_series(group_spending, granularity, start_date, end_date)
+    time_result = await db.execute(series.order_by(series.selected_columns.date))
     time_data = time_result.all()
 
     spending_over_time = [
@@ -145,28 +224,19 @@ async def get_group_analytics(
     member_ids = [cast(uuid.UUID, m.user_id) for m in members]
     member_map = {cast(uuid.UUID, m.user_id): m.user for m in members}
 
-    # Total paid by each member
-    paid_result = await db.execute(
+    # Total paid and total share of each member
+    totals_result = await db.execute(
         select(
-            Expense.payer_id,
-            func.sum(Expense.amount).label('total_paid')
+            rollup.user_id,
+            func.sum(rollup.paid).label('total_paid'),
+            func.sum(rollup.share).label('total_share')
         )
         .where(base_filter)
-        .group_by(Expense.payer_id)
+        .group_by(rollup.user_id)
     )
-    paid_by_user = {row.payer_id: (row.total_paid or Decimal(0)) for row in paid_result.all()}
-
-    # Total share for each member
-    share_result = await db.execute(
-        select(
-            ExpenseSplit.user_id,
-            func.sum(ExpenseSplit.amount).label('total_share')
-        )
-        .join(Expense, Expense.id == ExpenseSplit.expense_id)
-        .where(base_filter)
-        .group_by(ExpenseSplit.user_id)
-    )
-    share_by_user = {row.user_id: (row.total_share or Decimal(0)) for row in share_result.all()}
+    totals = totals_result.all()
+    paid_by_user = {row.user_id: (row.total_paid or Decimal(0)) for row in totals}
+    share_by_user = {row.user_id: (row.total_share or Decimal(0)) for row in totals}
 
     member_contributions = []
     for member_id in member_ids:
@@ -196,10 +266,11 @@ async def get_group_analytics(
 
     return GroupAnalyticsResponse(
         group_id=group_id,
-        group_name=membership.group.name,
+        group_name=group_name,
         period=period,
         start_date=start_date,
         end_date=end_date,
+        granularity=granularity,
         total_spending=total_spending,
         expense_count=expense_count,
         category_breakdown=category_breakdown,
@@ -210,23 +281,14 @@ async def get_group_analytics(
     )
 
 
-@router.get("/friends", response_model=FriendsAnalyticsResponse)
-async def get_friends_analytics(
-    period: str = Query("30d", pattern="^(7d|30d|3m|1y)$"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get analytics across all friend expenses."""
-    # Calculate date range
-    start_date, end_date = calculate_date_range(period)
-
-    # Get all friend groups (is_friend_group=True) where user is a member
-    friend_groups_result = await db.execute(
+def friend_spending_cte(user_id: uuid.UUID, start_date: date, end_date: date):
+    """Daily rollup rows (group_id, date, category, paid, expense_count) of the user's friend groups."""
+    friend_groups = (
         select(Membership.group_id)
         .join(Group, Group.id == Membership.group_id)
         .where(
             and_(
-                Membership.user_id == current_user.id,
+                Membership.user_id == user_id,
                 Membership.is_active == True,
                 or_(
                     Group.is_friend_group == True,
@@ -235,134 +297,166 @@ async def get_friends_analytics(
                 Group.is_deleted == False
             )
         )
+        .cte("friend_groups")
     )
-    friend_group_ids = [row[0] for row in friend_groups_result.all()]
-
-    if not friend_group_ids:
-        # No friend groups - return empty analytics
-        return FriendsAnalyticsResponse(
-            period=period,
-            start_date=start_date,
-            end_date=end_date,
-            total_spending=Decimal(0),
-            expense_count=0,
-            category_breakdown=[],
-            spending_over_time=[],
-            friend_breakdown=[],
-            average_expense=Decimal(0),
-            top_category=None
+    rollup = SpendingDailyRollup
+    return (
+        select(
+            rollup.group_id,
+            rollup.date,
+            rollup.category,
+            rollup.paid,
+            rollup.expense_count
         )
-
-    # Base filter for friend expenses
-    base_filter = and_(
-        Expense.group_id.in_(friend_group_ids),
-        Expense.is_deleted == False,
-        Expense.date >= start_date,
-        Expense.date <= end_date
+        .where(
+            and_(
+                rollup.group_id.in_(select(friend_groups.c.group_id)),
+                rollup.date >= start_date,
+                rollup.date <= end_date
+            )
+        )
+        .cte("friend_spending")
     )
 
-    # 1. Category breakdown
-    category_expr = func.coalesce(func.nullif(func.trim(Expense.category), ''), 'Other')
-    category_result = await db.execute(
+
+def friend_totals(friend_spending, user_id: uuid.UUID):
+    """
+    Spending per friend, in the column layout of the friends analytics union.
+
+    Only two-member groups count: their spending is credited to the one other
+    member. Bigger "friends" groups have no single friend to credit, so they
+    are left out here (they still count toward the category and time totals).
+    """
+    fs = friend_spending.c
+    pair_groups = (
+        select(Membership.group_id)
+        .where(
+            and_(
+                Membership.group_id.in_(select(fs.group_id)),
+                Membership.is_active == True
+            )
+        )
+        .group_by(Membership.group_id)
+        .having(func.count() == 2)
+    )
+    return (
         select(
-            category_expr.label('category'),
-            func.sum(Expense.amount).label('total'),
-            func.count(Expense.id).label('expense_count')
+            literal("friend").label('kind'),
+            null().cast(String).label('category'),
+            null().cast(Date).label('date'),
+            User.id.label('friend_id'),
+            User.name.label('friend_name'),
+            User.profile_picture,
+            func.sum(fs.paid).label('total'),
+            func.sum(fs.expense_count).label('expense_count')
         )
-        .where(base_filter)
-        .group_by(category_expr)
-        .order_by(func.sum(Expense.amount).desc())
+        .select_from(friend_spending)
+        .join(
+            Membership,
+            and_(
+                Membership.group_id == fs.group_id,
+                Membership.user_id != user_id,
+                Membership.is_active == True
+            )
+        )
+        .join(User, User.id == Membership.user_id)
+        .where(fs.group_id.in_(pair_groups))
+        .group_by(User.id, User.name, User.profile_picture)
+        .having(func.sum(fs.expense_count) > 0)
     )
-    category_data = category_result.all()
 
-    total_spending: Decimal = sum(
-        ((Decimal(row.total) if row.total is not None else Decimal(0)) for row in category_data),
-        Decimal(0),
-    ) if category_data else Decimal(0)
-    expense_count = sum((row.expense_count or 0) for row in category_data) if category_data else 0
+
+@router.get("/friends", response_model=FriendsAnalyticsResponse)
+async def get_friends_analytics(
+    period: str = Query("30d", pattern="^(7d|30d|3m|1y)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: Optional[str] = Query(None, pattern="^(day|week|month)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get analytics across all friend expenses."""
+    # Calculate date range and bucket size
+    period, start_date, end_date = resolve_date_range(period, start, end)
+    granularity = resolve_granularity(granularity, start_date, end_date)
+
+    # One statement: the friend groups of the user, their daily rollup in the
+    # period, and three aggregates over that set (category, day, friend)
+    friend_spending = friend_spending_cte(current_user.id, start_date, end_date)
+    fs = friend_spending.c
+
+    by_category = select(
+        literal("category").label('kind'),
+        fs.category,
+        null().cast(Date).label('date'),
+        null().cast(PG_UUID(as_uuid=True)).label('friend_id'),
+        null().cast(String).label('friend_name'),
+        null().cast(String).label('profile_picture'),
+        func.sum(fs.paid).label('total'),
+        func.sum(fs.expense_count).label('expense_count')
+    ).group_by(fs.category).having(func.sum(fs.expense_count) > 0)
+    series = spending_series(friend_spending, granularity, start_date, end_date).subquery('series')
+    by_date = select(
+        literal("date"),
+        null().cast(String),
+        series.c.date,
+        null().cast(PG_UUID(as_uuid=True)),
+        null().cast(String),
+        null().cast(String),
+        series.c.total,
+        series.c.expense_count
+    )
+    by_friend = friend_totals(friend_spending, current_user.id)
+    rows = (await db.execute(union_all(by_category, by_date, by_friend))).all()
+
+    category_data = sorted(
+        (row for row in rows if row.kind == "category"), key=lambda row: row.total, reverse=True
+    )
+    time_data = sorted((row for row in rows if row.kind == "date"), key=lambda row: row.date)
+    friend_data = [row for row in rows if row.kind == "friend"]
+
+    # 1. Category breakdown
+    total_spending: Decimal = sum((Decimal(row.total) for row in category_data), Decimal(0))
+    expense_count = sum(row.expense_count for row in category_data)
 
     category_breakdown = []
     for row in category_data:
-        row_total = Decimal(row.total) if row.total is not None else Decimal(0)
+        row_total = Decimal(row.total)
         percentage: Decimal = (row_total / total_spending * Decimal("100")) if total_spending > 0 else Decimal(0)
         category_breakdown.append(CategorySpending(
             category=row.category or 'Other',
             amount=row_total,
             percentage=percentage.quantize(Decimal("0.1")),
-            expense_count=row.expense_count or 0
+            expense_count=row.expense_count
         ))
 
     top_category = category_breakdown[0].category if category_breakdown else None
 
     # 2. Spending over time
-    time_result = await db.execute(
-        select(
-            Expense.date,
-            func.sum(Expense.amount).label('total'),
-            func.count(Expense.id).label('expense_count')
-        )
-        .where(base_filter)
-        .group_by(Expense.date)
-        .order_by(Expense.date)
-    )
-    time_data = time_result.all()
-
     spending_over_time = [
         SpendingDataPoint(
             date=row.date,
-            amount=row.total or Decimal(0),
-            expense_count=row.expense_count or 0
+            amount=row.total,
+            expense_count=row.expense_count
         )
         for row in time_data
     ]
 
-    # 3. Friend breakdown - spending per friend
-    # Get spending grouped by friend group, then map to friend
-    friend_spending_result = await db.execute(
-        select(
-            Expense.group_id,
-            func.sum(Expense.amount).label('total'),
-            func.count(Expense.id).label('expense_count')
-        )
-        .where(base_filter)
-        .group_by(Expense.group_id)
-    )
-    group_spending = {row.group_id: ((row.total or Decimal(0)), (row.expense_count or 0)) for row in friend_spending_result.all()}
-
-    # Map group_id to friend user
-    friend_breakdown = []
-    for group_id in friend_group_ids:
-        if group_id not in group_spending:
-            continue
-
-        total, count = group_spending[group_id]
-
-        # Find the friend in this group (not current user)
-        friend_result = await db.execute(
-            select(Membership)
-            .options(selectinload(Membership.user))
-            .where(
-                and_(
-                    Membership.group_id == group_id,
-                    Membership.user_id != current_user.id,
-                    Membership.is_active == True
-                )
+    # 3. Friend breakdown, by total spent descending
+    friend_breakdown = sorted(
+        (
+            FriendSpending(
+                friend_id=row.friend_id,
+                friend_name=row.friend_name,
+                profile_picture=row.profile_picture,
+                total_spent=row.total,
+                expense_count=row.expense_count
             )
-        )
-        friend_membership = friend_result.scalar_one_or_none()
-
-        if friend_membership and friend_membership.user:
-            friend = friend_membership.user
-            friend_breakdown.append(FriendSpending(
-                friend_id=friend.id,
-                friend_name=friend.name,
-                profile_picture=friend.profile_picture,
-                total_spent=total,
-                expense_count=count
-            ))
-
-    # Sort by total spent descending
-    friend_breakdown.sort(key=lambda x: x.total_spent, reverse=True)
+            for row in friend_data
+        ),
+        key=lambda x: x.total_spent,
+        reverse=True
+    )
 
     average_expense = total_spending / expense_count if expense_count > 0 else Decimal(0)
     average_expense = average_expense.quantize(Decimal("0.01"))
@@ -371,6 +465,7 @@ async def get_friends_analytics(
         period=period,
         start_date=start_date,
         end_date=end_date,
+        granularity=granularity,
         total_spending=total_spending,
         expense_count=expense_count,
         category_breakdown=category_breakdown,
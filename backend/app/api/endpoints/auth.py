@@ -5,14 +5,21 @@ from sqlalchemy import select
 from authlib.integrations.starlette_client import OAuth
 from datetime import datetime, timedelta
 import secrets
+import uuid
 import httpx
 
 from app.db.database import get_db
+from app.api.deps import get_current_user
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import (
+    get_password_hash_async, verify_password_async, password_needs_rehash,
+    create_token_pair, decode_token
+)
 from app.models import User
+from app.services.principal_cache import get_principal_cache
+from app.services.token_versions import get_token_versions
 from app.schemas import (
-    UserLogin, UserRegister, TokenResponse, GoogleAuthRequest,
+    UserLogin, UserRegister, TokenResponse, RefreshTokenRequest, GoogleAuthRequest,
     PasswordResetRequest, PasswordResetConfirm, UserResponse
 )
 
@@ -29,6 +36,15 @@ oauth.register(
 )
 
 
+def build_token_response(user: User) -> TokenResponse:
+    access_token, refresh_token = create_token_pair(user.id, user.token_version)
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        user=UserResponse.model_validate(user)
+    )
+
+
 @router.post("/register", response_model=TokenResponse)
 async def register(data: UserRegister, db: AsyncSession = Depends(get_db)):
     """Register a new user with email and password."""
@@ -43,7 +59,7 @@ async def register(data: UserRegister, db: AsyncSession = Depends(get_db)):
     # Create user
     user = User(
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=await get_password_hash_async(data.password),
         name=data.name,
         is_verified=False,
     )
@@ -51,13 +67,7 @@ async def register(data: UserRegister, db: AsyncSession = Depends(get_db)):
     await db.commit()
     await db.refresh(user)
 
-    # Create token
-    access_token = create_access_token(data={"sub": str(user.id)})
-
-    return TokenResponse(
-        access_token=access_token,
-        user=UserResponse.model_validate(user)
-    )
+    return build_token_response(user)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -72,7 +82,7 @@ async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="Invalid email or password"
         )
 
-    if not verify_password(data.password, user.hashed_password):
+    if not await verify_password_async(data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -84,16 +94,59 @@ async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="Account is deactivated"
         )
 
+    # Upgrade the hash if BCRYPT_ROUNDS changed since it was created
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(data.password)
+
     # Update last login
     user.last_login_at = datetime.utcnow()
     await db.commit()
+    await get_principal_cache().invalidate(user.id)
 
-    access_token = create_access_token(data={"sub": str(user.id)})
+    return build_token_response(user)
 
-    return TokenResponse(
-        access_token=access_token,
-        user=UserResponse.model_validate(user)
-    )
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh_tokens(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Exchange a refresh token for a new access/refresh token pair."""
+    payload = decode_token(data.refresh_token, token_type="refresh")
+    try:
+        user_id = uuid.UUID(payload["sub"])
+    except (TypeError, KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+
+    user = await get_principal_cache().get_user(db, user_id)
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+
+    if not await get_token_versions().is_current(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+
+    return build_token_response(user)
+
+
+@router.post("/logout-all")
+async def logout_all(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Revoke every access and refresh token of the current user."""
+    token_versions = get_token_versions()
+    version = await token_versions.bump(db, current_user)
+    await db.commit()
+    await token_versions.publish(current_user.id, version)
+    await get_principal_cache().invalidate(current_user.id)
+
+    return {"message": "Logged out from all devices"}
 
 
 @router.get("/google")
@@ -154,11 +207,12 @@ async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
     user.last_login_at = datetime.utcnow()
     await db.commit()
     await db.refresh(user)
+    await get_principal_cache().invalidate(user.id)
 
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token, refresh_token = create_token_pair(user.id, user.token_version)
 
-    # Redirect to frontend with token
-    frontend_url = f"{settings.FRONTEND_URL}/auth/callback?token={access_token}"
+    # Redirect to frontend with tokens
+    frontend_url = f"{settings.FRONTEND_URL}/auth/callback?token={access_token}&refresh_token={refresh_token}"
     return RedirectResponse(url=frontend_url)
 
 
@@ -229,13 +283,9 @@ async def google_token_login(data: GoogleAuthRequest, db: AsyncSession = Depends
     user.last_login_at = datetime.utcnow()
     await db.commit()
     await db.refresh(user)
+    await get_principal_cache().invalidate(user.id)
 
-    access_token = create_access_token(data={"sub": str(user.id)})
-
-    return TokenResponse(
-        access_token=access_token,
-        user=UserResponse.model_validate(user)
-    )
+    return build_token_response(user)
 
 
 @router.post("/password-reset/request")
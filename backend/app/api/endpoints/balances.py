@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 from typing import List, Dict
 from decimal import Decimal
-from collections import defaultdict
+import asyncio
 import uuid
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
-from app.models import User, Group, Membership, Expense, ExpenseSplit, Payment
+from app.db.database import get_read_db
+from app.api.deps import get_current_user_read, get_user_loader
+from app.services import balance_ledger
+from app.services.authorization import require_member
+from app.services.response_cache import get_data_version, get_response_cache
+from app.services.settlement import simplify_debts
+from app.services.user_loader import UserLoader
+from app.models import User, Group
 from app.schemas import (
     BalanceResponse, GroupBalanceSummary, UserBalance,
     SettlementSuggestion, GroupSettlementResponse, DebtSimplificationResult
@@ -20,203 +24,48 @@ router = APIRouter(prefix="/balances", tags=["Balances"])
 
 async def get_group_balances(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> Dict[uuid.UUID, Decimal]:
     """Calculate net balances for all users in a group relative to the given user."""
-    balances = defaultdict(Decimal)
-
-    # Get expenses where user paid
-    paid_result = await db.execute(
-        select(ExpenseSplit.user_id, func.sum(ExpenseSplit.amount))
-        .join(Expense, Expense.id == ExpenseSplit.expense_id)
-        .where(
-            and_(
-                Expense.group_id == group_id,
-                Expense.payer_id == user_id,
-                Expense.is_deleted == False,
-                ExpenseSplit.user_id != user_id
-            )
-        )
-        .group_by(ExpenseSplit.user_id)
-    )
-    for other_user_id, amount in paid_result.all():
-        balances[other_user_id] += amount  # They owe user
-
-    # Get expenses where user owes
-    owed_result = await db.execute(
-        select(Expense.payer_id, func.sum(ExpenseSplit.amount))
-        .join(ExpenseSplit, ExpenseSplit.expense_id == Expense.id)
-        .where(
-            and_(
-                Expense.group_id == group_id,
-                ExpenseSplit.user_id == user_id,
-                Expense.is_deleted == False,
-                Expense.payer_id != user_id
-            )
-        )
-        .group_by(Expense.payer_id)
-    )
-    for other_user_id, amount in owed_result.all():
-        balances[other_user_id] -= amount  # User owes them
-
-    # Get confirmed payments made by user
-    payments_made_result = await db.execute(
-        select(Payment.receiver_id, func.sum(Payment.amount))
-        .where(
-            and_(
-                Payment.group_id == group_id,
-                Payment.payer_id == user_id,
-                Payment.status == "confirmed"
-            )
-        )
-        .group_by(Payment.receiver_id)
-    )
-    for other_user_id, amount in payments_made_result.all():
-        balances[other_user_id] += amount  # Increases what they owe (reduces what user owes)
-
-    # Get confirmed payments received by user
-    payments_received_result = await db.execute(
-        select(Payment.payer_id, func.sum(Payment.amount))
-        .where(
-            and_(
-                Payment.group_id == group_id,
-                Payment.receiver_id == user_id,
-                Payment.status == "confirmed"
-            )
-        )
-        .group_by(Payment.payer_id)
-    )
-    for other_user_id, amount in payments_received_result.all():
-        balances[other_user_id] -= amount  # Reduces what they owe
-
-    return balances
-
-
-async def get_all_group_debts(db: AsyncSession, group_id: uuid.UUID) -> List[Dict]:
-    """Get all debts in a group (for simplification algorithm)."""
-    # Net balance for each user
-    user_balances = defaultdict(Decimal)
-
-    # Get all expense splits
-    splits_result = await db.execute(
-        select(Expense.payer_id, ExpenseSplit.user_id, func.sum(ExpenseSplit.amount))
-        .join(ExpenseSplit, ExpenseSplit.expense_id == Expense.id)
-        .where(
-            and_(
-                Expense.group_id == group_id,
-                Expense.is_deleted == False
-            )
-        )
-        .group_by(Expense.payer_id, ExpenseSplit.user_id)
-    )
-
-    for payer_id, debtor_id, amount in splits_result.all():
-        if payer_id != debtor_id:
-            user_balances[payer_id] += amount  # Payer is owed
-            user_balances[debtor_id] -= amount  # Debtor owes
-
-    # Account for confirmed payments
-    payments_result = await db.execute(
-        select(Payment.payer_id, Payment.receiver_id, func.sum(Payment.amount))
-        .where(
-            and_(
-                Payment.group_id == group_id,
-                Payment.status == "confirmed"
-            )
-        )
-        .group_by(Payment.payer_id, Payment.receiver_id)
-    )
-
-    for payer_id, receiver_id, amount in payments_result.all():
-        user_balances[payer_id] += amount  # Payer paid off debt
-        user_balances[receiver_id] -= amount  # Receiver got paid
-
-    return dict(user_balances)
-
-
-def simplify_debts(balances: Dict[uuid.UUID, Decimal]) -> List[Dict]:
-    """
-    Simplify debts using minimum cash flow algorithm.
-    Returns list of {from_user_id, to_user_id, amount} transactions.
-    """
-    # Separate into creditors and debtors
-    creditors = []  # (user_id, amount_owed_to_them)
-    debtors = []    # (user_id, amount_they_owe)
-
-    for user_id, balance in balances.items():
-        if balance > Decimal("0.01"):
-            creditors.append([user_id, balance])
-        elif balance < Decimal("-0.01"):
-            debtors.append([user_id, -balance])
-
-    # Sort by amount (largest first)
-    creditors.sort(key=lambda x: x[1], reverse=True)
-    debtors.sort(key=lambda x: x[1], reverse=True)
-
-    settlements = []
+    return await balance_ledger.get_user_balances(db, group_id, user_id)
 
-    while creditors and debtors:
-        creditor = creditors[0]
-        debtor = debtors[0]
 
-        amount = min(creditor[1], debtor[1])
-
-        if amount > Decimal("0.01"):
-            settlements.append({
-                "from_user_id": debtor[0],
-                "to_user_id": creditor[0],
-                "amount": amount
-            })
-
-        creditor[1] -= amount
-        debtor[1] -= amount
-
-        if creditor[1] < Decimal("0.01"):
-            creditors.pop(0)
-        if debtor[1] < Decimal("0.01"):
-            debtors.pop(0)
-
-    return settlements
+async def get_all_group_debts(db: AsyncSession, group_id: uuid.UUID) -> Dict[uuid.UUID, Decimal]:
+    """Get every member's net balance in a group (for simplification algorithm)."""
+    return await balance_ledger.get_net_balances(db, group_id)
 
 
 @router.get("", response_model=BalanceResponse)
 async def get_my_balances(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
+    user_loader: UserLoader = Depends(get_user_loader)
 ):
     """Get current user's balances across all groups."""
-    # Get user's groups
-    memberships_result = await db.execute(
-        select(Membership)
-        .options(selectinload(Membership.group))
-        .where(
-            and_(
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    memberships = memberships_result.scalars().all()
+    # Every (group, counterparty) balance of the user in one query
+    rows = await balance_ledger.get_user_balances_all_groups(db, current_user.id)
+
+    balances_by_group: Dict[uuid.UUID, Dict] = {}
+    for group_id, group_name, other_user_id, balance in rows:
+        if abs(balance) < Decimal("0.01"):
+            continue
+        entry = balances_by_group.setdefault(group_id, {"name": group_name, "balances": {}})
+        entry["balances"][other_user_id] = balance
+        user_loader.add(other_user_id)
+
+    # Resolve every counterparty with one query
+    await user_loader.load()
 
     group_balances = []
     total_you_are_owed = Decimal(0)
     total_you_owe = Decimal(0)
 
-    for membership in memberships:
-        if membership.group.is_deleted:
-            continue
-
-        balances = await get_group_balances(db, membership.group_id, current_user.id)
+    for group_id, entry in balances_by_group.items():
+        users = await user_loader.get_many(entry["balances"])
 
         # Get user info for each balance
         user_balances = []
         group_net = Decimal(0)
 
-        for other_user_id, balance in balances.items():
-            if abs(balance) < Decimal("0.01"):
-                continue
-
-            user_result = await db.execute(
-                select(User).where(User.id == other_user_id)
-            )
-            other_user = user_result.scalar_one_or_none()
+        for other_user_id, balance in entry["balances"].items():
+            other_user = users.get(other_user_id)
 
             if other_user:
                 user_balances.append(UserBalance(
@@ -235,8 +84,8 @@ async def get_my_balances(
 
         if user_balances:
             group_balances.append(GroupBalanceSummary(
-                group_id=membership.group_id,
-                group_name=membership.group.name,
+                group_id=group_id,
+                group_name=entry["name"],
                 your_total_balance=group_net,
                 balances=user_balances
             ))
@@ -252,43 +101,27 @@ async def get_my_balances(
 @router.get("/group/{group_id}", response_model=GroupBalanceSummary)
 async def get_group_balance(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
+    user_loader: UserLoader = Depends(get_user_loader)
 ):
     """Get balances for a specific group."""
-    # Check membership
-    membership_result = await db.execute(
-        select(Membership)
-        .options(selectinload(Membership.group))
-        .where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    membership = membership_result.scalar_one_or_none()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
+    group_name = (await db.execute(select(Group.name).where(Group.id == group_id))).scalar_one()
 
     balances = await get_group_balances(db, group_id, current_user.id)
+    balances = {
+        other_user_id: balance
+        for other_user_id, balance in balances.items()
+        if abs(balance) >= Decimal("0.01")
+    }
+    users = await user_loader.get_many(balances)
 
     user_balances = []
     group_net = Decimal(0)
 
     for other_user_id, balance in balances.items():
-        if abs(balance) < Decimal("0.01"):
-            continue
-
-        user_result = await db.execute(
-            select(User).where(User.id == other_user_id)
-        )
-        other_user = user_result.scalar_one_or_none()
+        other_user = users.get(other_user_id)
 
         if other_user:
             user_balances.append(UserBalance(
@@ -302,7 +135,7 @@ async def get_group_balance(
 
     return GroupBalanceSummary(
         group_id=group_id,
-        group_name=membership.group.name,
+        group_name=group_name,
         your_total_balance=group_net,
         balances=user_balances
     )
@@ -311,69 +144,30 @@ async def get_group_balance(
 @router.get("/group/{group_id}/settlements", response_model=GroupSettlementResponse)
 async def get_settlement_suggestions(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    mode: str = Query("greedy", pattern="^(greedy|exact|heuristic)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
+    user_loader: UserLoader = Depends(get_user_loader)
 ):
     """Get optimized settlement suggestions for a group."""
-    # Check membership
-    membership_result = await db.execute(
-        select(Membership)
-        .options(selectinload(Membership.group))
-        .where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    membership = membership_result.scalar_one_or_none()
-
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
-
-    # Get all balances for simplification
-    all_balances = await get_all_group_debts(db, group_id)
+    await require_member(db, group_id, current_user.id)
+    group_name = (await db.execute(select(Group.name).where(Group.id == group_id))).scalar_one()
 
     # Count original transactions for current user only
     user_balances = await get_group_balances(db, group_id, current_user.id)
     original_count = sum(1 for b in user_balances.values() if abs(b) > Decimal("0.01"))
 
-    # Simplify
-    simplified = simplify_debts(all_balances)
-
-    # Only return suggestions involving the current user
-    simplified = [
-        s for s in simplified
-        if s["from_user_id"] == current_user.id or s["to_user_id"] == current_user.id
+    # Simplify the whole group (shared by all members), then keep the current user's transfers
+    user_loader.prime(current_user)
+    simplification = await get_debt_simplification(db, group_id, mode, user_loader)
+    suggestions = [
+        s for s in simplification.simplified_debts
+        if s.from_user_id == current_user.id or s.to_user_id == current_user.id
     ]
 
-    # Get user names
-    suggestions = []
-    for settlement in simplified:
-        from_user_result = await db.execute(
-            select(User).where(User.id == settlement["from_user_id"])
-        )
-        to_user_result = await db.execute(
-            select(User).where(User.id == settlement["to_user_id"])
-        )
-        from_user = from_user_result.scalar_one()
-        to_user = to_user_result.scalar_one()
-
-        suggestions.append(SettlementSuggestion(
-            from_user_id=settlement["from_user_id"],
-            from_user_name=from_user.name,
-            to_user_id=settlement["to_user_id"],
-            to_user_name=to_user.name,
-            amount=settlement["amount"]
-        ))
-
     return GroupSettlementResponse(
         group_id=group_id,
-        group_name=membership.group.name,
+        group_name=group_name,
         suggestions=suggestions,
         total_transactions=len(suggestions),
         original_transactions=original_count
@@ -383,55 +177,71 @@ async def get_settlement_suggestions(
 @router.get("/simplify/{group_id}", response_model=DebtSimplificationResult)
 async def simplify_group_debts(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    mode: str = Query("greedy", pattern="^(greedy|exact|heuristic)$"),
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db),
+    user_loader: UserLoader = Depends(get_user_loader)
 ):
     """Get debt simplification details for a group."""
-    # Check membership
-    membership_result = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
+    await require_member(db, group_id, current_user.id)
+
+    user_loader.prime(current_user)
+    return await get_debt_simplification(db, group_id, mode, user_loader)
+
+
+async def get_debt_simplification(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    mode: str,
+    user_loader: UserLoader
+) -> DebtSimplificationResult:
+    """The group's simplified debts, cached until the group's data changes."""
+    version = await get_data_version(db, group_id)
+    return await get_response_cache().get_or_compute(
+        ("debt-simplification", group_id, version, mode),
+        DebtSimplificationResult,
+        lambda: build_debt_simplification(db, group_id, mode, user_loader)
     )
-    if not membership_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
 
+
+async def build_debt_simplification(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    mode: str,
+    user_loader: UserLoader
+) -> DebtSimplificationResult:
+    """Compute the debt simplification of a group."""
     # Get all balances
     all_balances = await get_all_group_debts(db, group_id)
 
+    # Simplify; the exact and heuristic searches are CPU-bound (tens of ms for
+    # large groups), so they run in a thread instead of blocking the event loop
+    if mode == "greedy":
+        simplified = simplify_debts(all_balances, mode=mode)
+    else:
+        simplified = await asyncio.to_thread(simplify_debts, all_balances, mode)
+
+    # Every user in the simplified list also has a non-zero balance
+    users = await user_loader.get_many(
+        user_id for user_id, balance in all_balances.items() if abs(balance) > Decimal("0.01")
+    )
+
     # Get user info for original debts
     original_debts = []
     for user_id, balance in all_balances.items():
         if abs(balance) > Decimal("0.01"):
-            user_result = await db.execute(select(User).where(User.id == user_id))
-            user = user_result.scalar_one()
+            user = users[user_id]
             original_debts.append({
                 "user_id": str(user_id),
                 "user_name": user.name,
                 "balance": float(balance)
             })
 
-    # Simplify
-    simplified = simplify_debts(all_balances)
-
     # Get user names for simplified
     simplified_suggestions = []
     for settlement in simplified:
-        from_user_result = await db.execute(
-            select(User).where(User.id == settlement["from_user_id"])
-        )
-        to_user_result = await db.execute(
-            select(User).where(User.id == settlement["to_user_id"])
-        )
-        from_user = from_user_result.scalar_one()
-        to_user = to_user_result.scalar_one()
+        from_user = users[settlement["from_user_id"]]
+        to_user = users[settlement["to_user_id"]]
 
         simplified_suggestions.append(SettlementSuggestion(
             from_user_id=settlement["from_user_id"],
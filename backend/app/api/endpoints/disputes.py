@@ -6,8 +6,11 @@ from typing import List, Optional
 from datetime import datetime
 import uuid
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
+from app.db.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.services import balance_ledger
+from app.services.authorization import require_admin, require_member
+from app.services.response_cache import bump_data_version
 from app.models import User, Expense, Payment, Dispute, DisputeVote, Membership
 from app.schemas import (
     DisputeCreate, DisputeResponse, DisputeVoteCreate,
@@ -98,21 +101,7 @@ async def create_dispute(
             )
         group_id = payment.group_id
 
-    # Check membership
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
 
     dispute = Dispute(
         expense_id=data.expense_id,
@@ -136,8 +125,8 @@ async def list_disputes(
     payment_id: Optional[uuid.UUID] = None,
     group_id: Optional[uuid.UUID] = None,
     status_filter: Optional[str] = Query(None, alias="status"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List disputes the user has access to."""
     # Get user's groups
@@ -189,8 +178,8 @@ async def list_disputes(
 @router.get("/{dispute_id}", response_model=DisputeResponse)
 async def get_dispute(
     dispute_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get dispute details."""
     result = await db.execute(
@@ -279,6 +268,8 @@ async def resolve_dispute(
         select(Dispute)
         .options(selectinload(Dispute.votes))
         .where(Dispute.id == dispute_id)
+        # Only one resolution may apply its ledger change
+        .with_for_update()
     )
     dispute = result.scalar_one_or_none()
 
@@ -307,21 +298,7 @@ async def resolve_dispute(
         )
         group_id = payment_result.scalar_one()
 
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.role == "admin",
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required to resolve disputes"
-        )
+    await require_admin(db, group_id, current_user.id, detail="Admin access required to resolve disputes")
 
     dispute.status = "resolved"
     dispute.resolution = data.resolution
@@ -331,10 +308,12 @@ async def resolve_dispute(
 
     if dispute.payment_id:
         payment_result = await db.execute(
-            select(Payment).where(Payment.id == dispute.payment_id)
+            # Locked so was_confirmed cannot change under a concurrent confirm
+            select(Payment).where(Payment.id == dispute.payment_id).with_for_update()
         )
         payment = payment_result.scalar_one_or_none()
         if payment:
+            was_confirmed = payment.status == "confirmed"
             if data.resolution == "upheld":
                 payment.status = "rejected"
                 payment.rejected_at = datetime.utcnow()
@@ -346,6 +325,18 @@ async def resolve_dispute(
                 payment.rejected_at = None
                 payment.rejected_reason = None
 
+            is_confirmed = payment.status == "confirmed"
+            if was_confirmed != is_confirmed:
+                await balance_ledger.apply_deltas(
+                    db,
+                    payment.group_id,
+                    balance_ledger.payment_deltas(
+                        payment.payer_id, payment.receiver_id, payment.amount,
+                        sign=1 if is_confirmed else -1
+                    )
+                )
+                await bump_data_version(db, payment.group_id)
+
     await db.commit()
     await db.refresh(dispute)
 
@@ -1,26 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, insert
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from pydantic import ValidationError
+from typing import Iterator, List, Optional, Tuple, Union
 from datetime import datetime, date
 from decimal import Decimal
+import csv
+import io
+import json
 import os
 import uuid
 import aiofiles
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
+from app.db.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.services import balance_ledger, spending_rollup
+from app.services.authorization import require_member
+from app.services.pagination import paginate, split_page
+from app.services.response_cache import bump_data_version
 from app.core.config import settings
+from app.core import money
 from app.models import User, Group, Membership, Expense, ExpenseSplit
 from app.schemas import (
     ExpenseCreate, ExpenseUpdate, ExpenseResponse, ExpenseListResponse,
-    SplitResponse, UserResponse, ExpenseTemplateCreate, ExpenseTemplateResponse
+    SplitResponse, UserResponse, ExpenseTemplateCreate, ExpenseTemplateResponse,
+    ExpenseImportRowError, ExpenseBulkImportResponse
 )
 from app.models import ExpenseTemplate
 
 router = APIRouter(prefix="/expenses", tags=["Expenses"])
 
+# Rows per multi-row INSERT in the bulk import, well under asyncpg's 32767 bind parameters
+INSERT_BATCH_SIZE = 1000
+
 
 def build_split_response(s) -> SplitResponse:
     """Build SplitResponse with explicit fields to avoid __dict__ issues."""
@@ -61,75 +74,76 @@ def build_expense_response(expense, comment_count: int = 0, reaction_count: int
     )
 
 
-async def check_group_membership(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> Membership:
-    """Check if user is a member of the group."""
-    result = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == user_id,
-                Membership.is_active == True
-            )
-        )
-    )
-    membership = result.scalar_one_or_none()
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
-    return membership
-
-
 def calculate_splits(
     amount: Decimal,
     split_type: str,
     participant_ids: List[uuid.UUID],
     splits_data: List[dict]
 ) -> List[dict]:
-    """Calculate split amounts based on split type."""
+    """Calculate split amounts based on split type; amounts always sum to the total."""
+    total_cents = money.to_cents(amount)
+
     if split_type == "equal":
-        per_person = amount / len(participant_ids)
-        return [{"user_id": uid, "amount": per_person} for uid in participant_ids]
+        if not participant_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Equal split needs at least one participant"
+            )
+        try:
+            cents = money.split_equal(total_cents, participant_ids)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return [{"user_id": uid, "amount": money.from_cents(cents[uid])} for uid in participant_ids]
 
     elif split_type == "unequal":
         # Splits provided directly with amounts
-        total = sum(s.get("amount", 0) for s in splits_data)
-        if abs(total - amount) > Decimal("0.01"):
+        split_cents = [money.to_cents(s.get("amount") or 0) for s in splits_data]
+        if sum(split_cents) != total_cents:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Split amounts ({total}) don't equal expense amount ({amount})"
+                detail=f"Split amounts ({money.from_cents(sum(split_cents))}) don't equal expense amount ({money.from_cents(total_cents)})"
             )
-        return splits_data
+        return [
+            {**s, "amount": money.from_cents(cents)}
+            for s, cents in zip(splits_data, split_cents)
+        ]
 
     elif split_type == "shares":
         # Calculate based on shares
-        total_shares = sum(s.get("shares", 1) for s in splits_data)
-        per_share = amount / total_shares
+        shares = [(s["user_id"], s.get("shares") or 1) for s in splits_data]
+        try:
+            cents = money.allocate(total_cents, shares)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         return [
             {
-                "user_id": s["user_id"],
-                "amount": per_share * s.get("shares", 1),
-                "shares": s.get("shares", 1)
+                "user_id": user_id,
+                "amount": money.from_cents(cents[user_id]),
+                "shares": user_shares
             }
-            for s in splits_data
+            for user_id, user_shares in shares
         ]
 
     elif split_type == "percentage":
         # Calculate based on percentages
-        total_pct = sum(s.get("percentage", 0) for s in splits_data)
+        percentages = [(s["user_id"], s.get("percentage") or 0) for s in splits_data]
+        total_pct = sum(pct for _, pct in percentages)
         if abs(total_pct - 100) > Decimal("0.01"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Percentages ({total_pct}%) don't equal 100%"
             )
+        try:
+            cents = money.allocate(total_cents, percentages)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         return [
             {
-                "user_id": s["user_id"],
-                "amount": amount * s.get("percentage", 0) / 100,
-                "percentage": s.get("percentage", 0)
+                "user_id": user_id,
+                "amount": money.from_cents(cents[user_id]),
+                "percentage": pct
             }
-            for s in splits_data
+            for user_id, pct in percentages
         ]
 
     raise HTTPException(
@@ -138,6 +152,18 @@ def calculate_splits(
     )
 
 
+def build_splits_data(data: ExpenseCreate) -> List[dict]:
+    """Calculate the splits of a new expense from its request data."""
+    if data.split_type == "equal" and data.participant_ids:
+        return calculate_splits(data.amount, "equal", data.participant_ids, [])
+    return calculate_splits(
+        data.amount,
+        data.split_type,
+        [s.user_id for s in data.splits],
+        [s.model_dump() for s in data.splits]
+    )
+
+
 @router.post("", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
 async def create_expense(
     data: ExpenseCreate,
@@ -145,7 +171,7 @@ async def create_expense(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new expense."""
-    await check_group_membership(db, data.group_id, current_user.id)
+    await require_member(db, data.group_id, current_user.id)
 
     # Create expense
     expense = Expense(
@@ -163,17 +189,7 @@ async def create_expense(
     await db.flush()
 
     # Calculate and create splits
-    if data.split_type == "equal" and data.participant_ids:
-        splits_data = calculate_splits(
-            data.amount, "equal", data.participant_ids, []
-        )
-    else:
-        splits_data = calculate_splits(
-            data.amount,
-            data.split_type,
-            [s.user_id for s in data.splits],
-            [s.model_dump() for s in data.splits]
-        )
+    splits_data = build_splits_data(data)
 
     for split_info in splits_data:
         split = ExpenseSplit(
@@ -185,6 +201,23 @@ async def create_expense(
         )
         db.add(split)
 
+    await balance_ledger.apply_deltas(
+        db,
+        expense.group_id,
+        balance_ledger.expense_deltas(
+            expense.payer_id, [(s["user_id"], s["amount"]) for s in splits_data]
+        )
+    )
+    await spending_rollup.apply_deltas(
+        db,
+        expense.group_id,
+        spending_rollup.expense_deltas(
+            expense.date, expense.category, expense.payer_id, expense.amount,
+            [(s["user_id"], s["amount"]) for s in splits_data]
+        )
+    )
+    await bump_data_version(db, expense.group_id)
+
     await db.commit()
 
     # Reload with relationships
@@ -201,21 +234,237 @@ async def create_expense(
     return build_expense_response(expense)
 
 
+# ==================== BULK IMPORT ====================
+IMPORT_FIELDS = ("description", "amount", "date", "payer_id", "split_type", "category", "notes")
+SPLIT_VALUE_FIELDS = {"unequal": "amount", "shares": "shares", "percentage": "percentage"}
+
+
+def parse_csv_import_row(row: dict) -> dict:
+    """
+    Turn a CSV row into ExpenseCreate fields.
+
+    `participant_ids` is a ';'-separated list of user IDs (equal splits) and
+    `splits` a ';'-separated list of `user_id=value`, where value is the amount,
+    shares or percentage depending on split_type.
+    """
+    data = {}
+    for field in IMPORT_FIELDS:
+        value = (row.get(field) or "").strip()
+        if value:
+            data[field] = value
+
+    participant_ids = [p.strip() for p in (row.get("participant_ids") or "").split(";") if p.strip()]
+    if participant_ids:
+        data["participant_ids"] = participant_ids
+
+    splits = []
+    value_field = SPLIT_VALUE_FIELDS.get(data.get("split_type"), "amount")
+    for part in (row.get("splits") or "").split(";"):
+        if not part.strip():
+            continue
+        user_id, _, value = part.partition("=")
+        split = {"user_id": user_id.strip()}
+        if value.strip():
+            split[value_field] = value.strip()
+        splits.append(split)
+    if splits:
+        data["splits"] = splits
+
+    return data
+
+
+def parse_import_rows(text: str, file_format: str) -> Iterator[Tuple[int, Union[dict, str]]]:
+    """Yield (line number, row data or error message) for each row of the upload."""
+    if file_format == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for row in reader:
+            yield reader.line_num, parse_csv_import_row(row)
+        return
+
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, "Expected a JSON object"
+            continue
+        yield line_no, row
+
+
+def format_validation_error(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+@router.post("/bulk", response_model=ExpenseBulkImportResponse)
+async def bulk_import_expenses(
+    group_id: uuid.UUID,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    skip_invalid: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import expenses into a group from a CSV or NDJSON file.
+
+    Every row is validated like POST /expenses. By default nothing is written
+    if any row fails; with skip_invalid=true the valid rows are imported. All
+    expenses and splits are written in one transaction with multi-row inserts.
+    """
+    await require_member(db, group_id, current_user.id)
+
+    if file_format is None:
+        filename = (file.filename or "").lower()
+        is_ndjson = filename.endswith((".ndjson", ".jsonl")) or file.content_type in (
+            "application/x-ndjson", "application/jsonl"
+        )
+        file_format = "ndjson" if is_ndjson else "csv"
+
+    contents = await file.read()
+    if len(contents) > settings.BULK_IMPORT_MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File too large"
+        )
+    try:
+        text = contents.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded"
+        )
+
+    members_result = await db.execute(
+        select(Membership.user_id).where(
+            and_(
+                Membership.group_id == group_id,
+                Membership.is_active == True
+            )
+        )
+    )
+    member_ids = {row[0] for row in members_result.all()}
+
+    now = datetime.utcnow()
+    expense_rows = []
+    split_rows = []
+    ledger_deltas = []
+    rollup_deltas = []
+    errors = []
+
+    for line_no, row in parse_import_rows(text, file_format):
+        if len(expense_rows) + len(errors) >= settings.BULK_IMPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many rows (max {settings.BULK_IMPORT_MAX_ROWS})"
+            )
+
+        if isinstance(row, str):
+            errors.append(ExpenseImportRowError(row=line_no, error=row))
+            continue
+
+        try:
+            data = ExpenseCreate.model_validate({**row, "group_id": group_id})
+            # Rounded once, so the row, its splits and the rollup all use the stored amount
+            amount = money.quantize(data.amount)
+            data = data.model_copy(update={"amount": amount})
+            splits_data = build_splits_data(data)
+        except ValidationError as e:
+            errors.append(ExpenseImportRowError(row=line_no, error=format_validation_error(e)))
+            continue
+        except HTTPException as e:
+            errors.append(ExpenseImportRowError(row=line_no, error=str(e.detail)))
+            continue
+
+        unknown_ids = ({data.payer_id} | {s["user_id"] for s in splits_data}) - member_ids
+        if unknown_ids:
+            errors.append(ExpenseImportRowError(
+                row=line_no,
+                error=f"Not members of this group: {', '.join(sorted(str(u) for u in unknown_ids))}"
+            ))
+            continue
+
+        expense_id = uuid.uuid4()
+        expense_rows.append({
+            "id": expense_id,
+            "group_id": group_id,
+            "description": data.description,
+            "amount": amount,
+            "date": data.date,
+            "payer_id": data.payer_id,
+            "split_type": data.split_type,
+            "category": data.category,
+            "notes": data.notes,
+            "created_by_id": current_user.id,
+            "created_at": now,
+        })
+        for split_info in splits_data:
+            split_rows.append({
+                "id": uuid.uuid4(),
+                "expense_id": expense_id,
+                "user_id": split_info["user_id"],
+                "amount": split_info["amount"],
+                "shares": split_info.get("shares"),
+                "percentage": split_info.get("percentage"),
+                "created_at": now,
+            })
+        ledger_deltas.append(balance_ledger.expense_deltas(
+            data.payer_id, [(s["user_id"], s["amount"]) for s in splits_data]
+        ))
+        rollup_deltas.append(spending_rollup.expense_deltas(
+            data.date, data.category, data.payer_id, amount,
+            [(s["user_id"], s["amount"]) for s in splits_data]
+        ))
+
+    if errors and not skip_invalid:
+        return ExpenseBulkImportResponse(imported=0, failed=len(errors), errors=errors)
+
+    if expense_rows:
+        # One INSERT ... VALUES statement per batch instead of asyncpg's executemany,
+        # which sends a separate execution of the prepared statement for every row
+        for model, rows in ((Expense, expense_rows), (ExpenseSplit, split_rows)):
+            for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                await db.execute(insert(model).values(rows[start:start + INSERT_BATCH_SIZE]))
+        await balance_ledger.apply_deltas(db, group_id, balance_ledger.merge_deltas(*ledger_deltas))
+        await spending_rollup.apply_deltas(db, group_id, spending_rollup.merge_deltas(*rollup_deltas))
+        await bump_data_version(db, group_id)
+        await db.commit()
+
+    return ExpenseBulkImportResponse(
+        imported=len(expense_rows),
+        failed=len(errors),
+        errors=errors
+    )
+
+
 @router.get("", response_model=ExpenseListResponse)
 async def list_expenses(
     group_id: uuid.UUID,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     category: Optional[str] = None,
     payer_id: Optional[uuid.UUID] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     search: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List expenses for a group with filtering."""
-    await check_group_membership(db, group_id, current_user.id)
+    """
+    List expenses for a group with filtering.
+
+    Pass the returned next_cursor as `cursor` to fetch the following page
+    without OFFSET. The total is only counted in page mode or with
+    include_total=true.
+    """
+    await require_member(db, group_id, current_user.id)
 
     # Build query
     query = select(Expense).where(
@@ -237,35 +486,37 @@ async def list_expenses(
         query = query.where(Expense.description.ilike(f"%{search}%"))
 
     # Count total
-    count_result = await db.execute(
-        select(func.count()).select_from(query.subquery())
-    )
-    total = count_result.scalar()
+    total = None
+    if not cursor or include_total:
+        count_result = await db.execute(
+            select(func.count()).select_from(query.subquery())
+        )
+        total = count_result.scalar()
 
     # Get paginated results
     query = query.options(
         selectinload(Expense.payer),
         selectinload(Expense.splits).selectinload(ExpenseSplit.user)
-    ).order_by(Expense.date.desc(), Expense.created_at.desc())
-
-    query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    expenses = result.scalars().all()
+    )
+    sort_key = (Expense.date, Expense.created_at, Expense.id)
+    result = await db.execute(paginate(query, sort_key, per_page, cursor, page))
+    expenses, next_cursor = split_page(result.scalars().all(), sort_key, per_page)
 
     return ExpenseListResponse(
         expenses=[build_expense_response(e) for e in expenses],
         total=total,
         page=page,
         per_page=per_page,
-        total_pages=(total + per_page - 1) // per_page
+        total_pages=(total + per_page - 1) // per_page if total is not None else None,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get expense details."""
     result = await db.execute(
@@ -286,7 +537,7 @@ async def get_expense(
             detail="Expense not found"
         )
 
-    await check_group_membership(db, expense.group_id, current_user.id)
+    await require_member(db, expense.group_id, current_user.id)
 
     return build_expense_response(
         expense,
@@ -307,6 +558,9 @@ async def update_expense(
         select(Expense)
         .options(selectinload(Expense.splits))
         .where(and_(Expense.id == expense_id, Expense.is_deleted == False))
+        # The ledger and rollup deltas reverse what is read here; concurrent
+        # updates/deletes must wait so they never reverse the same values twice
+        .with_for_update()
     )
     expense = result.scalar_one_or_none()
 
@@ -316,26 +570,25 @@ async def update_expense(
             detail="Expense not found"
         )
 
-    await check_group_membership(db, expense.group_id, current_user.id)
+    role = await require_member(db, expense.group_id, current_user.id)
 
     # Check if user can edit (creator or admin)
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == expense.group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    member = membership.scalar_one()
-
-    if expense.created_by_id != current_user.id and member.role != "admin":
+    if expense.created_by_id != current_user.id and role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Can only edit your own expenses or be an admin"
         )
 
+    # Reverse the expense's current effect on the ledger
+    old_deltas = balance_ledger.expense_deltas(
+        expense.payer_id, [(s.user_id, s.amount) for s in expense.splits], sign=-1
+    )
+    new_splits = [(s.user_id, s.amount) for s in expense.splits]
+    old_rollup_deltas = spending_rollup.expense_deltas(
+        expense.date, expense.category, expense.payer_id, expense.amount,
+        [(s.user_id, s.amount) for s in expense.splits], sign=-1
+    )
+
     # Update fields
     update_data = data.model_dump(exclude_unset=True, exclude={"splits", "participant_ids"})
     for field, value in update_data.items():
@@ -372,6 +625,27 @@ async def update_expense(
             )
             db.add(split)
 
+        new_splits = [(s["user_id"], s["amount"]) for s in splits_data]
+
+    await balance_ledger.apply_deltas(
+        db,
+        expense.group_id,
+        balance_ledger.merge_deltas(
+            old_deltas, balance_ledger.expense_deltas(expense.payer_id, new_splits)
+        )
+    )
+    await spending_rollup.apply_deltas(
+        db,
+        expense.group_id,
+        spending_rollup.merge_deltas(
+            old_rollup_deltas,
+            spending_rollup.expense_deltas(
+                expense.date, expense.category, expense.payer_id, expense.amount, new_splits
+            )
+        )
+    )
+    await bump_data_version(db, expense.group_id)
+
     await db.commit()
 
     # Reload
@@ -396,7 +670,11 @@ async def delete_expense(
 ):
     """Delete an expense (soft delete)."""
     result = await db.execute(
-        select(Expense).where(and_(Expense.id == expense_id, Expense.is_deleted == False))
+        select(Expense)
+        .options(selectinload(Expense.splits))
+        .where(and_(Expense.id == expense_id, Expense.is_deleted == False))
+        # See update_expense; a waiting delete re-checks is_deleted once it gets the lock
+        .with_for_update()
     )
     expense = result.scalar_one_or_none()
 
@@ -407,24 +685,9 @@ async def delete_expense(
         )
 
     # Check membership and permissions
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == expense.group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    member = membership.scalar_one_or_none()
+    role = await require_member(db, expense.group_id, current_user.id)
 
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
-
-    if expense.created_by_id != current_user.id and member.role != "admin":
+    if expense.created_by_id != current_user.id and role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Can only delete your own expenses or be an admin"
@@ -433,6 +696,24 @@ async def delete_expense(
     expense.is_deleted = True
     expense.deleted_at = datetime.utcnow()
     expense.deleted_by_id = current_user.id
+
+    await balance_ledger.apply_deltas(
+        db,
+        expense.group_id,
+        balance_ledger.expense_deltas(
+            expense.payer_id, [(s.user_id, s.amount) for s in expense.splits], sign=-1
+        )
+    )
+    await spending_rollup.apply_deltas(
+        db,
+        expense.group_id,
+        spending_rollup.expense_deltas(
+            expense.date, expense.category, expense.payer_id, expense.amount,
+            [(s.user_id, s.amount) for s in expense.splits], sign=-1
+        )
+    )
+    await bump_data_version(db, expense.group_id)
+
     await db.commit()
 
     return {"message": "Expense deleted successfully"}
@@ -462,7 +743,7 @@ async def upload_receipt(
             detail="Expense not found"
         )
 
-    await check_group_membership(db, expense.group_id, current_user.id)
+    await require_member(db, expense.group_id, current_user.id)
 
     # Validate file
     allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp", "application/pdf"]
@@ -505,7 +786,7 @@ async def create_template(
 ):
     """Create an expense template."""
     if data.group_id:
-        await check_group_membership(db, data.group_id, current_user.id)
+        await require_member(db, data.group_id, current_user.id)
 
     template = ExpenseTemplate(
         user_id=current_user.id,
@@ -526,8 +807,8 @@ async def create_template(
 @router.get("/templates", response_model=List[ExpenseTemplateResponse])
 async def list_templates(
     group_id: Optional[uuid.UUID] = None,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List expense templates."""
     query = select(ExpenseTemplate).where(ExpenseTemplate.user_id == current_user.id)
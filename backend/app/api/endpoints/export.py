@@ -0,0 +1,267 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, or_, literal, null, cast, union_all, String, Numeric
+from sqlalchemy.orm import aliased
+from typing import AsyncIterator, Optional, Sequence
+from datetime import date
+from decimal import Decimal
+import csv
+import io
+import json
+import uuid
+
+from app.db.database import get_read_db
+from app.api.deps import get_current_user_read
+from app.core.config import settings
+from app.services.authorization import require_member
+from app.models import User, Group, Membership, Expense, ExpenseSplit, Payment
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+GROUP_EXPORT_COLUMNS = (
+    "date", "type", "id", "group", "description", "category", "amount",
+    "payer", "receiver", "participant", "share", "status"
+)
+MY_EXPORT_COLUMNS = (
+    "date", "type", "id", "group", "description", "category", "amount",
+    "payer", "receiver", "your_share", "status"
+)
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+Payer = aliased(User, name="payer")
+Receiver = aliased(User, name="receiver")
+Participant = aliased(User, name="participant")
+
+
+# ==================== ROW STREAMING ====================
+def _json_default(value):
+    if isinstance(value, (Decimal, uuid.UUID, date)):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def format_chunk(rows: Sequence, columns: Sequence[str], file_format: str) -> str:
+    """Render a batch of result rows as CSV lines or NDJSON."""
+    if file_format == "ndjson":
+        return "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+            for row in rows
+        )
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_rows(stmt, columns: Sequence[str], file_format: str, bind) -> AsyncIterator[str]:
+    """
+    Stream a query through a server-side cursor, one batch at a time.
+
+    The request session is closed before a StreamingResponse body is sent, so
+    the stream uses its own session on the same engine (replica or primary)
+    for as long as the client keeps reading.
+    """
+    if file_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue()
+
+    async with AsyncSession(bind) as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield format_chunk(rows, columns, file_format)
+
+
+def export_response(db: AsyncSession, stmt, columns: Sequence[str], file_format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(stmt, columns, file_format, db.bind),
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'}
+    )
+
+
+def apply_date_range(stmt, column, start_date: Optional[date], end_date: Optional[date]):
+    if start_date:
+        stmt = stmt.where(column >= start_date)
+    if end_date:
+        stmt = stmt.where(column <= end_date)
+    return stmt
+
+
+# ==================== GROUP EXPORT ====================
+@router.get("/group/{group_id}")
+async def export_group_history(
+    group_id: uuid.UUID,
+    file_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Export every expense split and payment of a group.
+
+    Expenses produce one row per participant (participant, share); payments
+    produce one row each. Rows are ordered by date, oldest first.
+    """
+    await require_member(db, group_id, current_user.id)
+
+    expense_rows = apply_date_range(
+        select(
+            Expense.date,
+            literal("expense").label("type"),
+            Expense.id,
+            Group.name.label("group"),
+            Expense.description,
+            Expense.category,
+            Expense.amount,
+            Payer.name.label("payer"),
+            cast(null(), String).label("receiver"),
+            Participant.name.label("participant"),
+            ExpenseSplit.amount.label("share"),
+            Expense.approval_status.label("status"),
+            Expense.created_at,
+        )
+        .join(Group, Group.id == Expense.group_id)
+        .join(Payer, Payer.id == Expense.payer_id)
+        .join(ExpenseSplit, ExpenseSplit.expense_id == Expense.id)
+        .join(Participant, Participant.id == ExpenseSplit.user_id)
+        .where(
+            and_(
+                Expense.group_id == group_id,
+                Expense.is_deleted == False,
+                Group.is_deleted == False
+            )
+        ),
+        Expense.date, start_date, end_date
+    )
+
+    payment_rows = apply_date_range(
+        select(
+            Payment.date,
+            literal("payment").label("type"),
+            Payment.id,
+            Group.name.label("group"),
+            Payment.description,
+            cast(null(), String).label("category"),
+            Payment.amount,
+            Payer.name.label("payer"),
+            Receiver.name.label("receiver"),
+            cast(null(), String).label("participant"),
+            cast(null(), Numeric).label("share"),
+            Payment.status,
+            Payment.created_at,
+        )
+        .join(Group, Group.id == Payment.group_id)
+        .join(Payer, Payer.id == Payment.payer_id)
+        .join(Receiver, Receiver.id == Payment.receiver_id)
+        .where(and_(Payment.group_id == group_id, Group.is_deleted == False)),
+        Payment.date, start_date, end_date
+    )
+
+    history = union_all(expense_rows, payment_rows).subquery()
+    stmt = (
+        select(*(history.c[column] for column in GROUP_EXPORT_COLUMNS))
+        .order_by(history.c.date, history.c.created_at, history.c.id)
+    )
+
+    return export_response(db, stmt, GROUP_EXPORT_COLUMNS, file_format, f"group_{group_id}_history")
+
+
+# ==================== PERSONAL EXPORT ====================
+@router.get("/me")
+async def export_my_history(
+    file_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    type_filter: str = Query("all", alias="type", pattern="^(all|expenses|payments)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Export the current user's transactions across all groups.
+
+    Expenses are those the user paid for or has a share in (your_share is the
+    user's split); payments are those the user sent or received.
+    """
+    user_id = current_user.id
+    queries = []
+
+    if type_filter in ("all", "expenses"):
+        # Outer join on the user's own split: at most one per expense
+        queries.append(apply_date_range(
+            select(
+                Expense.date,
+                literal("expense").label("type"),
+                Expense.id,
+                Group.name.label("group"),
+                Expense.description,
+                Expense.category,
+                Expense.amount,
+                Payer.name.label("payer"),
+                cast(null(), String).label("receiver"),
+                ExpenseSplit.amount.label("your_share"),
+                Expense.approval_status.label("status"),
+                Expense.created_at,
+            )
+            .join(Group, Group.id == Expense.group_id)
+            .join(Payer, Payer.id == Expense.payer_id)
+            .outerjoin(
+                ExpenseSplit,
+                and_(
+                    ExpenseSplit.expense_id == Expense.id,
+                    ExpenseSplit.user_id == user_id
+                )
+            )
+            .where(
+                and_(
+                    Expense.group_id.in_(
+                        select(Membership.group_id).where(Membership.user_id == user_id)
+                    ),
+                    Expense.is_deleted == False,
+                    or_(
+                        Expense.payer_id == user_id,
+                        ExpenseSplit.id.isnot(None)
+                    )
+                )
+            ),
+            Expense.date, start_date, end_date
+        ))
+
+    if type_filter in ("all", "payments"):
+        queries.append(apply_date_range(
+            select(
+                Payment.date,
+                literal("payment").label("type"),
+                Payment.id,
+                Group.name.label("group"),
+                Payment.description,
+                cast(null(), String).label("category"),
+                Payment.amount,
+                Payer.name.label("payer"),
+                Receiver.name.label("receiver"),
+                Payment.amount.label("your_share"),
+                Payment.status,
+                Payment.created_at,
+            )
+            .join(Group, Group.id == Payment.group_id)
+            .join(Payer, Payer.id == Payment.payer_id)
+            .join(Receiver, Receiver.id == Payment.receiver_id)
+            .where(
+                or_(
+                    Payment.payer_id == user_id,
+                    Payment.receiver_id == user_id
+                )
+            ),
+            Payment.date, start_date, end_date
+        ))
+
+    history = (union_all(*queries) if len(queries) > 1 else queries[0]).subquery()
+    stmt = (
+        select(*(history.c[column] for column in MY_EXPORT_COLUMNS))
+        .order_by(history.c.date, history.c.created_at, history.c.id)
+    )
+
+    return export_response(db, stmt, MY_EXPORT_COLUMNS, file_format, "my_transactions")
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import selectinload
 from datetime import datetime
+from decimal import Decimal
 import uuid as uuid_module
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
-from app.models import User, Friendship, Group, Membership, Expense, ExpenseSplit, Payment
+from app.db.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.core import money
+from app.services import balance_ledger
+from app.models import User, Friendship, Group, Membership
 from app.schemas.friendship import (
     FriendRequestCreate, FriendshipResponse, FriendResponse, FriendListResponse
 )
@@ -85,8 +88,8 @@ async def send_friend_request(
 
 @router.get("", response_model=FriendListResponse)
 async def get_friends(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all friends and pending requests."""
     # Get accepted friendships
@@ -105,68 +108,14 @@ async def get_friends(
     )
     accepted_friendships = accepted.scalars().all()
 
+    balances = await balance_ledger.get_user_net_balances(
+        db, current_user.id, [f.friend_group_id for f in accepted_friendships if f.friend_group_id]
+    )
+
     friends = []
     for f in accepted_friendships:
         friend = f.addressee if f.requester_id == current_user.id else f.requester
 
-        # Calculate balance from friend_group expenses
-        balance = 0.0
-        if f.friend_group_id:
-            # What current user paid (expenses)
-            paid_result = await db.execute(
-                select(func.coalesce(func.sum(Expense.amount), 0)).where(
-                    and_(
-                        Expense.group_id == f.friend_group_id,
-                        Expense.payer_id == current_user.id,
-                        Expense.is_deleted == False
-                    )
-                )
-            )
-            paid = float(paid_result.scalar() or 0)
-
-            # What current user owes (from splits)
-            owed_result = await db.execute(
-                select(func.coalesce(func.sum(ExpenseSplit.amount), 0))
-                .select_from(ExpenseSplit)
-                .join(Expense)
-                .where(
-                    and_(
-                        Expense.group_id == f.friend_group_id,
-                        ExpenseSplit.user_id == current_user.id,
-                        Expense.is_deleted == False
-                    )
-                )
-            )
-            owed = float(owed_result.scalar() or 0)
-
-            # Include confirmed payments - payments made by current user
-            payments_made_result = await db.execute(
-                select(func.coalesce(func.sum(Payment.amount), 0)).where(
-                    and_(
-                        Payment.group_id == f.friend_group_id,
-                        Payment.payer_id == current_user.id,
-                        Payment.status == "confirmed"
-                    )
-                )
-            )
-            payments_made = float(payments_made_result.scalar() or 0)
-
-            # Include confirmed payments - payments received by current user
-            payments_received_result = await db.execute(
-                select(func.coalesce(func.sum(Payment.amount), 0)).where(
-                    and_(
-                        Payment.group_id == f.friend_group_id,
-                        Payment.receiver_id == current_user.id,
-                        Payment.status == "confirmed"
-                    )
-                )
-            )
-            payments_received = float(payments_received_result.scalar() or 0)
-
-            # Balance = (what I paid + what I paid back) - (what I owe + what was paid to me)
-            # Positive = friend owes me, Negative = I owe friend
-            balance = (paid + payments_made) - (owed + payments_received)
-
         friends.append(FriendResponse(
             id=friend.id,
             email=friend.email,
@@ -174,7 +123,7 @@ async def get_friends(
             profile_picture=friend.profile_picture,
             friendship_id=f.id,
             friend_group_id=f.friend_group_id,
-            balance=balance
+            balance=balances.get(f.friend_group_id, Decimal("0"))
         ))
 
     # Get pending sent
@@ -348,62 +297,14 @@ async def remove_friend(
 
     # Check if balance is settled before allowing deletion
     if friendship.friend_group_id:
-        # Calculate balance from expenses
-        paid_result = await db.execute(
-            select(func.coalesce(func.sum(Expense.amount), 0)).where(
-                and_(
-                    Expense.group_id == friendship.friend_group_id,
-                    Expense.payer_id == current_user.id,
-                    Expense.is_deleted == False
-                )
-            )
-        )
-        paid = float(paid_result.scalar() or 0)
-
-        owed_result = await db.execute(
-            select(func.coalesce(func.sum(ExpenseSplit.amount), 0))
-            .select_from(ExpenseSplit)
-            .join(Expense)
-            .where(
-                and_(
-                    Expense.group_id == friendship.friend_group_id,
-                    ExpenseSplit.user_id == current_user.id,
-                    Expense.is_deleted == False
-                )
-            )
-        )
-        owed = float(owed_result.scalar() or 0)
-
-        # Include confirmed payments
-        payments_made_result = await db.execute(
-            select(func.coalesce(func.sum(Payment.amount), 0)).where(
-                and_(
-                    Payment.group_id == friendship.friend_group_id,
-                    Payment.payer_id == current_user.id,
-                    Payment.status == "confirmed"
-                )
-            )
-        )
-        payments_made = float(payments_made_result.scalar() or 0)
-
-        payments_received_result = await db.execute(
-            select(func.coalesce(func.sum(Payment.amount), 0)).where(
-                and_(
-                    Payment.group_id == friendship.friend_group_id,
-                    Payment.receiver_id == current_user.id,
-                    Payment.status == "confirmed"
-                )
-            )
-        )
-        payments_received = float(payments_received_result.scalar() or 0)
-
-        balance = (paid + payments_made) - (owed + payments_received)
+        balances = await balance_ledger.get_user_net_balances(db, current_user.id, [friendship.friend_group_id])
+        balance = money.to_cents(balances.get(friendship.friend_group_id, 0))
 
-        # If balance is not zero (within a small tolerance), prevent deletion
-        if abs(balance) > 0.01:
+        # If balance is not zero (within a cent), prevent deletion
+        if abs(balance) > 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot remove friend with unsettled balance. Please settle up first. Balance: {balance:.2f}"
+                detail=f"Cannot remove friend with unsettled balance. Please settle up first. Balance: {money.from_cents(balance)}"
             )
 
     # Keep the friend group for expense history, just delete the friendship
@@ -416,8 +317,8 @@ async def remove_friend(
 @router.get("/{friend_id}/group")
 async def get_friend_group(
     friend_id: uuid_module.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get the friend group ID for adding expenses with a friend."""
     # Find friendship
@@ -9,9 +9,12 @@ import uuid
 import secrets
 import aiofiles
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
+from app.db.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.services.authorization import invalidate_role, require_admin, require_member
+from app.services.response_cache import bump_data_version
 from app.core.config import settings
+from app.core import money
 from app.models import User, Group, Membership, Invitation, Expense, ExpenseSplit
 from app.schemas import (
     GroupCreate, GroupUpdate, GroupResponse, GroupDetailResponse,
@@ -96,8 +99,8 @@ async def create_group(
 
 @router.get("", response_model=List[GroupResponse])
 async def list_groups(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all groups for current user."""
     # First, get the groups the user is a member of
@@ -134,25 +137,11 @@ async def list_groups(
 @router.get("/{group_id}", response_model=GroupDetailResponse)
 async def get_group(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get group details."""
-    # Check membership
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
 
     # Get group with creator
     result = await db.execute(
@@ -221,7 +210,7 @@ async def get_group(
     )
     owed = owed_result.scalar() or 0
 
-    your_balance = float(paid) - float(owed)
+    your_balance = float(money.from_cents(money.to_cents(paid) - money.to_cents(owed)))
 
     return GroupDetailResponse(
         id=group.id,
@@ -257,22 +246,7 @@ async def update_group(
     db: AsyncSession = Depends(get_db)
 ):
     """Update group settings (admin only)."""
-    # Check admin
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.role == "admin",
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+    await require_admin(db, group_id, current_user.id)
 
     result = await db.execute(select(Group).where(Group.id == group_id))
     group = result.scalar_one_or_none()
@@ -286,6 +260,7 @@ async def update_group(
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(group, field, value)
+    await bump_data_version(db, group_id)
 
     await db.commit()
     await db.refresh(group)
@@ -300,21 +275,7 @@ async def delete_group(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete group (admin only, soft delete)."""
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.role == "admin",
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+    await require_admin(db, group_id, current_user.id)
 
     result = await db.execute(select(Group).where(Group.id == group_id))
     group = result.scalar_one_or_none()
@@ -327,6 +288,7 @@ async def delete_group(
 
     group.is_deleted = True
     group.deleted_at = datetime.utcnow()
+    await bump_data_version(db, group_id)
     await db.commit()
 
     return {"message": "Group deleted successfully"}
@@ -340,21 +302,7 @@ async def upload_group_image(
     db: AsyncSession = Depends(get_db)
 ):
     """Upload group image (admin only)."""
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.role == "admin",
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+    await require_admin(db, group_id, current_user.id)
 
     result = await db.execute(select(Group).where(Group.id == group_id))
     group = result.scalar_one_or_none()
@@ -401,25 +349,11 @@ async def upload_group_image(
 @router.get("/{group_id}/members", response_model=List[MemberResponse])
 async def list_members(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List group members."""
-    # Check membership
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
 
     result = await db.execute(
         select(Membership)
@@ -445,22 +379,7 @@ async def update_member_role(
     db: AsyncSession = Depends(get_db)
 ):
     """Update member role (admin only)."""
-    # Check admin
-    admin_check = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.role == "admin",
-                Membership.is_active == True
-            )
-        )
-    )
-    if not admin_check.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+    await require_admin(db, group_id, current_user.id)
 
     # Get target membership
     result = await db.execute(
@@ -484,6 +403,7 @@ async def update_member_role(
 
     membership.role = data.role
     await db.commit()
+    await invalidate_role(db, group_id, user_id)
     await db.refresh(membership)
 
     return build_member_response(membership)
@@ -500,22 +420,7 @@ async def remove_member(
     is_self = user_id == current_user.id
 
     if not is_self:
-        # Check admin
-        admin_check = await db.execute(
-            select(Membership).where(
-                and_(
-                    Membership.group_id == group_id,
-                    Membership.user_id == current_user.id,
-                    Membership.role == "admin",
-                    Membership.is_active == True
-                )
-            )
-        )
-        if not admin_check.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access required"
-            )
+        await require_admin(db, group_id, current_user.id)
 
     result = await db.execute(
         select(Membership).where(
@@ -536,7 +441,9 @@ async def remove_member(
 
     membership.is_active = False
     membership.left_at = datetime.utcnow()
+    await bump_data_version(db, group_id)
     await db.commit()
+    await invalidate_role(db, group_id, user_id)
 
     return {"message": "Member removed successfully"}
 
@@ -550,21 +457,7 @@ async def create_invitation(
     db: AsyncSession = Depends(get_db)
 ):
     """Create group invitation."""
-    # Check membership
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
 
     # Check if already a member
     existing = await db.execute(
@@ -623,24 +516,11 @@ async def create_invitation(
 @router.get("/{group_id}/invitations", response_model=List[InvitationResponse])
 async def list_invitations(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List pending invitations for a group."""
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
 
     result = await db.execute(
         select(Invitation).where(
@@ -718,7 +598,9 @@ async def accept_invitation(
 
     invitation.status = "accepted"
     invitation.accepted_at = datetime.utcnow()
+    await bump_data_version(db, invitation.group_id)
     await db.commit()
+    await invalidate_role(db, invitation.group_id, current_user.id)
 
     return {"message": "Invitation accepted", "group_id": str(invitation.group_id)}
 
@@ -731,20 +613,7 @@ async def cancel_invitation(
     db: AsyncSession = Depends(get_db)
 ):
     """Cancel a pending invitation."""
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
 
     result = await db.execute(
         select(Invitation).where(
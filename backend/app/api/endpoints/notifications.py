@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, update
 from sqlalchemy.orm import selectinload
@@ -10,9 +10,13 @@ import json
 
 from sse_starlette.sse import EventSourceResponse
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
+from app.db.database import get_db, get_read_db, ReadSessionLocal
+from app.api.deps import get_current_user, get_current_user_read
 from app.core.security import decode_token
+from app.services.event_bus import get_event_bus
+from app.services.principal_cache import get_principal_cache
+from app.services.token_versions import get_token_versions
+from app.services.pagination import paginate, split_page
 from app.models import User, Notification, Membership
 from app.schemas import (
     NotificationResponse, NotificationListResponse, UnreadCountResponse,
@@ -21,18 +25,17 @@ from app.schemas import (
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
-# Store for SSE connections (in production, use Redis)
-sse_connections: dict = {}
-
 
 @router.get("", response_model=NotificationListResponse)
 async def list_notifications(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     unread_only: bool = False,
     type_filter: Optional[str] = Query(None, alias="type"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List user's notifications."""
     query = select(Notification).where(Notification.user_id == current_user.id)
@@ -44,10 +47,12 @@ async def list_notifications(
         query = query.where(Notification.type == type_filter)
 
     # Count total
-    count_result = await db.execute(
-        select(func.count()).select_from(query.subquery())
-    )
-    total = count_result.scalar()
+    total = None
+    if not cursor or include_total:
+        count_result = await db.execute(
+            select(func.count()).select_from(query.subquery())
+        )
+        total = count_result.scalar()
 
     # Count unread
     unread_result = await db.execute(
@@ -61,24 +66,24 @@ async def list_notifications(
     unread_count = unread_result.scalar()
 
     # Get paginated
-    query = query.order_by(Notification.created_at.desc())
-    query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    notifications = result.scalars().all()
+    sort_key = (Notification.created_at, Notification.id)
+    result = await db.execute(paginate(query, sort_key, per_page, cursor, page))
+    notifications, next_cursor = split_page(result.scalars().all(), sort_key, per_page)
 
     return NotificationListResponse(
         notifications=[NotificationResponse.model_validate(n) for n in notifications],
         unread_count=unread_count,
         total=total,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
 async def get_unread_count(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get unread notification count."""
     # Total unread
@@ -157,8 +162,8 @@ async def mark_all_notifications_read(
 @router.get("/{notification_id}", response_model=NotificationResponse)
 async def get_notification(
     notification_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific notification."""
     result = await db.execute(
@@ -210,34 +215,77 @@ async def delete_notification(
 
 
 # ==================== SSE ENDPOINTS ====================
-async def event_generator(user_id: uuid.UUID) -> AsyncGenerator:
-    """Generate SSE events for a user."""
-    queue = asyncio.Queue()
-    sse_connections[str(user_id)] = queue
+def format_sse_event(event: dict) -> dict:
+    return {
+        "event": event.get("event", "message"),
+        "id": str(event["id"]),
+        "data": json.dumps(event.get("data", {}))
+    }
+
+
+async def event_generator(user_id: uuid.UUID, last_event_id: Optional[str] = None) -> AsyncGenerator:
+    """
+    Generate SSE events for a user.
+
+    With a Last-Event-ID the buffered events after it are replayed first. If
+    the buffer no longer covers the gap a `resync` event tells the client to
+    refetch its data.
+    """
+    bus = get_event_bus()
+    async with bus.subscribe(user_id) as subscription:
+        # Subscribed before replaying, so nothing published in between is lost;
+        # duplicates are skipped by ID below
+        last_sent = 0
+        if last_event_id is not None:
+            missed, complete = [], False
+            if last_event_id.isdigit():
+                missed, complete = await bus.replay(user_id, int(last_event_id))
+            if not complete:
+                yield {"event": "resync", "data": "{}"}
+            for event in missed:
+                yield format_sse_event(event)
+            if missed:
+                last_sent = missed[-1]["id"]
+            elif complete:
+                last_sent = int(last_event_id)
 
-    try:
         while True:
             # Wait for events
             try:
-                event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                yield {
-                    "event": event.get("event", "message"),
-                    "id": event.get("id"),
-                    "data": json.dumps(event.get("data", {}))
-                }
+                event = await subscription.get(timeout=30.0)
+                if event["id"] <= last_sent:
+                    continue
+                if last_sent and event["id"] > last_sent + 1:
+                    # Events in between were dropped from the queue; fill the gap from the buffer
+                    missed, complete = await bus.replay(user_id, last_sent)
+                    if not complete:
+                        yield {"event": "resync", "data": "{}"}
+                    for missed_event in missed:
+                        if missed_event["id"] < event["id"]:
+                            yield format_sse_event(missed_event)
+                last_sent = event["id"]
+                yield format_sse_event(event)
             except asyncio.TimeoutError:
                 # Send keepalive
                 yield {"event": "ping", "data": ""}
-    finally:
-        sse_connections.pop(str(user_id), None)
 
 
 @router.get("/stream/events")
 async def sse_events(
     token: str = Query(...),
-    db: AsyncSession = Depends(get_db),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_event_id_param: Optional[str] = Query(None, alias="last_event_id"),
 ):
-    """SSE endpoint for real-time notifications."""
+    """
+    SSE endpoint for real-time notifications; honours Last-Event-ID on reconnect.
+
+    The `last_event_id` query parameter does the same for clients that open a
+    new EventSource (e.g. with a refreshed token) and so cannot set the header.
+
+    Does not use get_db: a yield dependency would keep its session, and a
+    pooled connection, checked out for as long as the stream is open. The
+    user is loaded with a short-lived session that is closed before streaming.
+    """
     payload = decode_token(token)
     if payload is None:
         raise HTTPException(
@@ -252,26 +300,37 @@ async def sse_events(
             detail="Invalid token payload"
         )
 
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+    async with ReadSessionLocal() as db:
+        user = await get_principal_cache().get_user(db, user_uuid)
+        token_current = await get_token_versions().is_current(db, payload)
     if user is None or not getattr(user, "is_active", False):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User not found or inactive"
         )
+    if not token_current:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
 
-    return EventSourceResponse(event_generator(user.id))
+    return EventSourceResponse(event_generator(user.id, last_event_id or last_event_id_param))
 
 
 async def send_sse_event(user_id: uuid.UUID, event_type: str, data: dict):
-    """Send an SSE event to a specific user."""
-    queue = sse_connections.get(str(user_id))
-    if queue:
-        await queue.put({
-            "event": event_type,
-            "id": str(uuid.uuid4()),
-            "data": data
-        })
+    """Send an SSE event to every open connection of a user, on any worker."""
+    await get_event_bus().publish(user_id, {
+        "event": event_type,
+        "data": data
+    })
 
 
 async def broadcast_to_group(db: AsyncSession, group_id: uuid.UUID, event_type: str, data: dict, exclude_user_id: uuid.UUID = None):
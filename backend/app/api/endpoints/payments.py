@@ -9,10 +9,14 @@ import os
 import uuid
 import aiofiles
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
+from app.db.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.services import balance_ledger
+from app.services.authorization import require_member
+from app.services.pagination import paginate, split_page
+from app.services.response_cache import bump_data_version
 from app.core.config import settings
-from app.models import User, Group, Membership, Payment, PaymentProof
+from app.models import User, Group, Payment, PaymentProof
 from app.schemas import (
     PaymentCreate, PaymentUpdate, PaymentResponse, PaymentListResponse,
     PaymentProofResponse, PaymentReject, PaymentCancel, UserResponse
@@ -55,24 +59,6 @@ def build_payment_response(payment) -> PaymentResponse:
     )
 
 
-async def check_group_membership(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID):
-    """Check if user is a member of the group."""
-    result = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == user_id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
-
-
 @router.post("", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
 async def create_payment(
     data: PaymentCreate,
@@ -80,10 +66,10 @@ async def create_payment(
     db: AsyncSession = Depends(get_db)
 ):
     """Record a new payment (payer records it)."""
-    await check_group_membership(db, data.group_id, current_user.id)
+    await require_member(db, data.group_id, current_user.id)
 
     # Check receiver is also a member
-    await check_group_membership(db, data.group_id, data.receiver_id)
+    await require_member(db, data.group_id, data.receiver_id)
 
     if current_user.id == data.receiver_id:
         raise HTTPException(
@@ -125,8 +111,10 @@ async def list_payments(
     status_filter: Optional[str] = Query(None, alias="status"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List payments (optionally filtered by group)."""
     query = select(Payment).where(
@@ -138,41 +126,43 @@ async def list_payments(
     )
 
     if group_id:
-        await check_group_membership(db, group_id, current_user.id)
+        await require_member(db, group_id, current_user.id)
         query = query.where(Payment.group_id == group_id)
 
     if status_filter:
         query = query.where(Payment.status == status_filter)
 
     # Count
-    count_result = await db.execute(
-        select(func.count()).select_from(query.subquery())
-    )
-    total = count_result.scalar()
+    total = None
+    if not cursor or include_total:
+        count_result = await db.execute(
+            select(func.count()).select_from(query.subquery())
+        )
+        total = count_result.scalar()
 
     # Get paginated
     query = query.options(
         selectinload(Payment.payer),
         selectinload(Payment.receiver),
         selectinload(Payment.proofs)
-    ).order_by(Payment.created_at.desc())
-
-    query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    payments = result.scalars().all()
+    )
+    sort_key = (Payment.created_at, Payment.id)
+    result = await db.execute(paginate(query, sort_key, per_page, cursor, page))
+    payments, next_cursor = split_page(result.scalars().all(), sort_key, per_page)
 
     return PaymentListResponse(
         payments=[build_payment_response(p) for p in payments],
         total=total,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/pending", response_model=List[PaymentResponse])
 async def list_pending_payments(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List payments pending your confirmation (as receiver)."""
     result = await db.execute(
@@ -198,8 +188,8 @@ async def list_pending_payments(
 @router.get("/{payment_id}", response_model=PaymentResponse)
 async def get_payment(
     payment_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get payment details."""
     result = await db.execute(
@@ -221,7 +211,7 @@ async def get_payment(
 
     # Check access
     if payment.payer_id != current_user.id and payment.receiver_id != current_user.id:
-        await check_group_membership(db, payment.group_id, current_user.id)
+        await require_member(db, payment.group_id, current_user.id)
 
     return build_payment_response(payment)
 
@@ -241,6 +231,8 @@ async def confirm_payment(
             selectinload(Payment.proofs)
         )
         .where(Payment.id == payment_id)
+        # Concurrent confirm/reject/cancel wait here, so the ledger is applied at most once
+        .with_for_update()
     )
     payment = result.scalar_one_or_none()
 
@@ -264,6 +256,14 @@ async def confirm_payment(
 
     payment.status = "confirmed"
     payment.confirmed_at = datetime.utcnow()
+
+    await balance_ledger.apply_deltas(
+        db,
+        payment.group_id,
+        balance_ledger.payment_deltas(payment.payer_id, payment.receiver_id, payment.amount)
+    )
+    await bump_data_version(db, payment.group_id)
+
     await db.commit()
     await db.refresh(payment)
 
@@ -286,6 +286,7 @@ async def reject_payment(
             selectinload(Payment.proofs)
         )
         .where(Payment.id == payment_id)
+        .with_for_update()
     )
     payment = result.scalar_one_or_none()
 
@@ -332,6 +333,7 @@ async def cancel_payment(
             selectinload(Payment.proofs)
         )
         .where(Payment.id == payment_id)
+        .with_for_update()
     )
     payment = result.scalar_one_or_none()
 
@@ -6,9 +6,11 @@ from typing import List, Optional
 from datetime import datetime
 import uuid
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
-from app.models import User, Expense, Comment, Reaction, ActivityLog, Membership
+from app.db.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_user_read
+from app.services.authorization import require_member
+from app.services.pagination import paginate, split_page
+from app.models import User, Expense, Comment, Reaction, ActivityLog
 from app.schemas import (
     CommentCreate, CommentUpdate, CommentResponse,
     ReactionCreate, ReactionResponse, ReactionSummary,
@@ -81,21 +83,7 @@ async def check_expense_access(db: AsyncSession, expense_id: uuid.UUID, user_id:
             detail="Expense not found"
         )
 
-    # Check membership
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == expense.group_id,
-                Membership.user_id == user_id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, expense.group_id, user_id)
 
     return expense
 
@@ -144,8 +132,8 @@ async def create_comment(
 @comments_router.get("", response_model=List[CommentResponse])
 async def list_comments(
     expense_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List comments for an expense."""
     await check_expense_access(db, expense_id, current_user.id)
@@ -312,8 +300,8 @@ async def add_reaction(
 @reactions_router.get("", response_model=List[ReactionSummary])
 async def list_reactions(
     expense_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List reactions for an expense (grouped by emoji)."""
     await check_expense_access(db, expense_id, current_user.id)
@@ -384,48 +372,38 @@ async def list_group_activity(
     group_id: uuid.UUID,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List activity for a group."""
-    # Check membership
-    membership = await db.execute(
-        select(Membership).where(
-            and_(
-                Membership.group_id == group_id,
-                Membership.user_id == current_user.id,
-                Membership.is_active == True
-            )
-        )
-    )
-    if not membership.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not a member of this group"
-        )
+    await require_member(db, group_id, current_user.id)
 
     # Count
-    count_result = await db.execute(
-        select(func.count()).where(ActivityLog.group_id == group_id)
-    )
-    total = count_result.scalar()
+    total = None
+    if not cursor or include_total:
+        count_result = await db.execute(
+            select(func.count()).where(ActivityLog.group_id == group_id)
+        )
+        total = count_result.scalar()
 
     # Get paginated
-    result = await db.execute(
+    query = (
         select(ActivityLog)
         .options(selectinload(ActivityLog.user))
         .where(ActivityLog.group_id == group_id)
-        .order_by(ActivityLog.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
     )
-    activities = result.scalars().all()
+    sort_key = (ActivityLog.created_at, ActivityLog.id)
+    result = await db.execute(paginate(query, sort_key, per_page, cursor, page))
+    activities, next_cursor = split_page(result.scalars().all(), sort_key, per_page)
 
     return ActivityListResponse(
         activities=[build_activity_response(a) for a in activities],
         total=total,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        next_cursor=next_cursor
     )
 
 
@@ -8,11 +8,15 @@ import os
 import uuid
 import aiofiles
 
-from app.db.database import get_db
-from app.api.deps import get_current_user
+from app.db.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_user_read
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.models import User, Invitation, Membership
+from app.services.authorization import invalidate_role
+from app.services.principal_cache import get_principal_cache
+from app.services.token_versions import get_token_versions
+from app.services.response_cache import bump_data_version
 from app.schemas import (
     UserResponse, UserProfileResponse, UserUpdate,
     PasswordChange, NotificationPreferencesUpdate
@@ -23,7 +27,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserProfileResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: User = Depends(get_current_user_read)):
     """Get current user's profile."""
     return current_user
 
@@ -41,6 +45,7 @@ async def update_current_user(
         setattr(current_user, field, value)
 
     await db.commit()
+    await get_principal_cache().invalidate(current_user.id)
     await db.refresh(current_user)
 
     return current_user
@@ -85,6 +90,7 @@ async def upload_avatar(
     # Update user
     current_user.profile_picture = f"/uploads/avatars/{filename}"
     await db.commit()
+    await get_principal_cache().invalidate(current_user.id)
     await db.refresh(current_user)
 
     return current_user
@@ -97,20 +103,27 @@ async def change_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Change current user's password."""
+    # Not part of the cached principal
+    await db.refresh(current_user, attribute_names=["hashed_password"])
     if not current_user.hashed_password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot change password for OAuth-only accounts"
         )
 
-    if not verify_password(data.current_password, current_user.hashed_password):
+    if not await verify_password_async(data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
 
-    current_user.hashed_password = get_password_hash(data.new_password)
+    current_user.hashed_password = await get_password_hash_async(data.new_password)
+    # Revoke every token issued with the old password
+    token_versions = get_token_versions()
+    version = await token_versions.bump(db, current_user)
     await db.commit()
+    await token_versions.publish(current_user.id, version)
+    await get_principal_cache().invalidate(current_user.id)
 
     return {"message": "Password changed successfully"}
 
@@ -124,6 +137,7 @@ async def update_notification_preferences(
     """Update notification preferences."""
     current_user.notification_preferences = data.model_dump()
     await db.commit()
+    await get_principal_cache().invalidate(current_user.id)
     await db.refresh(current_user)
 
     return current_user
@@ -132,8 +146,8 @@ async def update_notification_preferences(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get a user by ID."""
     result = await db.execute(select(User).where(User.id == user_id))
@@ -155,7 +169,11 @@ async def deactivate_account(
 ):
     """Deactivate current user's account."""
     current_user.is_active = False
+    token_versions = get_token_versions()
+    version = await token_versions.bump(db, current_user)
     await db.commit()
+    await token_versions.publish(current_user.id, version)
+    await get_principal_cache().invalidate(current_user.id)
 
     return {"message": "Account deactivated successfully"}
 
@@ -164,8 +182,8 @@ async def deactivate_account(
 
 @router.get("/me/invitations", response_model=List[InvitationResponse])
 async def get_my_invitations(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get pending invitations for current user."""
     result = await db.execute(
@@ -263,7 +281,9 @@ async def accept_invitation_by_id(
 
     invitation.status = "accepted"
     invitation.accepted_at = datetime.utcnow()
+    await bump_data_version(db, invitation.group_id)
     await db.commit()
+    await invalidate_role(db, invitation.group_id, current_user.id)
 
     return {"message": "Invitation accepted", "group_id": str(invitation.group_id)}
 
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import auth, users, groups, expenses, payments, balances, notifications, social, disputes, friends, analytics
+from app.api.endpoints import auth, users, groups, expenses, payments, balances, notifications, social, disputes, friends, analytics, export
 
 api_router = APIRouter()
 
@@ -15,3 +15,4 @@ api_router.include_router(social.router)
 api_router.include_router(disputes.router)
 api_router.include_router(friends.router)
 api_router.include_router(analytics.router)
+api_router.include_router(export.router)
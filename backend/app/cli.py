@@ -0,0 +1,153 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli rebuild-ledger [--group GROUP_ID]
+    python -m app.cli verify-ledger [--group GROUP_ID]
+    python -m app.cli rebuild-rollup [--group GROUP_ID]
+    python -m app.cli verify-rollup [--group GROUP_ID]
+    python -m app.cli bench-settlement [--members 5 10 20 50] [--runs 20]
+"""
+from decimal import Decimal
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+from sqlalchemy import select
+
+from app.db.database import AsyncSessionLocal, init_db
+from app.models import Group
+from app.services import balance_ledger, spending_rollup
+from app.services.settlement import SETTLEMENT_MODES, simplify_debts
+
+
+async def _group_ids(db, group_id: str = None):
+    if group_id:
+        return [uuid.UUID(group_id)]
+    result = await db.execute(select(Group.id).order_by(Group.created_at))
+    return [row[0] for row in result.all()]
+
+
+async def rebuild_ledger(group_id: str = None) -> int:
+    """Recompute group_pair_balances from expenses and payments."""
+    await init_db()
+    async with AsyncSessionLocal() as db:
+        group_ids = await _group_ids(db, group_id)
+        for gid in group_ids:
+            # One transaction per group keeps lock time short on big installs
+            await balance_ledger.rebuild_group(db, gid)
+            await db.commit()
+        print(f"Rebuilt ledger for {len(group_ids)} group(s)")
+    return 0
+
+
+async def verify_ledger(group_id: str = None) -> int:
+    """Compare group_pair_balances with raw data; exit non-zero on drift."""
+    drifted = 0
+    async with AsyncSessionLocal() as db:
+        group_ids = await _group_ids(db, group_id)
+        for gid in group_ids:
+            mismatches = await balance_ledger.verify_group(db, gid)
+            if mismatches:
+                drifted += 1
+                for (debtor_id, creditor_id), stored, expected in mismatches:
+                    print(f"{gid} {debtor_id} -> {creditor_id}: stored {stored}, expected {expected}")
+        print(f"Checked {len(group_ids)} group(s), {drifted} with drift")
+    return 1 if drifted else 0
+
+
+async def rebuild_rollup(group_id: str = None) -> int:
+    """Backfill spending_daily_rollup from expenses and splits."""
+    await init_db()
+    async with AsyncSessionLocal() as db:
+        group_ids = await _group_ids(db, group_id)
+        for gid in group_ids:
+            await spending_rollup.rebuild_group(db, gid)
+            await db.commit()
+        print(f"Rebuilt spending rollup for {len(group_ids)} group(s)")
+    return 0
+
+
+async def verify_rollup(group_id: str = None) -> int:
+    """Compare spending_daily_rollup with raw data; exit non-zero on drift."""
+    drifted = 0
+    async with AsyncSessionLocal() as db:
+        group_ids = await _group_ids(db, group_id)
+        for gid in group_ids:
+            mismatches = await spending_rollup.verify_group(db, gid)
+            if mismatches:
+                drifted += 1
+                for (day, category, user_id), stored, expected in mismatches:
+                    print(f"{gid} {day} {category} {user_id}: stored {stored}, expected {expected}")
+        print(f"Checked {len(group_ids)} group(s), {drifted} with drift")
+    return 1 if drifted else 0
+
+
+def _random_group_balances(members: int, expenses: int, rng: random.Random):
+    """Net balances of a synthetic group with equally split expenses."""
+    user_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(members)]
+    cents = dict.fromkeys(user_ids, 0)
+    for _ in range(expenses):
+        payer_id = rng.choice(user_ids)
+        participants = rng.sample(user_ids, rng.randint(2, min(members, 6)))
+        share = rng.choice([500, 1000, 1250, 2000, 3000, 4500, 6000])
+        for user_id in participants:
+            cents[user_id] -= share
+        cents[payer_id] += share * len(participants)
+    return {user_id: Decimal(amount).scaleb(-2) for user_id, amount in cents.items()}
+
+
+def bench_settlement(members, runs: int, seed: int) -> int:
+    """Report average transfer count and runtime per settlement mode."""
+    rng = random.Random(seed)
+    print(f"{'members':>8} {'mode':>10} {'transfers':>10} {'ms':>10}")
+    for size in members:
+        samples = [_random_group_balances(size, size * 3, rng) for _ in range(runs)]
+        for mode in SETTLEMENT_MODES:
+            transfers = 0
+            started = time.perf_counter()
+            for balances in samples:
+                transfers += len(simplify_debts(balances, mode=mode))
+            elapsed_ms = (time.perf_counter() - started) * 1000 / runs
+            print(f"{size:>8} {mode:>10} {transfers / runs:>10.1f} {elapsed_ms:>10.2f}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (
+        ("rebuild-ledger", "Recompute materialized pair balances"),
+        ("verify-ledger", "Check materialized pair balances against raw data"),
+        ("rebuild-rollup", "Recompute the daily spending rollup"),
+        ("verify-rollup", "Check the daily spending rollup against raw data"),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--group", help="Only process this group ID")
+
+    bench = subparsers.add_parser("bench-settlement", help="Compare settlement modes on synthetic groups")
+    bench.add_argument("--members", type=int, nargs="+", default=[5, 10, 15, 20, 50, 200])
+    bench.add_argument("--runs", type=int, default=20)
+    bench.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild-ledger":
+        return asyncio.run(rebuild_ledger(args.group))
+    if args.command == "verify-ledger":
+        return asyncio.run(verify_ledger(args.group))
+    if args.command == "rebuild-rollup":
+        return asyncio.run(rebuild_rollup(args.group))
+    if args.command == "verify-rollup":
+        return asyncio.run(verify_rollup(args.group))
+    if args.command == "bench-settlement":
+        return bench_settlement(args.members, args.runs, args.seed)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,11 +11,47 @@ class Settings(BaseSettings):
 
     # Security
     SECRET_KEY: str = ""
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # renewed with the refresh token
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_VERSION_BACKEND: str = "memory"  # memory | redis
+    TOKEN_VERSION_TTL: int = 5  # seconds a memory-cached token version is trusted
     ALGORITHM: str = "HS256"
 
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # existing hashes are upgraded on the next login when changed
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread | process
+    PASSWORD_HASH_WORKERS: int = 4  # max concurrent bcrypt calls per worker process
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # waiting calls beyond this get a 503
+
+    # Authenticated-user cache used by get_current_user
+    PRINCIPAL_CACHE_BACKEND: str = "memory"  # memory | redis | none
+    PRINCIPAL_CACHE_TTL: int = 60  # seconds
+    PRINCIPAL_CACHE_SIZE: int = 10000
+
+    # (group, user) -> role cache behind the group authorization checks
+    GROUP_ROLE_CACHE_BACKEND: str = "memory"  # memory | redis | none
+    GROUP_ROLE_CACHE_TTL: int = 30  # seconds
+    GROUP_ROLE_CACHE_SIZE: int = 50000
+
+    # Group analytics / settlement results, keyed by the group's data_version
+    RESPONSE_CACHE_BACKEND: str = "memory"  # memory | redis (in-process LRU in front of redis) | none
+    RESPONSE_CACHE_TTL: int = 600  # seconds; bounds how long a renamed member shows their old name
+    RESPONSE_CACHE_SIZE: int = 2000
+
     # Database
     DATABASE_URL: str = ""
+    DB_ECHO: bool = False  # log every SQL statement
+    DB_POOL_SIZE: int = 5  # connections kept open per worker process
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True  # check connections on checkout
+    DB_SSL_MODE: str = "verify-full"  # disable | prefer | require | verify-ca | verify-full
+    DB_SSL_ROOT_CERT: Optional[str] = None  # CA bundle for verify-ca/verify-full (system CAs otherwise)
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements cached per connection
+    DB_PGBOUNCER: bool = False  # PgBouncer in transaction pooling mode: no named prepared statements
+    DATABASE_REPLICA_URL: str = ""  # streaming replica for read endpoints; empty reads from the primary
+    REPLICA_STICKY_SECONDS: int = 60  # how long a client's reads check the replica has caught up with its writes
 
     # Google OAuth
     GOOGLE_CLIENT_ID: str = ""
@@ -36,6 +72,28 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
 
+    # Bulk expense import
+    BULK_IMPORT_MAX_ROWS: int = 50000
+    BULK_IMPORT_MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
+
+    # Real-time events (SSE)
+    EVENT_BUS_BACKEND: str = "memory"  # memory | redis
+    REDIS_URL: str = "redis://localhost:6379/0"
+    SSE_QUEUE_SIZE: int = 100  # per connection; oldest events are dropped when full
+    SSE_REPLAY_SIZE: int = 200  # recent events kept per user for Last-Event-ID resume
+    SSE_REPLAY_TTL: int = 60 * 60 * 24  # seconds the redis backend keeps an idle user's history
+
+    # Request instrumentation
+    SERVER_TIMING_ENABLED: bool = True  # Server-Timing header with SQL count and time per request
+    QUERY_COUNT_WARN: int = 50  # requests running more SQL statements are logged as warnings
+    METRICS_ENABLED: bool = True  # Prometheus metrics at /metrics
+
+    # Analytics
+    ANALYTICS_MAX_BUCKETS: int = 400  # most spending_over_time points one request may ask for
+
+    # History export
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,132 @@
+"""
+ASGI middleware.
+
+Written as plain ASGI rather than @app.middleware("http") so streaming
+responses (SSE, exports) pass through without an extra task and queue per
+request.
+"""
+import json
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.database import LSN_COOKIE, LSN_HEADER
+from app.db.query_stats import track_queries
+from app.services import metrics
+
+request_logger = logging.getLogger("app.requests")
+
+
+class DBLSNMiddleware:
+    """
+    Hand the client the primary's WAL position after a write (set by get_db),
+    as an X-DB-LSN header and a short-lived cookie, so get_read_db keeps its
+    next reads off a replica that has not replayed that write yet.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message):
+            if message["type"] == "http.response.start":
+                lsn = scope.get("state", {}).get("db_lsn")
+                if lsn:
+                    headers = MutableHeaders(scope=message)
+                    headers[LSN_HEADER] = lsn
+                    headers.append(
+                        "set-cookie",
+                        f"{LSN_COOKIE}={lsn}; Max-Age={settings.REPLICA_STICKY_SECONDS}; "
+                        "Path=/; HttpOnly; Secure; SameSite=lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
+
+
+class QueryStatsMiddleware:
+    """
+    Count the SQL statements of each request and time them.
+
+    Adds a Server-Timing header (db, db-slowest, total) and logs one JSON
+    line per request to the "app.requests" logger; requests that run more
+    than QUERY_COUNT_WARN statements are logged as warnings.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        with track_queries() as stats:
+            async def send_with_timing(message: Message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if settings.SERVER_TIMING_ENABLED:
+                        total = (time.perf_counter() - started) * 1000
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing", f"{stats.server_timing()}, total;dur={total:.2f}"
+                        )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                record = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                    **stats.as_dict(),
+                }
+                level = logging.WARNING if stats.count > settings.QUERY_COUNT_WARN else logging.INFO
+                request_logger.log(level, json.dumps(record))
+
+
+class MetricsMiddleware:
+    """Request count, latency and in-flight gauge per route, for /metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = metrics.REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            # The route template, not the raw path, keeps the label set bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            metrics.REQUEST_DURATION.labels(method, route_path).observe(time.perf_counter() - started)
+            metrics.REQUESTS.labels(method, route_path, str(status_code)).inc()
+            metrics.sample_runtime_metrics()
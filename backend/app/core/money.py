@@ -0,0 +1,70 @@
+"""
+Money arithmetic in integer minor units (cents).
+
+Amounts cross the API and the database as Decimal with two places; inside
+split and balance loops they are plain ints, which is faster than Decimal
+and cannot drift. Allocation uses the largest remainder method with a
+stable tie-break on the key, so splits always sum exactly to the total and
+the same input always produces the same cents.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Hashable, Iterable, Sequence, Tuple, Union
+
+CENT = Decimal("0.01")
+
+Amount = Union[Decimal, int, str]
+
+
+def to_cents(amount: Amount) -> int:
+    """Convert an amount to cents, rounding half away from zero like Postgres NUMERIC."""
+    return int((Decimal(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Convert cents back to a two-place Decimal."""
+    return Decimal(cents).scaleb(-2).quantize(CENT)
+
+
+def quantize(amount: Amount) -> Decimal:
+    """Round an amount to whole cents."""
+    return from_cents(to_cents(amount))
+
+
+def allocate(total_cents: int, weights: Sequence[Tuple[Hashable, Amount]]) -> Dict[Hashable, int]:
+    """
+    Split total_cents proportionally to weights using the largest remainder method.
+
+    Every key gets floor(total * weight / sum(weights)); the cents left over go
+    one each to the keys with the largest remainders, ties broken by str(key).
+    Weights may be Decimals (e.g. percentages); they are scaled to integers first.
+    Keys must be unique.
+    """
+    if not weights:
+        return {}
+
+    int_weights = [(key, to_cents(weight)) for key, weight in weights]
+    if len({key for key, _ in int_weights}) != len(int_weights):
+        raise ValueError("Each participant can only appear once")
+    weight_total = sum(weight for _, weight in int_weights)
+    if weight_total <= 0:
+        raise ValueError("Weights must sum to a positive value")
+    if any(weight < 0 for _, weight in int_weights):
+        raise ValueError("Weights cannot be negative")
+
+    allocated = {}
+    remainders = []
+    for key, weight in int_weights:
+        share, remainder = divmod(total_cents * weight, weight_total)
+        allocated[key] = share
+        remainders.append((-remainder, str(key), key))
+
+    leftover = total_cents - sum(allocated.values())
+    for _, _, key in sorted(remainders)[:leftover]:
+        allocated[key] += 1
+
+    return allocated
+
+
+def split_equal(total_cents: int, keys: Iterable[Hashable]) -> Dict[Hashable, int]:
+    """Split total_cents equally; the odd cents go to the first keys by str(key)."""
+    return allocate(total_cents, [(key, 1) for key in keys])
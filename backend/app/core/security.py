@@ -1,6 +1,9 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
 from jose import jwt, JWTError
+import asyncio
 import bcrypt
 from app.core.config import settings
 
@@ -12,14 +15,108 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hash_bytes)
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """Hash a password."""
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different work factor than BCRYPT_ROUNDS."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+# ==================== PASSWORD HASHING POOL ====================
+class PasswordHashingPool:
+    """
+    Runs bcrypt off the event loop.
+
+    A bcrypt call takes ~200 ms at the default cost; running it inline
+    blocks every other request and SSE stream on the worker. At most
+    PASSWORD_HASH_WORKERS calls run at once, and once PASSWORD_HASH_MAX_QUEUE
+    callers are waiting new ones get a 503 instead of queueing forever.
+    """
+
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if settings.PASSWORD_HASH_EXECUTOR == "process":
+                self._executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def run(self, func, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+
+        if self.waiting >= settings.PASSWORD_HASH_MAX_QUEUE:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in attempts in progress, please retry",
+                headers={"Retry-After": "1"}
+            )
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_pool = PasswordHashingPool()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing pool."""
+    return await password_pool.run(get_password_hash, password, settings.BCRYPT_ROUNDS)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -31,9 +128,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[dict]:
+def create_refresh_token(data: dict) -> str:
+    return create_access_token(
+        {**data, "type": "refresh"},
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+
+
+def create_token_pair(user_id, token_version: int) -> Tuple[str, str]:
+    """Short-lived access token and long-lived refresh token, both bound to token_version."""
+    claims = {"sub": str(user_id), "ver": token_version or 0}
+    return create_access_token({**claims, "type": "access"}), create_refresh_token(claims)
+
+
+def decode_token(token: str, token_type: str = "access") -> Optional[dict]:
+    """Decode a token; returns None if it is invalid, expired or of another type."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    # Tokens issued before the type claim existed are access tokens
+    if payload.get("type", "access") != token_type:
+        return None
+    return payload
@@ -1,7 +1,27 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from typing import Optional
+from uuid import uuid4
+import logging
+import re
+import ssl
+import time
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+SSL_MODES = ("disable", "prefer", "require", "verify-ca", "verify-full")
+
+# Read-your-writes marker: the primary's WAL position after a request's last commit
+LSN_HEADER = "X-DB-LSN"
+LSN_COOKIE = "db_lsn"
+LSN_PATTERN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
 
 def normalize_database_url(url: str) -> str:
     if url.startswith("postgres://"):
@@ -11,31 +31,130 @@ def normalize_database_url(url: str) -> str:
     return url
 
 
-engine = create_async_engine(
-    normalize_database_url(settings.DATABASE_URL),
-    echo=settings.DEBUG,
-    future=True,
-    connect_args={
-        "ssl": True
+def build_ssl(mode: str, root_cert: Optional[str] = None):
+    """The asyncpg `ssl` argument for a libpq-style sslmode."""
+    if mode not in SSL_MODES:
+        raise ValueError(f"Unknown DB_SSL_MODE: {mode}")
+    if mode in ("disable", "prefer", "require"):
+        return mode
+    # asyncpg would look for ~/.postgresql/root.crt; fall back to the system CAs instead
+    context = ssl.create_default_context(cafile=root_cert)
+    if mode == "verify-ca":
+        context.check_hostname = False
+    return context
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that adds up how long checkouts wait for a connection (including connecting)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkouts += 1
+            self.wait_seconds += time.perf_counter() - started
+
+
+def build_engine(url: str) -> AsyncEngine:
+    connect_args = {
+        "ssl": build_ssl(settings.DB_SSL_MODE, settings.DB_SSL_ROOT_CERT),
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    pool_args = {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
     }
+
+    if settings.DB_PGBOUNCER:
+        # In transaction pooling mode consecutive statements may run on different
+        # server connections, so named prepared statements cannot be reused:
+        # turn off both statement caches and give every statement a unique name.
+        # PgBouncer does the pooling; a local pool would only pin its connections.
+        connect_args.update({
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        })
+        pool_args = {"poolclass": NullPool}
+
+    return create_async_engine(
+        normalize_database_url(url),
+        echo=settings.DB_ECHO,
+        future=True,
+        connect_args=connect_args,
+        **pool_args
+    )
+
+
+engine = build_engine(settings.DATABASE_URL)
+
+# Same pool; transactions start with BEGIN READ ONLY, reset when the connection is returned
+read_engine = engine.execution_options(postgresql_readonly=True)
+
+# Optional streaming replica for get_read_db; None sends reads to the primary
+replica_engine = (
+    build_engine(settings.DATABASE_REPLICA_URL).execution_options(postgresql_readonly=True)
+    if settings.DATABASE_REPLICA_URL else None
 )
 
+
+class PrimarySession(Session):
+    """Session on the primary that remembers whether it committed."""
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_committed(session):
+    session.info["committed"] = True
+
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+ReplicaSessionLocal = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+) if replica_engine is not None else None
+
 Base = declarative_base()
 
 
-async def get_db():
+async def get_db(request: Request):
     async with AsyncSessionLocal() as session:
         try:
             yield session
             await session.commit()
+            if replica_engine is not None and session.info.get("committed"):
+                # Sent back to the client (see main.py) so its next reads can wait for the replica
+                result = await session.execute(text("SELECT pg_current_wal_lsn()::text"))
+                request.state.db_lsn = result.scalar()
+                await session.rollback()
         except Exception:
             await session.rollback()
             raise
@@ -43,6 +162,59 @@ async def get_db():
             await session.close()
 
 
+def read_marker(request: Request) -> Optional[str]:
+    """The client's last write position, from the X-DB-LSN header or db_lsn cookie."""
+    lsn = request.headers.get(LSN_HEADER) or request.cookies.get(LSN_COOKIE)
+    return lsn if lsn and LSN_PATTERN.match(lsn) else None
+
+
+async def replica_caught_up(session: AsyncSession, lsn: str) -> bool:
+    """Whether the replica has replayed the WAL up to lsn."""
+    result = await session.execute(
+        text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"),
+        {"lsn": lsn}
+    )
+    return bool(result.scalar())
+
+
+async def open_read_session(lsn: Optional[str] = None) -> AsyncSession:
+    """
+    A read-only session on the replica, or on the primary when there is no
+    replica, it is unreachable, or it has not yet replayed the client's last
+    write (lsn).
+    """
+    if ReplicaSessionLocal is None:
+        return ReadSessionLocal()
+
+    session = ReplicaSessionLocal()
+    if lsn is None:
+        return session
+    try:
+        if await replica_caught_up(session, lsn):
+            return session
+    except (DBAPIError, OSError):
+        logger.warning("Replica check failed; reading from the primary", exc_info=True)
+    await session.close()
+    return ReadSessionLocal()
+
+
+async def get_read_db(request: Request):
+    """Session for endpoints that only read: a read-only transaction that is rolled back, never committed."""
+    session = await open_read_session(read_marker(request))
+    try:
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
+
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all does not add columns to existing tables
+        await conn.execute(text(
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0"
+        ))
+        await conn.execute(text(
+            "ALTER TABLE groups ADD COLUMN IF NOT EXISTS data_version BIGINT NOT NULL DEFAULT 0"
+        ))
@@ -0,0 +1,99 @@
+"""
+Per-request SQL statistics.
+
+SQLAlchemy cursor events add every statement's duration to the QueryStats
+of the current request - a context variable set by QueryStatsMiddleware - so
+each response can report how many statements it ran and how long they took.
+
+In tests, `assert_max_queries` pins an endpoint's query budget:
+
+    with assert_max_queries(4):
+        response = await client.get("/api/v1/balances")
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Longest statement text kept for the slowest-statement report
+STATEMENT_PREVIEW = 200
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """Statement count, total time and slowest statement of a scope (seconds)."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, duration: float):
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.total += duration
+            if duration > stats.slowest:
+                stats.slowest = duration
+                stats.slowest_statement = statement
+            stats = stats.parent
+
+    def server_timing(self) -> str:
+        """Server-Timing metrics (milliseconds) for the statements so far."""
+        return (
+            f'db;dur={self.total * 1000:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest * 1000:.2f}"
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total * 1000, 2),
+            "db_slowest_ms": round(self.slowest * 1000, 2),
+            "db_slowest_statement": " ".join(self.slowest_statement.split())[:STATEMENT_PREVIEW]
+            if self.slowest_statement else None,
+        }
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Record the statements run inside the block; nested blocks also count toward outer ones."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail with AssertionError if the block runs more than `limit` statements."""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(
+            f"Expected at most {limit} queries, ran {stats.count} "
+            f"(slowest: {stats.as_dict()['db_slowest_statement']})"
+        )
+
+
+# Registered on the Engine class, so the primary and replica engines are both covered
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -7,7 +7,15 @@ import os
 
 from app.core.config import settings
 from app.api.router import api_router
-from app.db.database import init_db
+from app.db.database import init_db, LSN_HEADER
+from app.core.middleware import DBLSNMiddleware, MetricsMiddleware, QueryStatsMiddleware
+from app.core.security import password_pool
+from app.services.authorization import close_group_roles
+from app.services.event_bus import close_event_bus
+from app.services.metrics import render_metrics, shutdown_metrics
+from app.services.principal_cache import close_principal_cache
+from app.services.response_cache import close_response_cache
+from app.services.token_versions import close_token_versions
 
 
 @asynccontextmanager
@@ -22,6 +30,13 @@ async def lifespan(app: FastAPI):
     os.makedirs(os.path.join(settings.UPLOAD_DIR, "payment_proofs"), exist_ok=True)
     yield
     # Shutdown
+    await close_event_bus()
+    await close_principal_cache()
+    await close_group_roles()
+    await close_response_cache()
+    await close_token_versions()
+    password_pool.shutdown()
+    shutdown_metrics()
 
 
 app = FastAPI(
@@ -39,7 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    
+    expose_headers=[LSN_HEADER, "Server-Timing"],
 )
 
 # Session middleware for OAuth
@@ -49,6 +64,16 @@ app.add_middleware(
     https_only=True
 )
 
+# Read-your-writes marker for replica routing
+app.add_middleware(DBLSNMiddleware)
+
+# SQL statement count and time per request
+app.add_middleware(QueryStatsMiddleware)
+
+# Prometheus request metrics (outermost, so they time everything)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Static files for uploads
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
@@ -61,6 +86,14 @@ async def health_check():
     return {"status": "healthy", "app": settings.APP_NAME}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    content, content_type = render_metrics()
+    return Response(content, headers={"Content-Type": content_type})
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
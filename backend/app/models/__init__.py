@@ -1,6 +1,6 @@
 from app.models.models import (
     User, Group, Membership, Invitation, Expense, ExpenseSplit,
-    Payment, PaymentProof, Notification, Comment, Reaction,
+    Payment, PaymentProof, GroupPairBalance, SpendingDailyRollup, Notification, Comment, Reaction,
     ActivityLog, Dispute, DisputeVote, ExpenseTemplate,
     MembershipRole, SplitType, PaymentStatus, InvitationStatus,
     DisputeStatus, ApprovalStatus, Friendship, FriendshipStatus
@@ -8,7 +8,7 @@ from app.models.models import (
 
 __all__ = [
     "User", "Group", "Membership", "Invitation", "Expense", "ExpenseSplit",
-    "Payment", "PaymentProof", "Notification", "Comment", "Reaction",
+    "Payment", "PaymentProof", "GroupPairBalance", "SpendingDailyRollup", "Notification", "Comment", "Reaction",
     "ActivityLog", "Dispute", "DisputeVote", "ExpenseTemplate",
     "MembershipRole", "SplitType", "PaymentStatus", "InvitationStatus",
     "DisputeStatus", "ApprovalStatus", "Friendship", "FriendshipStatus"
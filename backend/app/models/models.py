@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Boolean, DateTime, Text, Integer,
+    Column, String, Boolean, DateTime, Text, Integer, BigInteger,
     ForeignKey, Numeric, Date, Enum as SQLEnum, UniqueConstraint, CheckConstraint
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, INET
@@ -70,6 +70,7 @@ class User(Base):
     google_id = Column(String(255), unique=True, nullable=True, index=True)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
+    token_version = Column(Integer, default=0, nullable=False, server_default="0")  # Bump to revoke all tokens
     notification_preferences = Column(JSONB, default=dict)
     reliability_score = Column(Integer, default=50)
     last_login_at = Column(DateTime(timezone=True), nullable=True)
@@ -105,6 +106,7 @@ class Group(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     settings = Column(JSONB, default=dict)
+    data_version = Column(BigInteger, default=0, nullable=False, server_default="0")  # Bumped by every write to the group's data
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), onupdate=datetime.utcnow)
 
@@ -258,6 +260,49 @@ class Payment(Base):
     proofs = relationship("PaymentProof", back_populates="payment", cascade="all, delete-orphan")
 
 
+# ==================== GROUP PAIR BALANCES ====================
+class GroupPairBalance(Base):
+    """Materialized net balance between two members of a group.
+
+    Each unordered pair is stored once with debtor_id < creditor_id. A positive
+    amount means debtor_id owes creditor_id; a negative amount means the reverse.
+    Rows are maintained by app.services.balance_ledger in the same transaction as
+    the expense/payment writes that change them.
+    """
+    __tablename__ = "group_pair_balances"
+
+    group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    debtor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    creditor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    amount = Column(Numeric(12, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        CheckConstraint("debtor_id < creditor_id", name="chk_pair_balances_ordered"),
+    )
+
+
+# ==================== SPENDING DAILY ROLLUP ====================
+class SpendingDailyRollup(Base):
+    """Daily spending of a group per category and member, for analytics.
+
+    `paid` and `expense_count` cover the expenses the member paid, `share` the
+    member's splits. Category is normalized the way analytics groups it (blank
+    becomes 'Other'). Rows are maintained by app.services.spending_rollup in the
+    same transaction as the expense writes that change them.
+    """
+    __tablename__ = "spending_daily_rollup"
+
+    group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    category = Column(String(50), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    paid = Column(Numeric(12, 2), nullable=False, default=0)
+    share = Column(Numeric(12, 2), nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 # ==================== PAYMENT PROOFS ====================
 class PaymentProof(Base):
     __tablename__ = "payment_proofs"
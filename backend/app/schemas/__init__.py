@@ -1,5 +1,5 @@
 from app.schemas.user import (
-    UserLogin, UserRegister, TokenResponse, GoogleAuthRequest,
+    UserLogin, UserRegister, TokenResponse, RefreshTokenRequest, GoogleAuthRequest,
     PasswordResetRequest, PasswordResetConfirm, PasswordChange,
     UserCreate, UserUpdate, UserResponse, UserProfileResponse,
     NotificationPreferencesUpdate
@@ -12,7 +12,8 @@ from app.schemas.group import (
 from app.schemas.expense import (
     SplitCreate, SplitResponse, ExpenseCreate, ExpenseUpdate,
     ExpenseResponse, ExpenseListResponse, ExpenseFilter,
-    ExpenseTemplateCreate, ExpenseTemplateResponse
+    ExpenseTemplateCreate, ExpenseTemplateResponse,
+    ExpenseImportRowError, ExpenseBulkImportResponse
 )
 from app.schemas.payment import (
     PaymentCreate, PaymentUpdate, PaymentResponse, PaymentListResponse,
@@ -47,7 +48,7 @@ from app.schemas.analytics import (
 
 __all__ = [
     # User
-    "UserLogin", "UserRegister", "TokenResponse", "GoogleAuthRequest",
+    "UserLogin", "UserRegister", "TokenResponse", "RefreshTokenRequest", "GoogleAuthRequest",
     "PasswordResetRequest", "PasswordResetConfirm", "PasswordChange",
     "UserCreate", "UserUpdate", "UserResponse", "UserProfileResponse",
     "NotificationPreferencesUpdate",
@@ -59,6 +60,7 @@ __all__ = [
     "SplitCreate", "SplitResponse", "ExpenseCreate", "ExpenseUpdate",
     "ExpenseResponse", "ExpenseListResponse", "ExpenseFilter",
     "ExpenseTemplateCreate", "ExpenseTemplateResponse",
+    "ExpenseImportRowError", "ExpenseBulkImportResponse",
     # Payment
     "PaymentCreate", "PaymentUpdate", "PaymentResponse", "PaymentListResponse",
     "PaymentProofResponse", "PaymentConfirm", "PaymentReject", "PaymentCancel",
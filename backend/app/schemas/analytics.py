@@ -46,6 +46,7 @@ class GroupAnalyticsResponse(BaseModel):
     period: str
     start_date: date
     end_date: date
+    granularity: str
     total_spending: Decimal
     expense_count: int
     category_breakdown: List[CategorySpending]
@@ -60,6 +61,7 @@ class FriendsAnalyticsResponse(BaseModel):
     period: str
     start_date: date
     end_date: date
+    granularity: str
     total_spending: Decimal
     expense_count: int
     category_breakdown: List[CategorySpending]
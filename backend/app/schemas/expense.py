@@ -98,10 +98,11 @@ class ExpenseResponse(ExpenseBase):
 
 class ExpenseListResponse(BaseModel):
     expenses: List[ExpenseResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ExpenseFilter(BaseModel):
@@ -114,6 +115,18 @@ class ExpenseFilter(BaseModel):
     search: Optional[str] = None
 
 
+# ==================== BULK IMPORT SCHEMAS ====================
+class ExpenseImportRowError(BaseModel):
+    row: int  # 1-based line number in the uploaded file
+    error: str
+
+
+class ExpenseBulkImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ExpenseImportRowError] = []
+
+
 # ==================== EXPENSE TEMPLATE SCHEMAS ====================
 class ExpenseTemplateCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
@@ -2,6 +2,7 @@ from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 from app.schemas.user import UserResponse
 
 
@@ -30,7 +31,7 @@ class FriendResponse(BaseModel):
     profile_picture: Optional[str] = None
     friendship_id: UUID
     friend_group_id: Optional[UUID] = None
-    balance: float = 0  # Net balance with this friend
+    balance: Decimal = Decimal("0")  # Net balance with this friend
 
     class Config:
         from_attributes = True
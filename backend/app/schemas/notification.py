@@ -50,9 +50,10 @@ class NotificationResponse(BaseModel):
 class NotificationListResponse(BaseModel):
     notifications: List[NotificationResponse]
     unread_count: int
-    total: int
+    total: Optional[int] = None
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 class UnreadCountResponse(BaseModel):
@@ -45,9 +45,10 @@ class PaymentResponse(BaseModel):
 
 class PaymentListResponse(BaseModel):
     payments: List[PaymentResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 # ==================== PAYMENT PROOF SCHEMAS ====================
@@ -74,9 +74,10 @@ class ActivityResponse(BaseModel):
 
 class ActivityListResponse(BaseModel):
     activities: List[ActivityResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 CommentResponse.model_rebuild()
@@ -18,10 +18,15 @@ class UserRegister(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     user: "UserResponse"
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
 class GoogleAuthRequest(BaseModel):
     code: str
 
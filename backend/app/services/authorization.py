@@ -0,0 +1,187 @@
+"""
+Group authorization: the caller's role in a group.
+
+Roles are looked up at most once per (group, user) per request - the answer
+is memoised on the request's session - and kept in a short-lived cache
+across requests (GROUP_ROLE_CACHE_TTL seconds), so most requests run no
+membership query at all.
+
+Only memberships are cached, never their absence, so a new member is
+recognised at once. Endpoints that remove a member or change a role must
+call `invalidate()` after committing.
+
+Backends:
+    memory  Per-process LRU + TTL (default); other workers see a change
+            within the TTL.
+    redis   Shared across workers, so an invalidation is seen everywhere at once.
+    none    Query once per request.
+"""
+from typing import Optional
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Membership
+from app.services.cache import TTLCache
+
+# Key of the per-request memo in AsyncSession.info
+MEMO_KEY = "group_roles"
+
+
+class MemoryRoleStore:
+    def __init__(self):
+        self._cache = TTLCache(settings.GROUP_ROLE_CACHE_SIZE, settings.GROUP_ROLE_CACHE_TTL)
+
+    async def get(self, group_id: uuid.UUID, user_id: uuid.UUID) -> Optional[str]:
+        return self._cache.get((group_id, user_id))
+
+    async def set(self, group_id: uuid.UUID, user_id: uuid.UUID, role: str):
+        self._cache.set((group_id, user_id), role)
+
+    async def delete(self, group_id: uuid.UUID, user_id: uuid.UUID):
+        self._cache.delete((group_id, user_id))
+
+    async def close(self):
+        pass
+
+
+class RedisRoleStore:
+    KEY_PREFIX = "group_role:"
+
+    def __init__(self, url: str = "", client=None):
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise RuntimeError("GROUP_ROLE_CACHE_BACKEND=redis requires the 'redis' package")
+            client = redis.from_url(url)
+        self.client = client
+
+    def _key(self, group_id: uuid.UUID, user_id: uuid.UUID) -> str:
+        return f"{self.KEY_PREFIX}{group_id}:{user_id}"
+
+    async def get(self, group_id: uuid.UUID, user_id: uuid.UUID) -> Optional[str]:
+        role = await self.client.get(self._key(group_id, user_id))
+        return role.decode() if isinstance(role, bytes) else role
+
+    async def set(self, group_id: uuid.UUID, user_id: uuid.UUID, role: str):
+        await self.client.set(self._key(group_id, user_id), role, ex=settings.GROUP_ROLE_CACHE_TTL)
+
+    async def delete(self, group_id: uuid.UUID, user_id: uuid.UUID):
+        await self.client.delete(self._key(group_id, user_id))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class GroupRoles:
+    def __init__(self, store=None):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    async def get_role(self, db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> Optional[str]:
+        """The user's role in the group, or None if they are not an active member."""
+        memo = db.info.setdefault(MEMO_KEY, {})
+        key = (group_id, user_id)
+        if key in memo:
+            return memo[key]
+
+        role = None
+        if self.store is not None:
+            role = await self.store.get(group_id, user_id)
+            if role is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if role is None:
+            result = await db.execute(
+                select(Membership.role).where(
+                    and_(
+                        Membership.group_id == group_id,
+                        Membership.user_id == user_id,
+                        Membership.is_active == True
+                    )
+                )
+            )
+            role = result.scalar_one_or_none()
+            if role is not None and self.store is not None:
+                await self.store.set(group_id, user_id, role)
+
+        memo[key] = role
+        return role
+
+    async def invalidate(self, db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID):
+        db.info.get(MEMO_KEY, {}).pop((group_id, user_id), None)
+        if self.store is not None:
+            await self.store.delete(group_id, user_id)
+
+    async def close(self):
+        if self.store is not None:
+            await self.store.close()
+
+
+def create_group_roles() -> GroupRoles:
+    if settings.GROUP_ROLE_CACHE_BACKEND == "redis":
+        return GroupRoles(RedisRoleStore(settings.REDIS_URL))
+    if settings.GROUP_ROLE_CACHE_BACKEND == "memory":
+        return GroupRoles(MemoryRoleStore())
+    if settings.GROUP_ROLE_CACHE_BACKEND == "none":
+        return GroupRoles()
+    raise ValueError(f"Unknown GROUP_ROLE_CACHE_BACKEND: {settings.GROUP_ROLE_CACHE_BACKEND}")
+
+
+_group_roles: Optional[GroupRoles] = None
+
+
+def get_group_roles() -> GroupRoles:
+    global _group_roles
+    if _group_roles is None:
+        _group_roles = create_group_roles()
+    return _group_roles
+
+
+async def close_group_roles():
+    global _group_roles
+    if _group_roles is not None:
+        await _group_roles.close()
+        _group_roles = None
+
+
+async def require_member(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    user_id: uuid.UUID,
+    detail: str = "Not a member of this group"
+) -> str:
+    """Raise 403 unless the user is an active member; returns their role."""
+    role = await get_group_roles().get_role(db, group_id, user_id)
+    if role is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+    return role
+
+
+async def require_admin(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    user_id: uuid.UUID,
+    detail: str = "Admin access required"
+):
+    """Raise 403 unless the user is an active admin of the group."""
+    if await get_group_roles().get_role(db, group_id, user_id) != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+
+
+async def invalidate_role(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID):
+    """Forget a cached role; call after committing a membership change."""
+    await get_group_roles().invalidate(db, group_id, user_id)
@@ -0,0 +1,269 @@
+"""
+Materialized pairwise balance ledger (group_pair_balances).
+
+Expense and payment writes apply their balance delta here inside the request
+transaction, so balance reads cost O(members) rows instead of re-aggregating
+every split and payment of the group.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+import uuid
+
+from sqlalchemy import select, delete, func, case, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import money
+from app.models import Group, Membership, Expense, ExpenseSplit, Payment, GroupPairBalance
+
+# (debtor_id, creditor_id) in canonical order -> cents debtor owes creditor
+PairDeltas = Dict[Tuple[uuid.UUID, uuid.UUID], int]
+
+
+def _add_debt(deltas: PairDeltas, debtor_id: uuid.UUID, creditor_id: uuid.UUID, cents: int):
+    """Record that debtor owes creditor `cents` more."""
+    if debtor_id == creditor_id or not cents:
+        return
+    if debtor_id < creditor_id:
+        deltas[(debtor_id, creditor_id)] += cents
+    else:
+        deltas[(creditor_id, debtor_id)] -= cents
+
+
+def expense_deltas(
+    payer_id: uuid.UUID,
+    splits: Iterable[Tuple[uuid.UUID, Decimal]],
+    sign: int = 1
+) -> PairDeltas:
+    """Deltas for an expense: every participant owes the payer their split."""
+    deltas: PairDeltas = defaultdict(int)
+    for user_id, amount in splits:
+        _add_debt(deltas, user_id, payer_id, sign * money.to_cents(amount))
+    return deltas
+
+
+def payment_deltas(
+    payer_id: uuid.UUID,
+    receiver_id: uuid.UUID,
+    amount: Decimal,
+    sign: int = 1
+) -> PairDeltas:
+    """Deltas for a confirmed payment: paying someone back reduces what you owe them."""
+    deltas: PairDeltas = defaultdict(int)
+    _add_debt(deltas, receiver_id, payer_id, sign * money.to_cents(amount))
+    return deltas
+
+
+def merge_deltas(*all_deltas: PairDeltas) -> PairDeltas:
+    merged: PairDeltas = defaultdict(int)
+    for deltas in all_deltas:
+        for pair, amount in deltas.items():
+            merged[pair] += amount
+    return merged
+
+
+async def apply_deltas(db: AsyncSession, group_id: uuid.UUID, deltas: PairDeltas):
+    """Add deltas to the ledger with a single upsert (no flush, no commit)."""
+    rows = [
+        {
+            "group_id": group_id,
+            "debtor_id": debtor_id,
+            "creditor_id": creditor_id,
+            "amount": money.from_cents(cents)
+        }
+        # Sorted so concurrent writers lock rows in the same order
+        for (debtor_id, creditor_id), cents in sorted(deltas.items())
+        if cents
+    ]
+    if not rows:
+        return
+
+    stmt = insert(GroupPairBalance).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            GroupPairBalance.group_id,
+            GroupPairBalance.debtor_id,
+            GroupPairBalance.creditor_id,
+        ],
+        set_={
+            "amount": GroupPairBalance.amount + stmt.excluded.amount,
+            "updated_at": func.now(),
+        }
+    )
+    await db.execute(stmt)
+
+
+async def get_user_balances(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> Dict[uuid.UUID, Decimal]:
+    """Balances of the other members relative to user (positive = they owe user)."""
+    result = await db.execute(
+        select(GroupPairBalance.debtor_id, GroupPairBalance.creditor_id, GroupPairBalance.amount)
+        .where(
+            and_(
+                GroupPairBalance.group_id == group_id,
+                or_(
+                    GroupPairBalance.debtor_id == user_id,
+                    GroupPairBalance.creditor_id == user_id
+                )
+            )
+        )
+    )
+
+    balances = defaultdict(int)
+    for debtor_id, creditor_id, amount in result.all():
+        if debtor_id == user_id:
+            balances[creditor_id] -= money.to_cents(amount)  # User owes them
+        else:
+            balances[debtor_id] += money.to_cents(amount)  # They owe user
+    return {other_user_id: money.from_cents(cents) for other_user_id, cents in balances.items()}
+
+
+async def get_net_balances(db: AsyncSession, group_id: uuid.UUID) -> Dict[uuid.UUID, Decimal]:
+    """Net position of every member (positive = owed money)."""
+    result = await db.execute(
+        select(GroupPairBalance.debtor_id, GroupPairBalance.creditor_id, GroupPairBalance.amount)
+        .where(GroupPairBalance.group_id == group_id)
+    )
+
+    balances = defaultdict(int)
+    for debtor_id, creditor_id, amount in result.all():
+        cents = money.to_cents(amount)
+        balances[debtor_id] -= cents
+        balances[creditor_id] += cents
+    return {user_id: money.from_cents(cents) for user_id, cents in balances.items()}
+
+
+async def get_user_net_balances(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    group_ids: Iterable[uuid.UUID]
+) -> Dict[uuid.UUID, Decimal]:
+    """Net position of user in each of the groups, in one query (positive = owed money)."""
+    group_ids = list(group_ids)
+    if not group_ids:
+        return {}
+
+    result = await db.execute(
+        select(GroupPairBalance.group_id, GroupPairBalance.debtor_id, GroupPairBalance.amount)
+        .where(
+            and_(
+                GroupPairBalance.group_id.in_(group_ids),
+                or_(
+                    GroupPairBalance.debtor_id == user_id,
+                    GroupPairBalance.creditor_id == user_id
+                )
+            )
+        )
+    )
+
+    balances = defaultdict(int)
+    for group_id, debtor_id, amount in result.all():
+        cents = money.to_cents(amount)
+        balances[group_id] += -cents if debtor_id == user_id else cents
+    return {group_id: money.from_cents(cents) for group_id, cents in balances.items()}
+
+
+async def get_user_balances_all_groups(
+    db: AsyncSession,
+    user_id: uuid.UUID
+) -> List[Tuple[uuid.UUID, str, uuid.UUID, Decimal]]:
+    """
+    Every non-zero (group, counterparty) balance of a user in one statement.
+
+    Returns (group_id, group_name, other_user_id, balance) rows for groups the
+    user is an active member of, positive balance = the other user owes user.
+    """
+    is_debtor = GroupPairBalance.debtor_id == user_id
+    other_user_id = case((is_debtor, GroupPairBalance.creditor_id), else_=GroupPairBalance.debtor_id)
+    balance = case((is_debtor, -GroupPairBalance.amount), else_=GroupPairBalance.amount)
+
+    result = await db.execute(
+        select(GroupPairBalance.group_id, Group.name, other_user_id, balance)
+        .join(Group, Group.id == GroupPairBalance.group_id)
+        .join(
+            Membership,
+            and_(
+                Membership.group_id == GroupPairBalance.group_id,
+                Membership.user_id == user_id,
+                Membership.is_active == True
+            )
+        )
+        .where(
+            and_(
+                or_(
+                    GroupPairBalance.debtor_id == user_id,
+                    GroupPairBalance.creditor_id == user_id
+                ),
+                GroupPairBalance.amount != 0,
+                Group.is_deleted == False
+            )
+        )
+        .order_by(Group.created_at, GroupPairBalance.group_id)
+    )
+    return result.all()
+
+
+# ==================== REPAIR ====================
+async def compute_group_deltas(db: AsyncSession, group_id: uuid.UUID) -> PairDeltas:
+    """Recompute the ledger for a group from raw expenses, splits and payments."""
+    deltas: PairDeltas = defaultdict(int)
+
+    splits_result = await db.execute(
+        select(Expense.payer_id, ExpenseSplit.user_id, func.sum(ExpenseSplit.amount))
+        .join(ExpenseSplit, ExpenseSplit.expense_id == Expense.id)
+        .where(
+            and_(
+                Expense.group_id == group_id,
+                Expense.is_deleted == False
+            )
+        )
+        .group_by(Expense.payer_id, ExpenseSplit.user_id)
+    )
+    for payer_id, debtor_id, amount in splits_result.all():
+        _add_debt(deltas, debtor_id, payer_id, money.to_cents(amount))
+
+    payments_result = await db.execute(
+        select(Payment.payer_id, Payment.receiver_id, func.sum(Payment.amount))
+        .where(
+            and_(
+                Payment.group_id == group_id,
+                Payment.status == "confirmed"
+            )
+        )
+        .group_by(Payment.payer_id, Payment.receiver_id)
+    )
+    for payer_id, receiver_id, amount in payments_result.all():
+        _add_debt(deltas, receiver_id, payer_id, money.to_cents(amount))
+
+    return deltas
+
+
+async def rebuild_group(db: AsyncSession, group_id: uuid.UUID):
+    """Replace the ledger rows of a group with freshly computed ones."""
+    await db.execute(delete(GroupPairBalance).where(GroupPairBalance.group_id == group_id))
+    await apply_deltas(db, group_id, await compute_group_deltas(db, group_id))
+
+
+async def verify_group(
+    db: AsyncSession,
+    group_id: uuid.UUID
+) -> List[Tuple[Tuple[uuid.UUID, uuid.UUID], Decimal, Decimal]]:
+    """Return (pair, stored, expected) for every pair where the ledger is off."""
+    expected = await compute_group_deltas(db, group_id)
+
+    result = await db.execute(
+        select(GroupPairBalance.debtor_id, GroupPairBalance.creditor_id, GroupPairBalance.amount)
+        .where(GroupPairBalance.group_id == group_id)
+    )
+    stored = {
+        (debtor_id, creditor_id): money.to_cents(amount)
+        for debtor_id, creditor_id, amount in result.all()
+    }
+
+    mismatches = []
+    for pair in sorted(set(stored) | set(expected)):
+        stored_cents = stored.get(pair, 0)
+        expected_cents = expected.get(pair, 0)
+        if stored_cents != expected_cents:
+            mismatches.append((pair, money.from_cents(stored_cents), money.from_cents(expected_cents)))
+    return mismatches
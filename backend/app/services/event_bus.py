@@ -0,0 +1,294 @@
+"""
+Event bus behind the SSE stream.
+
+Every open SSE connection gets its own bounded queue, so a user can have
+several tabs open, and a slow client drops its oldest events instead of
+growing without limit.
+
+Events get a monotonic per-user integer ID and the last SSE_REPLAY_SIZE
+events of each user are kept, so a reconnecting client can send
+Last-Event-ID and receive what it missed.
+
+Backends:
+    memory  Delivers to connections of this process only (single worker).
+    redis   Publishes through Redis/Valkey pub/sub; every worker subscribes to
+            the channels of its own connected users and delivers locally.
+"""
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+import uuid
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUS_BACKENDS = ("memory", "redis")
+
+# Users whose replay history the in-process bus keeps (least recently used are evicted)
+MAX_REPLAY_USERS = 10000
+
+
+def missed_events(history: Iterable[dict], latest_id: int, last_event_id: int) -> Tuple[List[dict], bool]:
+    """
+    Events after last_event_id, and whether they cover everything the client missed.
+
+    Incomplete means the gap is older than the buffer, or the IDs were reset
+    (last_event_id is ahead of the latest ID); the client should refetch.
+    """
+    if last_event_id > latest_id:
+        return [], False
+    missed = sorted(
+        (event for event in history if event["id"] > last_event_id),
+        key=lambda event: event["id"]
+    )
+    if last_event_id == latest_id:
+        return missed, True
+    return missed, bool(missed) and missed[0]["id"] == last_event_id + 1
+
+
+class Subscription:
+    """One SSE connection's bounded queue of events."""
+
+    def __init__(self, user_id: uuid.UUID, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def deliver(self, event: dict):
+        """Queue an event, dropping the oldest one if the queue is full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> dict:
+        """Wait for the next event; raises asyncio.TimeoutError after timeout."""
+        return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+
+
+class _UserHistory:
+    def __init__(self, size: int):
+        self.latest_id = 0
+        self.events: deque = deque(maxlen=size)
+
+
+class InProcessEventBus:
+    def __init__(self, queue_size: Optional[int] = None, replay_size: Optional[int] = None):
+        self.queue_size = queue_size or settings.SSE_QUEUE_SIZE
+        self.replay_size = replay_size or settings.SSE_REPLAY_SIZE
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._history: "OrderedDict[str, _UserHistory]" = OrderedDict()
+
+    def _deliver(self, user_key: str, event: dict):
+        for subscription in list(self._subscriptions.get(user_key, ())):
+            subscription.deliver(event)
+
+    def _user_history(self, user_key: str) -> _UserHistory:
+        history = self._history.get(user_key)
+        if history is None:
+            history = self._history[user_key] = _UserHistory(self.replay_size)
+            if len(self._history) > MAX_REPLAY_USERS:
+                self._history.popitem(last=False)
+        else:
+            self._history.move_to_end(user_key)
+        return history
+
+    async def publish(self, user_id: uuid.UUID, event: dict) -> dict:
+        """Assign the next event ID of the user, record it and deliver it."""
+        user_key = str(user_id)
+        history = self._user_history(user_key)
+        history.latest_id += 1
+        event = {**event, "id": history.latest_id}
+        history.events.append(event)
+        self._deliver(user_key, event)
+        return event
+
+    async def replay(self, user_id: uuid.UUID, last_event_id: int) -> Tuple[List[dict], bool]:
+        """Buffered events after last_event_id; see `missed_events`."""
+        history = self._history.get(str(user_id))
+        if history is None:
+            return [], last_event_id == 0
+        return missed_events(history.events, history.latest_id, last_event_id)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: uuid.UUID) -> AsyncIterator[Subscription]:
+        """Register a connection for the lifetime of the context."""
+        user_key = str(user_id)
+        subscription = Subscription(user_id, self.queue_size)
+        subscriptions = self._subscriptions[user_key]
+        subscriptions.add(subscription)
+        if len(subscriptions) == 1:
+            await self._on_first_subscriber(user_key)
+        try:
+            yield subscription
+        finally:
+            subscriptions.discard(subscription)
+            if not subscriptions and self._subscriptions.get(user_key) is subscriptions:
+                del self._subscriptions[user_key]
+                await self._on_last_subscriber(user_key)
+
+    def connection_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def queued_events(self) -> int:
+        """Events waiting in connection queues (not yet sent to clients)."""
+        return sum(
+            subscription.queue.qsize()
+            for subscriptions in self._subscriptions.values()
+            for subscription in subscriptions
+        )
+
+    async def _on_first_subscriber(self, user_key: str):
+        pass
+
+    async def _on_last_subscriber(self, user_key: str):
+        pass
+
+    async def close(self):
+        pass
+
+
+class RedisEventBus(InProcessEventBus):
+    """
+    Fan-out across workers and replicas with Redis (or Valkey) pub/sub.
+
+    Pass `client` to use an already configured client, e.g. a local
+    stand-in such as fakeredis in development (with its `lua` extra, as
+    publishing runs a script).
+    """
+
+    CHANNEL_PREFIX = "sse:user:"
+    SEQUENCE_PREFIX = "sse:seq:"
+    HISTORY_PREFIX = "sse:history:"
+
+    # KEYS: sequence, history; ARGV: event JSON after the opening brace, replay size, TTL, channel
+    PUBLISH_SCRIPT = """
+    local id = redis.call('INCR', KEYS[1])
+    local payload = '{"id": ' .. id .. ARGV[1]
+    redis.call('RPUSH', KEYS[2], payload)
+    redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    redis.call('PUBLISH', ARGV[4], payload)
+    return id
+    """
+
+    def __init__(
+        self,
+        url: str = "",
+        client=None,
+        queue_size: Optional[int] = None,
+        replay_size: Optional[int] = None
+    ):
+        super().__init__(queue_size, replay_size)
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise RuntimeError("EVENT_BUS_BACKEND=redis requires the 'redis' package")
+            client = redis.from_url(url)
+        self.client = client
+        self._publish = client.register_script(self.PUBLISH_SCRIPT)
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def publish(self, user_id: uuid.UUID, event: dict) -> dict:
+        """Assign the next event ID, buffer and publish the event in one script, so IDs go out in order."""
+        user_key = str(user_id)
+        body = json.dumps(event, default=str)
+        event_id = await self._publish(
+            keys=[self.SEQUENCE_PREFIX + user_key, self.HISTORY_PREFIX + user_key],
+            args=[
+                "}" if body == "{}" else ", " + body[1:],
+                self.replay_size,
+                settings.SSE_REPLAY_TTL,
+                self.CHANNEL_PREFIX + user_key,
+            ]
+        )
+        return {**event, "id": int(event_id)}
+
+    async def replay(self, user_id: uuid.UUID, last_event_id: int) -> Tuple[List[dict], bool]:
+        user_key = str(user_id)
+        latest_id = int(await self.client.get(self.SEQUENCE_PREFIX + user_key) or 0)
+        payloads = await self.client.lrange(self.HISTORY_PREFIX + user_key, 0, -1)
+        return missed_events((json.loads(p) for p in payloads), latest_id, last_event_id)
+
+    async def _on_first_subscriber(self, user_key: str):
+        if self._pubsub is None:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.CHANNEL_PREFIX + user_key)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop())
+
+    async def _on_last_subscriber(self, user_key: str):
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.CHANNEL_PREFIX + user_key)
+
+    async def _read_loop(self):
+        while not self._closed:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event bus read failed; retrying")
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None:
+                if not self._subscriptions:
+                    await asyncio.sleep(1.0)
+                continue
+
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                logger.warning("Dropping malformed event on %s", channel)
+                continue
+            self._deliver(channel[len(self.CHANNEL_PREFIX):], event)
+
+    async def close(self):
+        # The flag also stops the loop if the client swallows the cancellation
+        self._closed = True
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        await self.client.aclose()
+
+
+def create_event_bus() -> InProcessEventBus:
+    if settings.EVENT_BUS_BACKEND == "redis":
+        return RedisEventBus(settings.REDIS_URL)
+    if settings.EVENT_BUS_BACKEND == "memory":
+        return InProcessEventBus()
+    raise ValueError(f"Unknown EVENT_BUS_BACKEND: {settings.EVENT_BUS_BACKEND}")
+
+
+_event_bus: Optional[InProcessEventBus] = None
+
+
+def get_event_bus() -> InProcessEventBus:
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = create_event_bus()
+    return _event_bus
+
+
+async def close_event_bus():
+    global _event_bus
+    if _event_bus is not None:
+        await _event_bus.close()
+        _event_bus = None
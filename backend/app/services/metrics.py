@@ -0,0 +1,140 @@
+"""
+Prometheus metrics served at /metrics.
+
+Request metrics are recorded by MetricsMiddleware. Pool, SSE, password
+hashing and cache figures are sampled from their owners after every request
+and on every scrape.
+
+With more than one worker process, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers (cleared on every deploy): each worker then
+writes its samples there and /metrics aggregates all of them, whichever
+worker serves the scrape. Gauges are summed over live workers.
+"""
+from typing import Dict, Tuple
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+from app.core.security import password_pool
+from app.db.database import TimedQueuePool, engine, replica_engine
+from app.services.authorization import get_group_roles
+from app.services.event_bus import get_event_bus
+from app.services.principal_cache import get_principal_cache
+from app.services.response_cache import get_response_cache
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"],
+    multiprocess_mode="livesum"
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections in use", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connection checkouts", ["pool"]
+)
+DB_POOL_WAIT = Counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for a connection", ["pool"]
+)
+
+SSE_CONNECTIONS = Gauge(
+    "sse_connections", "Open SSE connections", multiprocess_mode="livesum"
+)
+SSE_QUEUED_EVENTS = Gauge(
+    "sse_queued_events", "Events queued for SSE connections", multiprocess_mode="livesum"
+)
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight", "bcrypt calls running", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_WAITING = Gauge(
+    "password_hash_waiting", "bcrypt calls queued for a worker", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "bcrypt calls rejected because the queue was full"
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups", ["cache", "result"]
+)
+
+# Last seen value of each cumulative figure, to turn it into counter increments
+_last_totals: Dict[Tuple, float] = {}
+
+
+def _sync_counter(counter, value: float, *labels: str):
+    key = (counter, labels)
+    delta = value - _last_totals.get(key, 0)
+    if delta > 0:
+        (counter.labels(*labels) if labels else counter).inc(delta)
+    _last_totals[key] = value
+
+
+def sample_runtime_metrics():
+    """Copy the current pool, SSE, password hashing and cache figures into the metrics."""
+    pools = {"primary": engine}
+    if replica_engine is not None:
+        pools["replica"] = replica_engine
+    for name, pool_engine in pools.items():
+        pool = pool_engine.sync_engine.pool
+        if isinstance(pool, TimedQueuePool):
+            DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+            DB_POOL_OVERFLOW.labels(name).set(max(pool.overflow(), 0))
+            _sync_counter(DB_POOL_CHECKOUTS, pool.checkouts, name)
+            _sync_counter(DB_POOL_WAIT, pool.wait_seconds, name)
+
+    event_bus = get_event_bus()
+    SSE_CONNECTIONS.set(event_bus.connection_count())
+    SSE_QUEUED_EVENTS.set(event_bus.queued_events())
+
+    stats = password_pool.stats()
+    PASSWORD_HASH_IN_FLIGHT.set(stats["in_flight"])
+    PASSWORD_HASH_WAITING.set(stats["waiting"])
+    _sync_counter(PASSWORD_HASH_REJECTED, stats["rejected"])
+
+    caches = (
+        ("principal", get_principal_cache()),
+        ("group_role", get_group_roles()),
+        ("response", get_response_cache()),
+    )
+    for name, cache in caches:
+        _sync_counter(CACHE_LOOKUPS, cache.hits, name, "hit")
+        _sync_counter(CACHE_LOOKUPS, cache.misses, name, "miss")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """The exposition text of every worker's metrics and its content type."""
+    sample_runtime_metrics()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def shutdown_metrics():
+    """Drop this worker's live gauges from the shared multiprocess directory."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,83 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A cursor is the sort key of the last row of a page, encoded as URL-safe
+base64 JSON. The next page is every row strictly after that key in the same
+descending order, so Postgres walks the (..., date/created_at DESC) indexes
+from the right spot instead of reading and discarding OFFSET rows.
+
+The page/per_page mode is kept for existing clients; both modes return a
+next_cursor so a client can switch to cursors after the first page.
+"""
+from datetime import date, datetime
+from typing import List, Optional, Sequence, Tuple
+import base64
+import binascii
+import json
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def _encode_value(value) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _decode_value(column, value: str):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence) -> str:
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Cursor does not match the sort key")
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def paginate(query, columns: Sequence, per_page: int, cursor: Optional[str] = None, page: int = 1):
+    """
+    Order query by columns (all descending) and restrict it to one page.
+
+    With a cursor the page starts after the cursor's key, otherwise at
+    OFFSET (page - 1) * per_page. One extra row is fetched to tell whether
+    there is a next page; pass the result to `split_page`.
+    """
+    query = query.order_by(*(column.desc() for column in columns))
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        query = query.where(tuple_(*columns) < tuple(values))
+    else:
+        query = query.offset((page - 1) * per_page)
+    return query.limit(per_page + 1)
+
+
+def split_page(items: Sequence, columns: Sequence, per_page: int) -> Tuple[List, Optional[str]]:
+    """Trim the look-ahead row and return (page items, next cursor or None)."""
+    items = list(items)
+    if len(items) <= per_page:
+        return items, None
+    items = items[:per_page]
+    last = items[-1]
+    return items, encode_cursor([getattr(last, column.key) for column in columns])
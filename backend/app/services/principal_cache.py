@@ -0,0 +1,168 @@
+"""
+Cache of authenticated users for get_current_user.
+
+Caches a snapshot of the user's columns (without the password hash) for
+PRINCIPAL_CACHE_TTL seconds. On a hit the snapshot is attached to the
+request session as a persistent, unmodified User, so endpoints can still
+change and commit `current_user` - without a SELECT on every request.
+
+Endpoints that change a user must call `invalidate()` after committing.
+
+Backends:
+    memory  Per-process LRU + TTL (default).
+    redis   Shared across workers, so an invalidation is seen everywhere at once.
+    none    Always load from the database.
+"""
+from datetime import date, datetime
+from typing import Optional
+import json
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.models import User
+from app.services.cache import TTLCache
+
+# hashed_password stays out of the cache; it is loaded on demand where needed
+CACHED_COLUMNS = [column for column in User.__table__.columns if column.key != "hashed_password"]
+
+
+def snapshot_user(user: User) -> dict:
+    return {column.key: getattr(user, column.key) for column in CACHED_COLUMNS}
+
+
+def attach_user(db: AsyncSession, snapshot: dict) -> User:
+    """Add a cached user to the session as if it had just been loaded."""
+    existing = db.identity_map.get(db.identity_key(User, snapshot["id"]))
+    if existing is not None:
+        return existing
+
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+class MemoryPrincipalStore:
+    def __init__(self):
+        self._cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+    async def get(self, user_id: uuid.UUID) -> Optional[dict]:
+        snapshot = self._cache.get(user_id)
+        return dict(snapshot) if snapshot is not None else None
+
+    async def set(self, user_id: uuid.UUID, snapshot: dict):
+        self._cache.set(user_id, snapshot)
+
+    async def delete(self, user_id: uuid.UUID):
+        self._cache.delete(user_id)
+
+    async def close(self):
+        pass
+
+
+class RedisPrincipalStore:
+    KEY_PREFIX = "principal:"
+
+    def __init__(self, url: str = "", client=None):
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise RuntimeError("PRINCIPAL_CACHE_BACKEND=redis requires the 'redis' package")
+            client = redis.from_url(url)
+        self.client = client
+
+    @staticmethod
+    def _decode(payload: bytes) -> dict:
+        values = json.loads(payload)
+        snapshot = {}
+        for column in CACHED_COLUMNS:
+            value = values.get(column.key)
+            python_type = column.type.python_type
+            if value is not None:
+                if python_type is uuid.UUID:
+                    value = uuid.UUID(value)
+                elif python_type is datetime:
+                    value = datetime.fromisoformat(value)
+                elif python_type is date:
+                    value = date.fromisoformat(value)
+            snapshot[column.key] = value
+        return snapshot
+
+    async def get(self, user_id: uuid.UUID) -> Optional[dict]:
+        payload = await self.client.get(self.KEY_PREFIX + str(user_id))
+        return self._decode(payload) if payload else None
+
+    async def set(self, user_id: uuid.UUID, snapshot: dict):
+        payload = json.dumps(
+            {key: value.isoformat() if isinstance(value, (date, datetime)) else value for key, value in snapshot.items()},
+            default=str
+        )
+        await self.client.set(self.KEY_PREFIX + str(user_id), payload, ex=settings.PRINCIPAL_CACHE_TTL)
+
+    async def delete(self, user_id: uuid.UUID):
+        await self.client.delete(self.KEY_PREFIX + str(user_id))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class PrincipalCache:
+    def __init__(self, store=None):
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    async def get_user(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+        """Return the user, from the cache when possible. Only active users are cached."""
+        if self.store is not None:
+            snapshot = await self.store.get(user_id)
+            if snapshot is not None:
+                self.hits += 1
+                return attach_user(db, snapshot)
+            self.misses += 1
+
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is not None and user.is_active and self.store is not None:
+            await self.store.set(user_id, snapshot_user(user))
+        return user
+
+    async def invalidate(self, user_id: uuid.UUID):
+        if self.store is not None:
+            await self.store.delete(user_id)
+
+    async def close(self):
+        if self.store is not None:
+            await self.store.close()
+
+
+def create_principal_cache() -> PrincipalCache:
+    if settings.PRINCIPAL_CACHE_BACKEND == "redis":
+        return PrincipalCache(RedisPrincipalStore(settings.REDIS_URL))
+    if settings.PRINCIPAL_CACHE_BACKEND == "memory":
+        return PrincipalCache(MemoryPrincipalStore())
+    if settings.PRINCIPAL_CACHE_BACKEND == "none":
+        return PrincipalCache()
+    raise ValueError(f"Unknown PRINCIPAL_CACHE_BACKEND: {settings.PRINCIPAL_CACHE_BACKEND}")
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = create_principal_cache()
+    return _principal_cache
+
+
+async def close_principal_cache():
+    global _principal_cache
+    if _principal_cache is not None:
+        await _principal_cache.close()
+        _principal_cache = None
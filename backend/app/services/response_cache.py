@@ -0,0 +1,173 @@
+"""
+Versioned cache of per-group results (analytics, debt simplification).
+
+Every group has a data_version that write endpoints bump in the same
+transaction as the change (`bump_data_version`). Results are cached under
+(kind, group, version, params), so a write never has to invalidate anything:
+the next read sees a new version and misses. Entries still expire after
+RESPONSE_CACHE_TTL seconds, which bounds staleness from changes outside the
+group (a member renaming themselves).
+
+Concurrent misses for the same key in one worker are coalesced: the first
+request computes, the others wait for its result.
+
+Backends:
+    memory  Per-process LRU (default).
+    redis   Per-process LRU in front of a store shared by all workers.
+    none    Always compute.
+"""
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple, Type, TypeVar
+import asyncio
+import uuid
+
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Group
+from app.services.cache import TTLCache
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+async def get_data_version(db: AsyncSession, group_id: uuid.UUID) -> int:
+    """The group's current data version (0 if the group does not exist)."""
+    result = await db.execute(select(Group.data_version).where(Group.id == group_id))
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_data_version(db: AsyncSession, group_id: uuid.UUID):
+    """Increment the group's data version (no flush, no commit)."""
+    await db.execute(
+        update(Group)
+        .where(Group.id == group_id)
+        # updated_at is kept as is: the group itself did not change
+        .values(data_version=Group.data_version + 1, updated_at=Group.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class RedisResponseStore:
+    KEY_PREFIX = "response:"
+
+    def __init__(self, url: str = "", client=None):
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+            client = redis.from_url(url)
+        self.client = client
+
+    @classmethod
+    def _key(cls, key: Tuple) -> str:
+        return cls.KEY_PREFIX + ":".join(str(part) for part in key)
+
+    async def get(self, key: Tuple) -> Optional[bytes]:
+        return await self.client.get(self._key(key))
+
+    async def set(self, key: Tuple, payload: bytes):
+        await self.client.set(self._key(key), payload, ex=settings.RESPONSE_CACHE_TTL)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class ResponseCache:
+    def __init__(self, local: Optional[TTLCache] = None, shared=None):
+        self.local = local
+        self.shared = shared
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _lookup(self, key: Tuple, model: Type[ResponseModel]) -> Optional[ResponseModel]:
+        value = self.local.get(key) if self.local is not None else None
+        if value is None and self.shared is not None:
+            payload = await self.shared.get(key)
+            if payload is not None:
+                value = model.model_validate_json(payload)
+                self.local.set(key, value)
+        return value
+
+    async def _store(self, key: Tuple, value: BaseModel):
+        if self.local is not None:
+            self.local.set(key, value)
+        if self.shared is not None:
+            await self.shared.set(key, value.model_dump_json())
+
+    async def get_or_compute(
+        self,
+        key: Tuple,
+        model: Type[ResponseModel],
+        compute: Callable[[], Awaitable[ResponseModel]]
+    ) -> ResponseModel:
+        """The cached value of `key`, computing it once if missing. Cached values must not be mutated."""
+        if self.local is None:
+            return await compute()
+
+        value = await self._lookup(key, model)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        while key in self._inflight:
+            future = self._inflight[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The computing request went away before finishing; take over
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+            await self._store(key, value)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved, even when nobody was waiting
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            del self._inflight[key]
+        return value
+
+    async def close(self):
+        if self.shared is not None:
+            await self.shared.close()
+
+
+def create_response_cache() -> ResponseCache:
+    if settings.RESPONSE_CACHE_BACKEND == "none":
+        return ResponseCache()
+    local = TTLCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return ResponseCache(local, RedisResponseStore(settings.REDIS_URL))
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return ResponseCache(local)
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {settings.RESPONSE_CACHE_BACKEND}")
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = create_response_cache()
+    return _response_cache
+
+
+async def close_response_cache():
+    global _response_cache
+    if _response_cache is not None:
+        await _response_cache.close()
+        _response_cache = None
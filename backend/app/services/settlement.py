@@ -0,0 +1,230 @@
+"""
+Settlement engine: turn net balances into a list of transfers.
+
+Modes:
+    greedy     Match the largest creditor with the largest debtor (heap based).
+    exact      Minimum number of transfers. Splits members into the largest
+               number of zero-sum subgroups, since a subgroup of k members can
+               always be settled with k - 1 transfers. Exponential, so only used
+               for up to EXACT_MAX_PARTIES members with a non-zero balance.
+    heuristic  Bounded-time search for cancelling pairs and triples, then greedy.
+               Used for big groups and as the fallback of exact mode.
+"""
+from decimal import Decimal
+from typing import Dict, List, Tuple
+import heapq
+import time
+import uuid
+
+from app.core import money
+
+SETTLEMENT_MODES = ("greedy", "exact", "heuristic")
+
+EXACT_MAX_PARTIES = 20
+EXACT_MAX_ZERO_SUBSETS = 1024
+HEURISTIC_TIME_BUDGET = 0.05  # seconds
+
+# Balances of a cent or less are treated as settled
+MIN_CENTS = 1
+
+Party = Tuple[uuid.UUID, int]  # (user_id, amount in cents)
+
+
+def _split_parties(balances: Dict[uuid.UUID, Decimal]) -> Tuple[List[Party], List[Party]]:
+    """Split balances into creditors and debtors, both with positive cents."""
+    creditors = []
+    debtors = []
+    for user_id, balance in balances.items():
+        cents = money.to_cents(balance)
+        if cents > MIN_CENTS:
+            creditors.append((user_id, cents))
+        elif cents < -MIN_CENTS:
+            debtors.append((user_id, -cents))
+    return creditors, debtors
+
+
+def _greedy(creditors: List[Party], debtors: List[Party]) -> List[Tuple[uuid.UUID, uuid.UUID, int]]:
+    """Repeatedly settle the largest debt against the largest credit."""
+    creditor_heap = [(-cents, user_id) for user_id, cents in creditors]
+    debtor_heap = [(-cents, user_id) for user_id, cents in debtors]
+    heapq.heapify(creditor_heap)
+    heapq.heapify(debtor_heap)
+
+    transfers = []
+    while creditor_heap and debtor_heap:
+        credit, creditor_id = heapq.heappop(creditor_heap)
+        debt, debtor_id = heapq.heappop(debtor_heap)
+        credit, debt = -credit, -debt
+
+        amount = min(credit, debt)
+        if amount > MIN_CENTS:
+            transfers.append((debtor_id, creditor_id, amount))
+
+        if credit - amount >= MIN_CENTS:
+            heapq.heappush(creditor_heap, (amount - credit, creditor_id))
+        if debt - amount >= MIN_CENTS:
+            heapq.heappush(debtor_heap, (amount - debt, debtor_id))
+
+    return transfers
+
+
+def _cancel_pairs(creditors: List[Party], debtors: List[Party]):
+    """Settle every creditor whose amount exactly matches a debtor's, one transfer each."""
+    by_amount: Dict[int, List[uuid.UUID]] = {}
+    for user_id, cents in debtors:
+        by_amount.setdefault(cents, []).append(user_id)
+
+    transfers = []
+    remaining_creditors = []
+    for user_id, cents in creditors:
+        matches = by_amount.get(cents)
+        if matches:
+            transfers.append((matches.pop(), user_id, cents))
+        else:
+            remaining_creditors.append((user_id, cents))
+
+    remaining_debtors = [
+        (user_id, cents) for cents, user_ids in by_amount.items() for user_id in user_ids
+    ]
+    return transfers, remaining_creditors, remaining_debtors
+
+
+def _cancel_triples(larger: List[Party], smaller: List[Party], deadline: float):
+    """
+    Find members of `larger` whose amount is the sum of two members of `smaller`.
+
+    Returns (matches, larger_left, smaller_left) where matches are
+    (big_party, small_party_1, small_party_2).
+    """
+    by_amount: Dict[int, List[uuid.UUID]] = {}
+    for user_id, cents in smaller:
+        by_amount.setdefault(cents, []).append(user_id)
+
+    matches = []
+    larger_left = []
+    for big_id, big_cents in larger:
+        found = None
+        if time.monotonic() < deadline:
+            for first_cents, first_ids in by_amount.items():
+                if not first_ids:
+                    continue
+                second_ids = by_amount.get(big_cents - first_cents)
+                if not second_ids or (second_ids is first_ids and len(first_ids) < 2):
+                    continue
+                found = (first_cents, big_cents - first_cents)
+                break
+        if found:
+            first_id = by_amount[found[0]].pop()
+            second_id = by_amount[found[1]].pop()
+            matches.append(((big_id, big_cents), (first_id, found[0]), (second_id, found[1])))
+        else:
+            larger_left.append((big_id, big_cents))
+
+    smaller_left = [
+        (user_id, cents) for cents, user_ids in by_amount.items() for user_id in user_ids
+    ]
+    return matches, larger_left, smaller_left
+
+
+def _heuristic(creditors: List[Party], debtors: List[Party], time_budget: float = HEURISTIC_TIME_BUDGET):
+    deadline = time.monotonic() + time_budget
+
+    transfers, creditors, debtors = _cancel_pairs(creditors, debtors)
+
+    # One creditor paid by two debtors
+    matches, creditors, debtors = _cancel_triples(creditors, debtors, deadline)
+    for (creditor_id, _), (debtor_1, cents_1), (debtor_2, cents_2) in matches:
+        transfers.append((debtor_1, creditor_id, cents_1))
+        transfers.append((debtor_2, creditor_id, cents_2))
+
+    # One debtor paying two creditors
+    matches, debtors, creditors = _cancel_triples(debtors, creditors, deadline)
+    for (debtor_id, _), (creditor_1, cents_1), (creditor_2, cents_2) in matches:
+        transfers.append((debtor_id, creditor_1, cents_1))
+        transfers.append((debtor_id, creditor_2, cents_2))
+
+    return transfers + _greedy(creditors, debtors)
+
+
+def _exact(creditors: List[Party], debtors: List[Party]):
+    transfers, creditors, debtors = _cancel_pairs(creditors, debtors)
+
+    parties = [(user_id, cents) for user_id, cents in creditors] + \
+              [(user_id, -cents) for user_id, cents in debtors]
+    n = len(parties)
+    if n > EXACT_MAX_PARTIES:
+        return None
+
+    # Subset sums indexed by bitmask
+    sums = [0]
+    for _, cents in parties:
+        sums += [s + cents for s in sums]
+
+    full = (1 << n) - 1
+    zero_masks = [mask for mask in range(1, full) if sums[mask] == 0]
+    if len(zero_masks) > EXACT_MAX_ZERO_SUBSETS:
+        return None
+
+    # A partition into zero-sum groups is a chain of nested zero-sum subsets,
+    # so the most groups (fewest transfers) is the longest such chain.
+    zero_masks.sort(key=lambda mask: bin(mask).count("1"))
+    chain_length: Dict[int, int] = {}
+    previous: Dict[int, int] = {}
+    for mask in zero_masks:
+        best, best_sub = 1, 0
+        for sub, length in chain_length.items():
+            if sub & mask == sub and length + 1 > best:
+                best, best_sub = length + 1, sub
+        chain_length[mask] = best
+        previous[mask] = best_sub
+
+    groups = []
+    outer = full
+    mask = max(chain_length, key=chain_length.get) if chain_length else 0
+    while mask:
+        groups.append(outer & ~mask)
+        outer = mask
+        mask = previous[mask]
+    groups.append(outer)
+
+    for group in groups:
+        group_creditors = []
+        group_debtors = []
+        for i, (user_id, cents) in enumerate(parties):
+            if group >> i & 1:
+                if cents > 0:
+                    group_creditors.append((user_id, cents))
+                else:
+                    group_debtors.append((user_id, -cents))
+        transfers.extend(_greedy(group_creditors, group_debtors))
+
+    return transfers
+
+
+def simplify_debts(balances: Dict[uuid.UUID, Decimal], mode: str = "greedy") -> List[Dict]:
+    """
+    Simplify debts into a list of {from_user_id, to_user_id, amount} transactions.
+
+    `balances` maps user ID to net balance (positive = owed money).
+    """
+    if mode not in SETTLEMENT_MODES:
+        raise ValueError(f"Unknown settlement mode: {mode}")
+
+    creditors, debtors = _split_parties(balances)
+
+    transfers = None
+    if mode == "exact":
+        transfers = _exact(creditors, debtors)
+    if mode == "greedy":
+        transfers = _greedy(creditors, debtors)
+    if transfers is None:
+        transfers = _heuristic(creditors, debtors)
+
+    return [
+        {
+            "from_user_id": from_user_id,
+            "to_user_id": to_user_id,
+            "amount": money.from_cents(cents)
+        }
+        for from_user_id, to_user_id, cents in transfers
+    ]
@@ -0,0 +1,175 @@
+"""
+Materialized daily spending rollup (spending_daily_rollup).
+
+Expense writes apply their delta here inside the request transaction, so
+analytics reads O(days x categories x members) pre-aggregated rows instead of
+scanning every expense and split of the period.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+import uuid
+
+from sqlalchemy import select, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import money
+from app.models import Expense, ExpenseSplit, SpendingDailyRollup
+
+# (date, category, user_id) -> [paid cents, share cents, expenses paid]
+RollupDeltas = Dict[Tuple[date, str, uuid.UUID], List[int]]
+
+# Rows per upsert statement, well under asyncpg's 32767 bind parameters
+UPSERT_BATCH_SIZE = 1000
+
+
+def category_key(category: Optional[str]) -> str:
+    """The rollup category of an expense; same as coalesce(nullif(trim(category), ''), 'Other')."""
+    return (category or "").strip(" ") or "Other"
+
+
+def category_expr(column):
+    """SQL for category_key() over an expense category column."""
+    return func.coalesce(func.nullif(func.trim(column), ''), 'Other')
+
+
+def _empty() -> List[int]:
+    return [0, 0, 0]
+
+
+def expense_deltas(
+    expense_date: date,
+    category: Optional[str],
+    payer_id: uuid.UUID,
+    amount: Decimal,
+    splits: Iterable[Tuple[uuid.UUID, Decimal]],
+    sign: int = 1
+) -> RollupDeltas:
+    """Deltas for an expense: the payer paid the amount, every participant owes their split."""
+    deltas: RollupDeltas = defaultdict(_empty)
+    key = category_key(category)
+    payer_row = deltas[(expense_date, key, payer_id)]
+    payer_row[0] += sign * money.to_cents(amount)
+    payer_row[2] += sign
+    for user_id, split_amount in splits:
+        deltas[(expense_date, key, user_id)][1] += sign * money.to_cents(split_amount)
+    return deltas
+
+
+def merge_deltas(*all_deltas: RollupDeltas) -> RollupDeltas:
+    merged: RollupDeltas = defaultdict(_empty)
+    for deltas in all_deltas:
+        for key, values in deltas.items():
+            row = merged[key]
+            for i, value in enumerate(values):
+                row[i] += value
+    return merged
+
+
+async def apply_deltas(db: AsyncSession, group_id: uuid.UUID, deltas: RollupDeltas):
+    """Add deltas to the rollup with batched upserts (no flush, no commit)."""
+    rows = [
+        {
+            "group_id": group_id,
+            "date": expense_date,
+            "category": category,
+            "user_id": user_id,
+            "paid": money.from_cents(paid),
+            "share": money.from_cents(share),
+            "expense_count": count,
+        }
+        # Sorted so concurrent writers lock rows in the same order
+        for (expense_date, category, user_id), (paid, share, count) in sorted(deltas.items())
+        if paid or share or count
+    ]
+
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert(SpendingDailyRollup).values(rows[start:start + UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SpendingDailyRollup.group_id,
+                SpendingDailyRollup.date,
+                SpendingDailyRollup.category,
+                SpendingDailyRollup.user_id,
+            ],
+            set_={
+                "paid": SpendingDailyRollup.paid + stmt.excluded.paid,
+                "share": SpendingDailyRollup.share + stmt.excluded.share,
+                "expense_count": SpendingDailyRollup.expense_count + stmt.excluded.expense_count,
+                "updated_at": func.now(),
+            }
+        )
+        await db.execute(stmt)
+
+
+# ==================== REPAIR ====================
+async def compute_group_deltas(db: AsyncSession, group_id: uuid.UUID) -> RollupDeltas:
+    """Recompute the rollup for a group from raw expenses and splits."""
+    deltas: RollupDeltas = defaultdict(_empty)
+    category = category_expr(Expense.category)
+    live = and_(Expense.group_id == group_id, Expense.is_deleted == False)
+
+    paid_result = await db.execute(
+        select(Expense.date, category, Expense.payer_id, func.sum(Expense.amount), func.count(Expense.id))
+        .where(live)
+        .group_by(Expense.date, category, Expense.payer_id)
+    )
+    for expense_date, key, payer_id, amount, count in paid_result.all():
+        row = deltas[(expense_date, key, payer_id)]
+        row[0] += money.to_cents(amount)
+        row[2] += count
+
+    share_result = await db.execute(
+        select(Expense.date, category, ExpenseSplit.user_id, func.sum(ExpenseSplit.amount))
+        .join(ExpenseSplit, ExpenseSplit.expense_id == Expense.id)
+        .where(live)
+        .group_by(Expense.date, category, ExpenseSplit.user_id)
+    )
+    for expense_date, key, user_id, amount in share_result.all():
+        deltas[(expense_date, key, user_id)][1] += money.to_cents(amount)
+
+    return deltas
+
+
+async def rebuild_group(db: AsyncSession, group_id: uuid.UUID):
+    """Replace the rollup rows of a group with freshly computed ones."""
+    await db.execute(delete(SpendingDailyRollup).where(SpendingDailyRollup.group_id == group_id))
+    await apply_deltas(db, group_id, await compute_group_deltas(db, group_id))
+
+
+async def verify_group(
+    db: AsyncSession,
+    group_id: uuid.UUID
+) -> List[Tuple[Tuple[date, str, uuid.UUID], Tuple, Tuple]]:
+    """Return (key, stored, expected) as (paid, share, count) for every row where the rollup is off."""
+    expected = {key: tuple(values) for key, values in (await compute_group_deltas(db, group_id)).items()}
+
+    result = await db.execute(
+        select(
+            SpendingDailyRollup.date,
+            SpendingDailyRollup.category,
+            SpendingDailyRollup.user_id,
+            SpendingDailyRollup.paid,
+            SpendingDailyRollup.share,
+            SpendingDailyRollup.expense_count
+        )
+        .where(SpendingDailyRollup.group_id == group_id)
+    )
+    stored = {
+        (expense_date, category, user_id): (money.to_cents(paid), money.to_cents(share), count)
+        for expense_date, category, user_id, paid, share, count in result.all()
+    }
+
+    mismatches = []
+    for key in sorted(set(stored) | set(expected)):
+        stored_row = stored.get(key, (0, 0, 0))
+        expected_row = expected.get(key, (0, 0, 0))
+        if stored_row != expected_row:
+            mismatches.append((
+                key,
+                (money.from_cents(stored_row[0]), money.from_cents(stored_row[1]), stored_row[2]),
+                (money.from_cents(expected_row[0]), money.from_cents(expected_row[1]), expected_row[2])
+            ))
+    return mismatches
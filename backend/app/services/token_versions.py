@@ -0,0 +1,157 @@
+"""
+Token revocation by version.
+
+Every user has a token_version; access and refresh tokens carry it in the
+`ver` claim and are only accepted while it matches. Bumping the version
+(password change, logout-all, deactivation) revokes every outstanding token
+of the user at once.
+
+The current versions live in a small map in front of the users table:
+    memory  Per-process, entries re-read from the database after
+            TOKEN_VERSION_TTL seconds, so other workers see a bump within
+            that window.
+    redis   Shared by all workers; a bump is visible everywhere immediately.
+
+Versions only go up: the map never replaces a version with a lower one, and
+misses are filled from the primary, so a fill that raced a bump (or read a
+lagging replica) cannot bring a revoked version back.
+"""
+from typing import Optional
+import uuid
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, replica_engine
+from app.models import User
+from app.services.cache import TTLCache
+
+
+class MemoryVersionStore:
+    def __init__(self):
+        self._cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.TOKEN_VERSION_TTL)
+
+    async def get(self, user_id: uuid.UUID) -> Optional[int]:
+        return self._cache.get(user_id)
+
+    async def raise_to(self, user_id: uuid.UUID, version: int):
+        """Store the version unless a higher one is already stored."""
+        current = self._cache.get(user_id)
+        if current is None or version > current:
+            self._cache.set(user_id, version)
+
+    async def close(self):
+        pass
+
+
+class RedisVersionStore:
+    KEY_PREFIX = "token_version:"
+    # Expiry only bounds memory; the database stays the source of truth
+    EXPIRY = 60 * 60 * 24
+    # SET unless the stored version is already higher, in one round trip
+    RAISE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and tonumber(current) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+    def __init__(self, url: str = "", client=None):
+        if client is None:
+            try:
+                from redis import asyncio as redis
+            except ImportError:
+                raise RuntimeError("TOKEN_VERSION_BACKEND=redis requires the 'redis' package")
+            client = redis.from_url(url)
+        self.client = client
+        self._raise = client.register_script(self.RAISE_SCRIPT)
+
+    async def get(self, user_id: uuid.UUID) -> Optional[int]:
+        value = await self.client.get(self.KEY_PREFIX + str(user_id))
+        return int(value) if value is not None else None
+
+    async def raise_to(self, user_id: uuid.UUID, version: int):
+        """Store the version unless a higher one is already stored."""
+        await self._raise(keys=[self.KEY_PREFIX + str(user_id)], args=[version, self.EXPIRY])
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class TokenVersions:
+    def __init__(self, store):
+        self.store = store
+
+    async def current(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[int]:
+        """The user's token version, or None if the user does not exist."""
+        version = await self.store.get(user_id)
+        if version is None:
+            version = await self._load(db, user_id)
+            if version is not None:
+                await self.store.raise_to(user_id, version)
+        return version
+
+    async def _load(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[int]:
+        stmt = select(User.token_version).where(User.id == user_id)
+        if replica_engine is None:
+            return (await db.execute(stmt)).scalar_one_or_none()
+        # `db` may be a replica session that has not seen the latest bump yet
+        async with AsyncSessionLocal() as primary:
+            return (await primary.execute(stmt)).scalar_one_or_none()
+
+    async def is_current(self, db: AsyncSession, payload: dict) -> bool:
+        """Check the `ver` claim of a decoded token (tokens without one count as version 0)."""
+        try:
+            user_id = uuid.UUID(payload["sub"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return await self.current(db, user_id) == payload.get("ver", 0)
+
+    async def bump(self, db: AsyncSession, user: User) -> int:
+        """Increment the user's version in the database; `publish` it once committed."""
+        result = await db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(token_version=User.token_version + 1)
+            .returning(User.token_version)
+            .execution_options(synchronize_session=False)
+        )
+        version = result.scalar_one()
+        # The loaded user may be a cached snapshot; keep it in step without dirtying it
+        set_committed_value(user, "token_version", version)
+        return version
+
+    async def publish(self, user_id: uuid.UUID, version: int):
+        await self.store.raise_to(user_id, version)
+
+    async def close(self):
+        await self.store.close()
+
+
+def create_token_versions() -> TokenVersions:
+    if settings.TOKEN_VERSION_BACKEND == "redis":
+        return TokenVersions(RedisVersionStore(settings.REDIS_URL))
+    if settings.TOKEN_VERSION_BACKEND == "memory":
+        return TokenVersions(MemoryVersionStore())
+    raise ValueError(f"Unknown TOKEN_VERSION_BACKEND: {settings.TOKEN_VERSION_BACKEND}")
+
+
+_token_versions: Optional[TokenVersions] = None
+
+
+def get_token_versions() -> TokenVersions:
+    global _token_versions
+    if _token_versions is None:
+        _token_versions = create_token_versions()
+    return _token_versions
+
+
+async def close_token_versions():
+    global _token_versions
+    if _token_versions is not None:
+        await _token_versions.close()
+        _token_versions = None
@@ -0,0 +1,62 @@
+"""
+Request-scoped batch loader for users.
+
+Endpoints that need names/avatars for a set of user IDs queue them with
+`add()` and resolve everything with one `IN` query instead of one
+`select(User)` per ID.
+"""
+from typing import Dict, Iterable, Optional
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User
+
+
+class UserLoader:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._users: Dict[uuid.UUID, Optional[User]] = {}
+        self._pending: set = set()
+
+    def prime(self, user: User):
+        """Seed the loader with a user that is already in memory."""
+        self._users[user.id] = user
+        self._pending.discard(user.id)
+
+    def add(self, *user_ids: uuid.UUID):
+        """Queue user IDs for the next load."""
+        for user_id in user_ids:
+            if user_id not in self._users:
+                self._pending.add(user_id)
+
+    async def load(self):
+        """Resolve every queued ID with a single query."""
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = set()
+
+        result = await self.db.execute(select(User).where(User.id.in_(pending)))
+        for user in result.scalars().all():
+            self._users[user.id] = user
+        for user_id in pending:
+            self._users.setdefault(user_id, None)
+
+    async def get(self, user_id: uuid.UUID) -> Optional[User]:
+        self.add(user_id)
+        await self.load()
+        return self._users.get(user_id)
+
+    async def get_many(self, user_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, User]:
+        """Return the found users among user_ids, keyed by ID."""
+        user_ids = list(user_ids)
+        self.add(*user_ids)
+        await self.load()
+        return {
+            user_id: self._users[user_id]
+            for user_id in user_ids
+            if self._users.get(user_id) is not None
+        }
@@ -14,7 +14,9 @@ CREATE INDEX IF NOT EXISTS idx_memberships_user ON memberships(user_id) WHERE is
 CREATE INDEX IF NOT EXISTS idx_memberships_group ON memberships(group_id) WHERE is_active = TRUE;
 
 -- Expenses
-CREATE INDEX IF NOT EXISTS idx_expenses_group_date ON expenses(group_id, date DESC) WHERE is_deleted = FALSE;
+-- Full sort key so keyset pagination can seek with (date, created_at, id) < (...)
+DROP INDEX IF EXISTS idx_expenses_group_date;
+CREATE INDEX IF NOT EXISTS idx_expenses_group_keyset ON expenses(group_id, date DESC, created_at DESC, id DESC) WHERE is_deleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_expenses_payer ON expenses(group_id, payer_id) WHERE is_deleted = FALSE;
 
 -- Expense Splits
@@ -24,13 +26,17 @@ CREATE INDEX IF NOT EXISTS idx_splits_expense ON expense_splits(expense_id);
 -- Payments
 CREATE INDEX IF NOT EXISTS idx_payments_group_date ON payments(group_id, date DESC);
 CREATE INDEX IF NOT EXISTS idx_payments_pending ON payments(receiver_id, status) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_payments_payer_created ON payments(payer_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_payments_receiver_created ON payments(receiver_id, created_at DESC, id DESC);
 
 -- Notifications
-CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, created_at DESC);
+DROP INDEX IF EXISTS idx_notifications_user;
+CREATE INDEX IF NOT EXISTS idx_notifications_user_keyset ON notifications(user_id, created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_notifications_unread ON notifications(user_id, is_read) WHERE is_read = FALSE;
 
 -- Activity Log
-CREATE INDEX IF NOT EXISTS idx_activity_group ON activity_log(group_id, created_at DESC);
+DROP INDEX IF EXISTS idx_activity_group;
+CREATE INDEX IF NOT EXISTS idx_activity_group_keyset ON activity_log(group_id, created_at DESC, id DESC);
 
 -- Comments
 CREATE INDEX IF NOT EXISTS idx_comments_expense ON comments(expense_id, created_at) WHERE is_deleted = FALSE;
@@ -46,3 +52,7 @@ CREATE INDEX IF NOT EXISTS idx_friendships_accepted ON friendships(status) WHERE
 
 -- Groups - friend groups
 CREATE INDEX IF NOT EXISTS idx_groups_friend ON groups(is_friend_group) WHERE is_friend_group = TRUE;
+
+-- Group pair balances (primary key covers group_id + debtor_id lookups)
+CREATE INDEX IF NOT EXISTS idx_pair_balances_debtor ON group_pair_balances(debtor_id, group_id);
+CREATE INDEX IF NOT EXISTS idx_pair_balances_creditor ON group_pair_balances(creditor_id, group_id);
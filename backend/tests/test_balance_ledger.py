@@ -0,0 +1,41 @@
+from decimal import Decimal
+import uuid
+
+import pytest
+
+from app.models import Group, GroupPairBalance, User
+from app.services import balance_ledger
+
+pytestmark = pytest.mark.anyio
+
+
+def debt(group, debtor, creditor, amount: str) -> GroupPairBalance:
+    """Ledger row for debtor owing creditor, in the canonical (lower ID first) order."""
+    if debtor.id < creditor.id:
+        return GroupPairBalance(group_id=group.id, debtor_id=debtor.id, creditor_id=creditor.id, amount=Decimal(amount))
+    return GroupPairBalance(group_id=group.id, debtor_id=creditor.id, creditor_id=debtor.id, amount=-Decimal(amount))
+
+
+async def test_get_user_net_balances(db):
+    me, friend, other = (
+        User(id=uuid.uuid4(), email=f"user{i}@example.com", name=f"User {i}", hashed_password="x")
+        for i in range(3)
+    )
+    owed, owing, untouched = (
+        Group(id=uuid.uuid4(), name=f"Group {i}", category="friends", created_by_id=me.id)
+        for i in range(3)
+    )
+    db.add_all([me, friend, other, owed, owing, untouched])
+    db.add_all([
+        # The friend owes me 12.34 in one group, I owe 0.10 and get 5.00 in another
+        debt(owed, friend, me, "12.34"),
+        debt(owing, me, friend, "0.10"),
+        debt(owing, other, me, "5.00"),
+        # Not involving me
+        debt(untouched, friend, other, "1.00"),
+    ])
+    await db.commit()
+
+    balances = await balance_ledger.get_user_net_balances(db, me.id, [owed.id, owing.id, untouched.id])
+    assert balances == {owed.id: Decimal("12.34"), owing.id: Decimal("4.90")}
+    assert await balance_ledger.get_user_net_balances(db, me.id, []) == {}
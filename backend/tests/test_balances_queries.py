@@ -0,0 +1,91 @@
+"""Query budgets of the balances endpoints; user lookups must not grow with members."""
+from decimal import Decimal
+import uuid
+
+import pytest
+
+from app.api.endpoints import balances
+from app.db.query_stats import assert_max_queries
+from app.models import Group, GroupPairBalance, Membership, User
+from app.services.user_loader import UserLoader
+
+pytestmark = pytest.mark.anyio
+
+GROUPS = 3
+MEMBERS = 6
+
+
+async def seed(db):
+    """GROUPS groups of MEMBERS users, with a balance between every pair of members."""
+    users = [
+        User(id=uuid.uuid4(), email=f"user{i}@example.com", name=f"User {i}", hashed_password="x")
+        for i in range(MEMBERS)
+    ]
+    db.add_all(users)
+    groups = []
+    for g in range(GROUPS):
+        group = Group(id=uuid.uuid4(), name=f"Group {g}", category="trip", created_by_id=users[0].id)
+        groups.append(group)
+        db.add(group)
+        db.add_all(Membership(user_id=user.id, group_id=group.id, role="member") for user in users)
+        db.add_all(
+            GroupPairBalance(
+                group_id=group.id,
+                debtor_id=min(a.id, b.id),
+                creditor_id=max(a.id, b.id),
+                amount=Decimal("10.00") * (i + 1)
+            )
+            for i, a in enumerate(users)
+            for b in users[i + 1:]
+        )
+    await db.commit()
+    return users, groups
+
+
+async def test_get_my_balances(db):
+    users, _ = await seed(db)
+    # One ledger read across all groups and one user lookup
+    with assert_max_queries(2):
+        response = await balances.get_my_balances(current_user=users[0], db=db, user_loader=UserLoader(db))
+    assert len(response.group_balances) == GROUPS
+    assert all(len(group.balances) == MEMBERS - 1 for group in response.group_balances)
+
+
+async def test_get_group_balance(db):
+    users, groups = await seed(db)
+    with assert_max_queries(4):
+        response = await balances.get_group_balance(
+            group_id=groups[0].id, current_user=users[0], db=db, user_loader=UserLoader(db)
+        )
+    assert len(response.balances) == MEMBERS - 1
+
+
+async def test_get_settlement_suggestions(db):
+    users, groups = await seed(db)
+    with assert_max_queries(6):
+        response = await balances.get_settlement_suggestions(
+            group_id=groups[0].id, mode="greedy", current_user=users[0], db=db, user_loader=UserLoader(db)
+        )
+    assert response.original_transactions == MEMBERS - 1
+
+    # The simplification is cached for the whole group, so another member skips it
+    with assert_max_queries(4):
+        await balances.get_settlement_suggestions(
+            group_id=groups[0].id, mode="greedy", current_user=users[1], db=db, user_loader=UserLoader(db)
+        )
+
+
+async def test_simplify_group_debts(db):
+    users, groups = await seed(db)
+    with assert_max_queries(4):
+        result = await balances.simplify_group_debts(
+            group_id=groups[0].id, mode="greedy", current_user=users[0], db=db, user_loader=UserLoader(db)
+        )
+    assert result.simplified_debts
+
+    # Only the data version is read while the group is unchanged
+    with assert_max_queries(1):
+        cached = await balances.simplify_group_debts(
+            group_id=groups[0].id, mode="greedy", current_user=users[0], db=db, user_loader=UserLoader(db)
+        )
+    assert cached == result
@@ -0,0 +1,49 @@
+from datetime import date
+from decimal import Decimal
+import uuid
+
+import pytest
+
+from app.api.endpoints.analytics import friend_spending_cte, friend_totals
+from app.models import Group, Membership, SpendingDailyRollup, User
+
+pytestmark = pytest.mark.anyio
+
+DAY = date(2026, 3, 15)
+
+
+def user(i: int) -> User:
+    return User(id=uuid.uuid4(), email=f"user{i}@example.com", name=f"User {i}", hashed_password="x")
+
+
+def spending(group: Group, payer: User, paid: str, count: int) -> SpendingDailyRollup:
+    return SpendingDailyRollup(
+        group_id=group.id, date=DAY, category="Food", user_id=payer.id,
+        paid=Decimal(paid), share=Decimal(0), expense_count=count
+    )
+
+
+async def test_friend_breakdown_credits_two_member_groups_only(db):
+    me, pal, second, third = (user(i) for i in range(4))
+    pair = Group(id=uuid.uuid4(), name="Pal", category="friends", is_friend_group=True, created_by_id=me.id)
+    trio = Group(id=uuid.uuid4(), name="Trio", category="friends", created_by_id=me.id)
+    db.add_all([me, pal, second, third, pair, trio])
+    db.add_all([
+        Membership(user_id=me.id, group_id=pair.id, role="admin"),
+        Membership(user_id=pal.id, group_id=pair.id, role="member"),
+        Membership(user_id=me.id, group_id=trio.id, role="admin"),
+        Membership(user_id=second.id, group_id=trio.id, role="member"),
+        Membership(user_id=third.id, group_id=trio.id, role="member"),
+    ])
+    db.add_all([
+        spending(pair, me, "30.00", 2),
+        spending(pair, pal, "12.50", 1),
+        spending(trio, second, "90.00", 3),
+    ])
+    await db.commit()
+
+    friend_spending = friend_spending_cte(me.id, DAY, DAY)
+    rows = (await db.execute(friend_totals(friend_spending, me.id))).all()
+
+    # The trio's 90.00 is not credited to (or duplicated across) its two other members
+    assert [(row.friend_id, Decimal(row.total), row.expense_count) for row in rows] == [(pal.id, Decimal("42.50"), 3)]
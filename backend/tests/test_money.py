@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+import pytest
+
+from app.core import money
+
+
+def test_allocate_sums_to_total():
+    cents = money.allocate(1000, [("a", 1), ("b", 1), ("c", 1)])
+    assert cents == {"a": 334, "b": 333, "c": 333}
+
+
+def test_allocate_largest_remainder():
+    # 100 * 0.5 = 50, 100 * 0.3333 = 33.33, 100 * 0.1667 = 16.67: the leftover cent goes to c
+    cents = money.allocate(100, [("a", Decimal("50")), ("b", Decimal("33.33")), ("c", Decimal("16.67"))])
+    assert cents == {"a": 50, "b": 33, "c": 17}
+
+
+def test_allocate_ties_broken_by_key():
+    assert money.allocate(2, [("b", 1), ("c", 1), ("a", 1)]) == {"a": 1, "b": 1, "c": 0}
+
+
+def test_allocate_zero_weight():
+    assert money.allocate(500, [("a", 0), ("b", 2)]) == {"a": 0, "b": 500}
+
+
+def test_allocate_empty():
+    assert money.allocate(500, []) == {}
+
+
+@pytest.mark.parametrize("weights", [[("a", 0), ("b", 0)], [("a", -1), ("b", 2)]])
+def test_allocate_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        money.allocate(500, weights)
+
+
+def test_allocate_duplicate_keys():
+    with pytest.raises(ValueError):
+        money.allocate(500, [("a", 1), ("b", 1), ("a", 1)])
+
+
+def test_split_equal():
+    cents = money.split_equal(1001, ["c", "a", "b"])
+    assert cents == {"a": 334, "b": 334, "c": 333}
+    assert sum(cents.values()) == 1001
+
+
+def test_split_equal_duplicate_keys():
+    with pytest.raises(ValueError):
+        money.split_equal(1000, ["a", "a"])
+
+
+def test_round_trip():
+    assert money.to_cents(Decimal("12.345")) == 1235
+    assert money.from_cents(1235) == Decimal("12.35")
+    assert money.quantize("0.005") == Decimal("0.01")
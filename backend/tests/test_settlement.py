@@ -0,0 +1,73 @@
+from collections import defaultdict
+from decimal import Decimal
+import random
+import uuid
+
+import pytest
+
+from app.services.settlement import SETTLEMENT_MODES, simplify_debts
+
+
+def random_balances(rng: random.Random, parties: int):
+    """Whole-unit balances that sum to zero (so no transfer is below a cent)."""
+    amounts = [rng.choice([-1, 1]) * rng.randint(1, 6) for _ in range(parties - 1)]
+    amounts.append(-sum(amounts))
+    return {uuid.uuid4(): Decimal(amount) for amount in amounts}
+
+
+def apply_transfers(balances, transfers):
+    left = defaultdict(Decimal, balances)
+    for transfer in transfers:
+        left[transfer["from_user_id"]] += transfer["amount"]
+        left[transfer["to_user_id"]] -= transfer["amount"]
+    return left
+
+
+def min_transfers(amounts):
+    """Brute force: non-zero parties minus the most zero-sum groups they split into."""
+    amounts = [amount for amount in amounts if amount]
+
+    def most_groups(rest):
+        if not rest:
+            return 0
+        first, others = rest[0], rest[1:]
+        best = 0
+        for mask in range(1 << len(others)):
+            chosen = [amount for i, amount in enumerate(others) if mask >> i & 1]
+            if first + sum(chosen) == 0:
+                remaining = [amount for i, amount in enumerate(others) if not mask >> i & 1]
+                best = max(best, 1 + most_groups(remaining))
+        return best
+
+    return len(amounts) - most_groups(amounts)
+
+
+def inputs(count: int, max_parties: int):
+    rng = random.Random(1234)
+    return [random_balances(rng, rng.randint(2, max_parties)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("mode", SETTLEMENT_MODES)
+def test_transfers_settle_every_balance(mode):
+    for balances in inputs(200, 12):
+        transfers = simplify_debts(balances, mode=mode)
+        assert all(transfer["amount"] > 0 for transfer in transfers)
+        assert all(amount == 0 for amount in apply_transfers(balances, transfers).values())
+
+
+def test_exact_is_minimal():
+    for balances in inputs(200, 8):
+        transfers = simplify_debts(balances, mode="exact")
+        assert len(transfers) == min_transfers(list(balances.values()))
+
+
+@pytest.mark.parametrize("mode", ["greedy", "heuristic"])
+def test_at_most_one_transfer_per_party_but_one(mode):
+    for balances in inputs(200, 12):
+        parties = sum(1 for amount in balances.values() if amount)
+        assert len(simplify_debts(balances, mode=mode)) <= max(parties - 1, 0)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        simplify_debts({}, mode="fastest")
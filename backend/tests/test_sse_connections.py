@@ -0,0 +1,84 @@
+"""Open SSE streams must not hold database connections."""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.api.endpoints import notifications
+from app.core.security import create_access_token
+from app.db.database import Base
+from app.main import app
+from app.models import User
+
+pytestmark = pytest.mark.anyio
+
+STREAMS = 1000
+
+
+async def open_stream(token: str, opened: asyncio.Event, closing: asyncio.Event, statuses: list):
+    """Drive one GET /stream/events through the ASGI app until `closing` is set."""
+    path = "/api/v1/notifications/stream/events"
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": f"token={token}".encode(),
+        "headers": [(b"host", b"testserver"), (b"accept", b"text/event-stream")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive():
+        await closing.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+            opened.set()
+
+    await app(scope, receive, send)
+
+
+async def test_open_streams_hold_no_connections(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'sse.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
+        max_overflow=0
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(notifications, "ReadSessionLocal", session_factory)
+
+    user = User(id=uuid.uuid4(), email="sse@example.com", name="SSE", hashed_password="x", is_active=True)
+    async with session_factory() as db:
+        db.add(user)
+        await db.commit()
+    token = create_access_token({"sub": str(user.id)})
+
+    pool = engine.sync_engine.pool
+    closing = asyncio.Event()
+    statuses: list = []
+    opened = [asyncio.Event() for _ in range(STREAMS)]
+    tasks = [
+        asyncio.create_task(open_stream(token, event, closing, statuses))
+        for event in opened
+    ]
+    try:
+        await asyncio.wait_for(asyncio.gather(*(event.wait() for event in opened)), timeout=60)
+        assert statuses == [200] * STREAMS
+        # Every stream looked its user up, but none kept the connection (the pool has only 5)
+        assert pool.checkedout() == 0
+    finally:
+        closing.set()
+        await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=30)
+        await engine.dispose()
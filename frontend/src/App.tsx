@@ -33,13 +33,17 @@ const queryClient = new QueryClient({
 function AuthCallback() {
   const params = new URLSearchParams(window.location.search);
   const token = params.get('token');
+  const refreshToken = params.get('refresh_token');
 
   useEffect(() => {
     if (token) {
       localStorage.setItem('token', token);
+      if (refreshToken) {
+        localStorage.setItem('refreshToken', refreshToken);
+      }
       window.location.href = '/dashboard';
     }
-  }, [token]);
+  }, [token, refreshToken]);
 
   return <div>Authenticating...</div>;
 }
@@ -75,7 +75,11 @@ export function FriendsAnalyticsPanel() {
             <CardDescription>Daily spending trends with friends</CardDescription>
           </CardHeader>
           <CardContent>
-            <SpendingLineChart data={data.spending_over_time} period={period} />
+            <SpendingLineChart
+              data={data.spending_over_time}
+              period={period}
+              granularity={data.granularity}
+            />
           </CardContent>
         </Card>
       </div>
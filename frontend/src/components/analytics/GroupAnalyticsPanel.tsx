@@ -80,7 +80,11 @@ export function GroupAnalyticsPanel({ groupId }: GroupAnalyticsPanelProps) {
             <CardDescription>Daily spending trends</CardDescription>
           </CardHeader>
           <CardContent>
-            <SpendingLineChart data={data.spending_over_time} period={period} />
+            <SpendingLineChart
+              data={data.spending_over_time}
+              period={period}
+              granularity={data.granularity}
+            />
           </CardContent>
         </Card>
       </div>
@@ -9,14 +9,15 @@ import {
 } from 'recharts';
 import { format, parseISO } from 'date-fns';
 import { formatCurrency } from '@/lib/utils';
-import type { SpendingDataPoint, TimePeriod } from '@/types/analytics';
+import type { Granularity, SpendingDataPoint, TimePeriod } from '@/types/analytics';
 
 interface SpendingLineChartProps {
   data: SpendingDataPoint[];
   period: TimePeriod;
+  granularity?: Granularity;
 }
 
-export function SpendingLineChart({ data, period }: SpendingLineChartProps) {
+export function SpendingLineChart({ data, period, granularity = 'day' }: SpendingLineChartProps) {
   if (!data || data.length === 0) {
     return (
       <div className="flex h-[300px] items-center justify-center text-muted-foreground">
@@ -25,8 +26,11 @@ export function SpendingLineChart({ data, period }: SpendingLineChartProps) {
     );
   }
 
-  // Format dates based on period
+  // Format dates based on bucket size and period
   const getDateFormat = () => {
+    if (granularity === 'month') {
+      return 'MMM yyyy'; // Jan 2025
+    }
     switch (period) {
       case '7d':
         return 'EEE'; // Mon, Tue, etc.
@@ -73,7 +77,14 @@ export function SpendingLineChart({ data, period }: SpendingLineChartProps) {
           formatter={(value) => [formatCurrency(Number(value)), 'Amount']}
           labelFormatter={(_, payload) => {
             if (payload && payload[0]) {
-              return format(parseISO(payload[0].payload.date), 'MMMM d, yyyy');
+              const date = parseISO(payload[0].payload.date);
+              if (granularity === 'month') {
+                return format(date, 'MMMM yyyy');
+              }
+              if (granularity === 'week') {
+                return `Week of ${format(date, 'MMMM d, yyyy')}`;
+              }
+              return format(date, 'MMMM d, yyyy');
             }
             return '';
           }}
@@ -2,6 +2,7 @@ import { Link, useNavigate } from 'react-router-dom';
 import { useAuthStore } from '@/store/authStore';
 import { useNotificationStore } from '@/store/notificationStore';
 import { notificationService } from '@/services/notifications';
+import { getAccessToken } from '@/services/api';
 import { Button } from '@/components/ui/button';
 import { Avatar, AvatarFallback, AvatarImage } from '@/components/ui/avatar';
 import {
@@ -16,6 +17,9 @@ import { Bell, LogOut, Settings, User, Menu, X, Home, Users, Receipt, CreditCard
 import { getInitials } from '@/lib/utils';
 import { useEffect, useState } from 'react';
 
+const SSE_RETRY_MIN_MS = 1000;
+const SSE_RETRY_MAX_MS = 30000;
+
 export function Header() {
   const { user, logout } = useAuthStore();
   const { unreadCount, setUnreadCount, addNotification, incrementUnreadCount } = useNotificationStore();
@@ -45,10 +49,25 @@ export function Header() {
     fetchUnreadCount();
     const intervalId = window.setInterval(fetchUnreadCount, 30000);
 
-    const token = localStorage.getItem('token');
-    if (token) {
-      eventSource = notificationService.createEventSource();
+    // Reconnects with exponential backoff, resuming after the last event seen
+    // and with a freshly checked token (access tokens expire after minutes)
+    let lastEventId: string | null = null;
+    let retryDelay = SSE_RETRY_MIN_MS;
+    let retryId: number | undefined;
+
+    const connect = async () => {
+      const token = await getAccessToken();
+      if (!isActive || !token) {
+        return;
+      }
+      eventSource = notificationService.createEventSource(token, lastEventId);
+      eventSource.onopen = () => {
+        retryDelay = SSE_RETRY_MIN_MS;
+      };
       eventSource.onmessage = (event) => {
+        if (event.lastEventId) {
+          lastEventId = event.lastEventId;
+        }
         if (!event.data) {
           return;
         }
@@ -63,14 +82,25 @@ export function Header() {
           incrementUnreadCount();
         }
       };
+      // Missed events are no longer buffered; reload the count instead
+      eventSource.addEventListener('resync', fetchUnreadCount);
       eventSource.onerror = () => {
         eventSource?.close();
+        eventSource = null;
+        if (!isActive) {
+          return;
+        }
+        retryId = window.setTimeout(connect, retryDelay * (0.5 + Math.random() / 2));
+        retryDelay = Math.min(retryDelay * 2, SSE_RETRY_MAX_MS);
       };
-    }
+    };
+
+    connect();
 
     return () => {
       isActive = false;
       window.clearInterval(intervalId);
+      window.clearTimeout(retryId);
       eventSource?.close();
     };
   }, [addNotification, setUnreadCount, user]);
@@ -1,17 +1,38 @@
 import api from './api';
-import type { GroupAnalyticsResponse, FriendsAnalyticsResponse, TimePeriod } from '@/types/analytics';
+import type {
+  AnalyticsRange,
+  GroupAnalyticsResponse,
+  FriendsAnalyticsResponse,
+  TimePeriod,
+} from '@/types/analytics';
+
+function analyticsParams(period: TimePeriod, range?: AnalyticsRange): URLSearchParams {
+  const params = new URLSearchParams({ period });
+
+  if (range) {
+    Object.entries(range).forEach(([key, value]) => {
+      if (value) params.append(key, value);
+    });
+  }
+
+  return params;
+}
 
 export const analyticsService = {
-  async getGroupAnalytics(groupId: string, period: TimePeriod = '30d'): Promise<GroupAnalyticsResponse> {
+  async getGroupAnalytics(
+    groupId: string,
+    period: TimePeriod = '30d',
+    range?: AnalyticsRange
+  ): Promise<GroupAnalyticsResponse> {
     const { data } = await api.get<GroupAnalyticsResponse>(
-      `/analytics/group/${groupId}?period=${period}`
+      `/analytics/group/${groupId}?${analyticsParams(period, range)}`
     );
     return data;
   },
 
-  async getFriendsAnalytics(period: TimePeriod = '30d'): Promise<FriendsAnalyticsResponse> {
+  async getFriendsAnalytics(period: TimePeriod = '30d', range?: AnalyticsRange): Promise<FriendsAnalyticsResponse> {
     const { data } = await api.get<FriendsAnalyticsResponse>(
-      `/analytics/friends?period=${period}`
+      `/analytics/friends?${analyticsParams(period, range)}`
     );
     return data;
   },
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import type { AxiosError, InternalAxiosRequestConfig } from 'axios';
 
 const API_BASE_URL = '/api/v1';
 
@@ -9,21 +10,100 @@ const api = axios.create({
   },
 });
 
+// Database position of our last write; sent back so reads are not served
+// by a replica that has not caught up with it yet
+const LSN_STICKY_MS = 60_000;
+let lastWrite: { lsn: string; at: number } | null = null;
+
 // Request interceptor to add auth token
 api.interceptors.request.use((config) => {
   const token = localStorage.getItem('token');
   if (token) {
     config.headers.Authorization = `Bearer ${token}`;
   }
+  if (lastWrite && Date.now() - lastWrite.at < LSN_STICKY_MS) {
+    config.headers['X-DB-LSN'] = lastWrite.lsn;
+  }
   return config;
 });
 
+// Access tokens are short-lived; concurrent 401s share one refresh request
+let refreshRequest: Promise<string> | null = null;
+
+async function refreshAccessToken(): Promise<string> {
+  const refreshToken = localStorage.getItem('refreshToken');
+  if (!refreshToken) {
+    throw new Error('No refresh token');
+  }
+  const { data } = await axios.post(`${API_BASE_URL}/auth/refresh`, {
+    refresh_token: refreshToken,
+  });
+  localStorage.setItem('token', data.access_token);
+  localStorage.setItem('refreshToken', data.refresh_token);
+  return data.access_token;
+}
+
+// Seconds before expiry at which getAccessToken() refreshes the token
+const TOKEN_EXPIRY_MARGIN_S = 60;
+
+function tokenExpiresAt(token: string): number | null {
+  try {
+    const payload = token.split('.')[1].replace(/-/g, '+').replace(/_/g, '/');
+    const { exp } = JSON.parse(atob(payload));
+    return typeof exp === 'number' ? exp : null;
+  } catch {
+    return null;
+  }
+}
+
+// A current access token for requests axios does not make (e.g. EventSource),
+// refreshed first if it is about to expire
+export async function getAccessToken(): Promise<string | null> {
+  const token = localStorage.getItem('token');
+  if (!token) {
+    return null;
+  }
+  const expiresAt = tokenExpiresAt(token);
+  if (expiresAt === null || expiresAt - TOKEN_EXPIRY_MARGIN_S > Date.now() / 1000) {
+    return token;
+  }
+  try {
+    refreshRequest = refreshRequest ?? refreshAccessToken();
+    return await refreshRequest;
+  } catch {
+    return null;
+  } finally {
+    refreshRequest = null;
+  }
+}
+
 // Response interceptor for error handling
 api.interceptors.response.use(
-  (response) => response,
-  (error) => {
+  (response) => {
+    const lsn = response.headers['x-db-lsn'];
+    if (lsn) {
+      lastWrite = { lsn, at: Date.now() };
+    }
+    return response;
+  },
+  async (error: AxiosError) => {
+    const config = error.config as (InternalAxiosRequestConfig & { _retried?: boolean }) | undefined;
+    if (error.response?.status === 401 && config && !config._retried) {
+      config._retried = true;
+      try {
+        refreshRequest = refreshRequest ?? refreshAccessToken();
+        const token = await refreshRequest;
+        config.headers.Authorization = `Bearer ${token}`;
+        return api(config);
+      } catch {
+        // Fall through to sign out
+      } finally {
+        refreshRequest = null;
+      }
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem('token');
+      localStorage.removeItem('refreshToken');
       window.location.href = '/login';
     }
     return Promise.reject(error);
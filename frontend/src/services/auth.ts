@@ -14,6 +14,7 @@ export interface RegisterCredentials {
 
 export interface AuthResponse {
   access_token: string;
+  refresh_token: string;
   token_type: string;
   user: User;
 }
@@ -34,6 +35,10 @@ export const authService = {
     return data;
   },
 
+  async logoutAll(): Promise<void> {
+    await api.post('/auth/logout-all');
+  },
+
   async getCurrentUser(): Promise<User> {
     const { data } = await api.get<User>('/users/me');
     return data;
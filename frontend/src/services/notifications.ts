@@ -49,8 +49,10 @@ export const notificationService = {
   },
 
   // SSE connection for real-time notifications
-  createEventSource(): EventSource {
-    const token = localStorage.getItem('token');
-    return new EventSource(`/api/v1/notifications/stream/events?token=${token}`);
+  // Pass a token from getAccessToken(); lastEventId resumes after the last event seen
+  createEventSource(token: string, lastEventId?: string | null): EventSource {
+    const params = new URLSearchParams({ token });
+    if (lastEventId) params.append('last_event_id', lastEventId);
+    return new EventSource(`/api/v1/notifications/stream/events?${params}`);
   },
 };
@@ -30,6 +30,7 @@ export const useAuthStore = create<AuthState>()(
         try {
           const response = await authService.login({ email, password });
           localStorage.setItem('token', response.access_token);
+          localStorage.setItem('refreshToken', response.refresh_token);
           set({
             user: response.user,
             token: response.access_token,
@@ -47,6 +48,7 @@ export const useAuthStore = create<AuthState>()(
         try {
           const response = await authService.register({ email, password, name });
           localStorage.setItem('token', response.access_token);
+          localStorage.setItem('refreshToken', response.refresh_token);
           set({
             user: response.user,
             token: response.access_token,
@@ -64,6 +66,7 @@ export const useAuthStore = create<AuthState>()(
         try {
           const response = await authService.googleLogin(code);
           localStorage.setItem('token', response.access_token);
+          localStorage.setItem('refreshToken', response.refresh_token);
           set({
             user: response.user,
             token: response.access_token,
@@ -78,6 +81,7 @@ export const useAuthStore = create<AuthState>()(
 
       logout: () => {
         localStorage.removeItem('token');
+        localStorage.removeItem('refreshToken');
         set({
           user: null,
           token: null,
@@ -101,6 +105,7 @@ export const useAuthStore = create<AuthState>()(
           set({ user, isAuthenticated: true, token });
         } catch {
           localStorage.removeItem('token');
+          localStorage.removeItem('refreshToken');
           set({ user: null, token: null, isAuthenticated: false });
         }
       },
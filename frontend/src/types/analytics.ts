@@ -2,6 +2,15 @@
 
 export type TimePeriod = '7d' | '30d' | '3m' | '1y';
 
+export type Granularity = 'day' | 'week' | 'month';
+
+// Explicit range; overrides the period. Dates are YYYY-MM-DD.
+export interface AnalyticsRange {
+  start?: string;
+  end?: string;
+  granularity?: Granularity;
+}
+
 export interface CategorySpending {
   category: string;
   amount: number;
@@ -10,7 +19,7 @@ export interface CategorySpending {
 }
 
 export interface SpendingDataPoint {
-  date: string;
+  date: string; // first day of the bucket
   amount: number;
   expense_count: number;
 }
@@ -38,6 +47,7 @@ export interface GroupAnalyticsResponse {
   period: string;
   start_date: string;
   end_date: string;
+  granularity: Granularity;
   total_spending: number;
   expense_count: number;
   category_breakdown: CategorySpending[];
@@ -51,6 +61,7 @@ export interface FriendsAnalyticsResponse {
   period: string;
   start_date: string;
   end_date: string;
+  granularity: Granularity;
   total_spending: number;
   expense_count: number;
   category_breakdown: CategorySpending[];